@@ -8,13 +8,14 @@ from app.core.db import Base
 from app import models  # noqa
 
 config = context.config
-if config.config_file_name is not None:
+# the app runs migrations at startup (app/core/migrations.py) and keeps its own logging
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 target_metadata = Base.metadata
 
 def get_url():
-    return settings.DATABASE_URL
+    return config.attributes.get("url") or settings.DATABASE_URL
 
 def run_migrations_offline():
     url = get_url()
@@ -0,0 +1,114 @@
+"""baseline schema (tables previously created by create_all)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-16
+
+Databases created by ``Base.metadata.create_all`` before migrations existed
+already have this schema; ``upgrade_database`` stamps them at this revision.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("email", sa.String(320), nullable=False),
+        sa.Column("password_hash", sa.String(300), nullable=True),
+        sa.Column("auth_provider", sa.String(40), nullable=False),
+        sa.Column("provider_subject", sa.String(200), nullable=True),
+        sa.Column("gender", sa.String(20), nullable=False),
+        sa.Column("date_of_birth_iso", sa.String(10), nullable=False),
+        sa.Column("profile_image_url", sa.String(500), nullable=True),
+        sa.Column("is_disabled", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("token_jti", sa.String(64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index("ix_refresh_tokens_token_jti", "refresh_tokens", ["token_jti"], unique=True)
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+    op.create_table(
+        "chat_sessions",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_chat_sessions_user_id", "chat_sessions", ["user_id"])
+    op.create_index("ix_chat_sessions_updated_at", "chat_sessions", ["updated_at"])
+
+    op.create_table(
+        "chat_messages",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("session_id", sa.String(36), sa.ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_chat_messages_session_id", "chat_messages", ["session_id"])
+    op.create_index("ix_chat_messages_created_at", "chat_messages", ["created_at"])
+    op.create_index("ix_chat_messages_session_created", "chat_messages", ["session_id", "created_at"])
+
+    op.create_table(
+        "screening_sessions",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("session_id", sa.String(36), sa.ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("phase", sa.String(30), nullable=False),
+        sa.Column("readiness", sa.String(20), nullable=False),
+        sa.Column("track", sa.String(20), nullable=False),
+        sa.Column("presenting_concern", sa.Text(), nullable=True),
+        sa.Column("subject_type", sa.String(20), nullable=True),
+        sa.Column("age_years", sa.Integer(), nullable=True),
+        sa.Column("hypotheses_json", sa.Text(), nullable=False),
+        sa.Column("active_disorder_id", sa.String(80), nullable=True),
+        sa.Column("progress_summaries", sa.Integer(), nullable=False),
+        sa.Column("closure_prompted", sa.Boolean(), nullable=False),
+        sa.Column("closure_ack", sa.Boolean(), nullable=False),
+        sa.Column("turns", sa.Integer(), nullable=False),
+        sa.Column("slots_json", sa.Text(), nullable=False),
+        sa.Column("slot_state_json", sa.Text(), nullable=False),
+        sa.Column("last_intent", sa.String(80), nullable=True),
+        sa.Column("last_question_fingerprint", sa.String(64), nullable=True),
+    )
+    op.create_index("ix_screening_sessions_session_id", "screening_sessions", ["session_id"], unique=True)
+
+    op.create_table(
+        "feedback",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("session_id", sa.String(36), sa.ForeignKey("chat_sessions.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("comment", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_feedback_user_id", "feedback", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("feedback")
+    op.drop_table("screening_sessions")
+    op.drop_table("chat_messages")
+    op.drop_table("chat_sessions")
+    op.drop_table("refresh_tokens")
+    op.drop_table("users")
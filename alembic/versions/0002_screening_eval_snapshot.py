@@ -0,0 +1,26 @@
+"""screening_sessions.eval_snapshot_json for incremental rubric evaluation
+
+Revision ID: 0002_screening_eval_snapshot
+Revises: 0001_baseline
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_screening_eval_snapshot"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "screening_sessions",
+        sa.Column("eval_snapshot_json", sa.Text(), nullable=False, server_default="{}"),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("screening_sessions") as batch:
+        batch.drop_column("eval_snapshot_json")
@@ -0,0 +1,38 @@
+"""screening_sessions state columns as native JSON (JSONB on Postgres)
+
+Revision ID: 0003_screening_state_json
+Revises: 0002_screening_eval_snapshot
+Create Date: 2026-10-16
+"""
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0003_screening_state_json"
+down_revision = "0002_screening_eval_snapshot"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("hypotheses_json", "slots_json", "slot_state_json", "eval_snapshot_json")
+
+
+def upgrade() -> None:
+    # SQLite stores JSON as TEXT either way; only Postgres changes type
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for col in COLUMNS:
+        op.alter_column("screening_sessions", col, server_default=None)
+        op.alter_column(
+            "screening_sessions", col,
+            type_=postgresql.JSONB(), postgresql_using=f"{col}::jsonb",
+        )
+    op.alter_column("screening_sessions", "eval_snapshot_json", server_default="{}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for col in COLUMNS:
+        op.alter_column("screening_sessions", col, server_default=None)
+        op.alter_column("screening_sessions", col, type_=postgresql.TEXT(), postgresql_using=f"{col}::text")
+    op.alter_column("screening_sessions", "eval_snapshot_json", server_default="{}")
@@ -0,0 +1,26 @@
+"""screening_sessions.version for optimistic concurrency
+
+Revision ID: 0004_screening_version
+Revises: 0003_screening_state_json
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_screening_version"
+down_revision = "0003_screening_state_json"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "screening_sessions",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("screening_sessions") as batch:
+        batch.drop_column("version")
@@ -0,0 +1,23 @@
+"""composite index for keyset paging of a user's sessions
+
+Revision ID: 0005_sessions_user_updated
+Revises: 0004_screening_version
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+revision = "0005_sessions_user_updated"
+down_revision = "0004_screening_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_chat_sessions_user_updated", "chat_sessions", ["user_id", "updated_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_sessions_user_updated", table_name="chat_sessions")
@@ -0,0 +1,26 @@
+"""partial index on revoked refresh tokens for compaction
+
+Revision ID: 0006_refresh_tokens_revoked
+Revises: 0005_sessions_user_updated
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_refresh_tokens_revoked"
+down_revision = "0005_sessions_user_updated"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    revoked = sa.text("revoked = true") if op.get_bind().dialect.name == "postgresql" else sa.text("revoked = 1")
+    op.create_index(
+        "ix_refresh_tokens_revoked", "refresh_tokens", ["created_at"],
+        sqlite_where=revoked, postgresql_where=revoked,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_revoked", table_name="refresh_tokens")
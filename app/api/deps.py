@@ -1,16 +1,16 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..core.db import get_db
-from ..core.security import decode_token
+from ..core.db import get_db, get_async_db
+from ..core.principals import Principal, get_principal_cache
+from ..core.security import decode_token, sha256_hex
 from ..models import User
 
 bearer = HTTPBearer(auto_error=False)
 
-def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(bearer),
-    db: Session = Depends(get_db),
-) -> User:
+def _token_payload(creds: HTTPAuthorizationCredentials | None) -> dict:
     if creds is None or not creds.credentials:
         raise HTTPException(status_code=401, detail="Missing Authorization Bearer token")
     try:
@@ -19,10 +19,65 @@ def get_current_user(
         raise HTTPException(status_code=401, detail="Invalid token")
     if payload.get("typ") != "access":
         raise HTTPException(status_code=401, detail="Invalid token type")
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    return payload
+
+def _token_user_id(creds: HTTPAuthorizationCredentials | None) -> str:
+    return _token_payload(creds).get("sub")
+
+def _check_user(user: User | Principal | None):
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     if user.is_disabled:
         raise HTTPException(status_code=403, detail="Account disabled")
     return user
+
+# only the columns a Principal needs, never the full User row
+_PRINCIPAL_COLUMNS = (User.id, User.is_disabled)
+
+def _cached_principal(creds: HTTPAuthorizationCredentials | None) -> tuple[str, Principal | None]:
+    if creds is None or not creds.credentials:
+        raise HTTPException(status_code=401, detail="Missing Authorization Bearer token")
+    token_hash = sha256_hex(creds.credentials)
+    return token_hash, get_principal_cache().get(token_hash)
+
+def _remember(token_hash: str, row, payload: dict) -> Principal | None:
+    if row is None:
+        return None
+    principal = Principal(id=row.id, is_disabled=bool(row.is_disabled))
+    get_principal_cache().set(token_hash, principal, payload.get("exp"))
+    return principal
+
+def get_current_user(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id = _token_user_id(creds)
+    user = db.query(User).filter(User.id == user_id).first()
+    return _check_user(user)
+
+def get_current_principal(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """Id and status of the caller, for routes that do not need the ``User`` row.
+
+    A token seen before is answered from the principal cache: no signature check, no query.
+    """
+    token_hash, principal = _cached_principal(creds)
+    if principal is None:
+        payload = _token_payload(creds)
+        row = db.execute(select(*_PRINCIPAL_COLUMNS).where(User.id == payload.get("sub"))).first()
+        principal = _remember(token_hash, row, payload)
+    return _check_user(principal)
+
+async def get_current_principal_async(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """``get_current_principal`` on the async DB path."""
+    token_hash, principal = _cached_principal(creds)
+    if principal is None:
+        payload = _token_payload(creds)
+        row = (await db.execute(select(*_PRINCIPAL_COLUMNS).where(User.id == payload.get("sub")))).first()
+        principal = _remember(token_hash, row, payload)
+    return _check_user(principal)
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
-from ...core.db import get_db
+from ...core.db import get_db, get_async_db
+from ...core.passwords import PasswordHasherBusy, get_password_hasher
 from ...core.security import (
-    hash_password, verify_password,
     create_access_token, create_refresh_token, decode_token, sha256_hex
 )
 from ...models import User, RefreshToken
@@ -20,58 +23,77 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 GENDER_ENUM = {"Male","Female","Other"}
 
 
-def _issue_tokens(db: Session, user: User) -> AuthResponse:
+async def _issue_tokens(db: AsyncSession, user: User) -> AuthResponse:
     access, ttl = create_access_token(user.id)
     refresh, exp, jti = create_refresh_token(user.id)
     db.add(RefreshToken(user_id=user.id, token_jti=sha256_hex(jti), expires_at=exp))
-    db.commit()
+    await db.commit()
     return AuthResponse(
         token=TokenBundle(accessToken=access, refreshToken=refresh, expiresIn=ttl),
         user=UserOut(id=user.id, name=user.name, email=user.email, profileImageUrl=user.profile_image_url),
     )
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(status_code=503, detail="Too many sign-ins at once, retry shortly", headers={"Retry-After": "1"})
+
+async def _user_by_email(db: AsyncSession, email: str) -> User | None:
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+# signup, login and OAuth are async: bcrypt runs in the password pool (app/core/passwords.py)
+# and ID-token certificates come from an async cache, never holding a threadpool slot
 @router.post("/signup", response_model=AuthResponse)
-def signup(req: SignupRequest, db: Session = Depends(get_db)):
+async def signup(req: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     if req.gender not in GENDER_ENUM:
         raise HTTPException(status_code=422, detail="Invalid gender")
-    if db.query(User).filter(User.email == req.email.lower()).first():
+    if await _user_by_email(db, req.email.lower()):
         raise HTTPException(status_code=409, detail="Email already exists")
     dob_iso = ddmmyyyy_to_iso(req.dateOfBirth)
+    try:
+        password_hash = await get_password_hasher().hash_async(req.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     profile_url = None
     if req.profileImage:
-        profile_url = upload_profile_image_base64(req.profileImage)
+        profile_url = await run_in_threadpool(upload_profile_image_base64, req.profileImage)
 
     user = User(
         name=req.name.strip(),
         email=req.email.lower().strip(),
-        password_hash=hash_password(req.password),
+        password_hash=password_hash,
         gender=req.gender,
         date_of_birth_iso=dob_iso,
         profile_image_url=profile_url,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
-    return _issue_tokens(db, user)
+    return await _issue_tokens(db, user)
 
 @router.post("/login", response_model=AuthResponse)
-def login(req: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == req.email.lower().strip()).first()
+async def login(req: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await _user_by_email(db, req.email.lower().strip())
     if not user:
         raise HTTPException(status_code=404, detail="Account not found")
     if user.is_disabled:
         raise HTTPException(status_code=403, detail="Account disabled")
     if not user.password_hash:
         raise HTTPException(status_code=401, detail="Password login not available for this account")
-    if not verify_password(req.password, user.password_hash):
+    try:
+        ok, new_hash = await get_password_hasher().verify_async(req.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # hashed with outdated parameters (e.g. PASSWORD_BCRYPT_ROUNDS changed); saved with the new token
+        user.password_hash = new_hash
 
-    return _issue_tokens(db, user)
+    return await _issue_tokens(db, user)
 
 
-def _upsert_oauth_user(db: Session, provider: str, subject: str, email: str, name: str | None, picture: str | None) -> User:
-    user = db.query(User).filter(User.email == email).first()
+async def _upsert_oauth_user(db: AsyncSession, provider: str, subject: str, email: str, name: str | None, picture: str | None) -> User:
+    user = await _user_by_email(db, email)
     if user:
         # Link provider (by email) if not already linked
         user.auth_provider = provider
@@ -80,8 +102,8 @@ def _upsert_oauth_user(db: Session, provider: str, subject: str, email: str, nam
             user.profile_image_url = picture
         if name and user.name.strip() == "":
             user.name = name
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
 
     # New OAuth user; minimal required fields
@@ -96,43 +118,43 @@ def _upsert_oauth_user(db: Session, provider: str, subject: str, email: str, nam
         profile_image_url=picture,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/oauth/google", response_model=AuthResponse)
-def oauth_google(req: GoogleOAuthRequest, db: Session = Depends(get_db)):
+async def oauth_google(req: GoogleOAuthRequest, db: AsyncSession = Depends(get_async_db)):
     """Exchange a Google ID token for our JWT.
 
 Flutter typically obtains the Google ID token via google_sign_in.
 """
     try:
-        ident = verify_google_id_token(req.idToken)
+        ident = await verify_google_id_token(req.idToken)
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Invalid Google token: {e}")
 
-    user = _upsert_oauth_user(db, ident.provider, ident.subject, ident.email, ident.name, ident.picture)
+    user = await _upsert_oauth_user(db, ident.provider, ident.subject, ident.email, ident.name, ident.picture)
     if user.is_disabled:
         raise HTTPException(status_code=403, detail="Account disabled")
-    return _issue_tokens(db, user)
+    return await _issue_tokens(db, user)
 
 
 @router.post("/oauth/firebase", response_model=AuthResponse)
-def oauth_firebase(req: FirebaseOAuthRequest, db: Session = Depends(get_db)):
+async def oauth_firebase(req: FirebaseOAuthRequest, db: AsyncSession = Depends(get_async_db)):
     """Exchange a Firebase ID token for our JWT.
 
 Recommended setup: use Firebase Auth on Flutter for Google sign-in.
 """
     try:
-        ident = verify_firebase_id_token(req.idToken)
+        ident = await verify_firebase_id_token(req.idToken)
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Invalid Firebase token: {e}")
 
-    user = _upsert_oauth_user(db, ident.provider, ident.subject, ident.email, ident.name, ident.picture)
+    user = await _upsert_oauth_user(db, ident.provider, ident.subject, ident.email, ident.name, ident.picture)
     if user.is_disabled:
         raise HTTPException(status_code=403, detail="Account disabled")
-    return _issue_tokens(db, user)
+    return await _issue_tokens(db, user)
 
 @router.post("/refresh", response_model=AuthResponse)
 def refresh(req: RefreshRequest, db: Session = Depends(get_db)):
@@ -147,11 +169,21 @@ def refresh(req: RefreshRequest, db: Session = Depends(get_db)):
     if not user_id or not jti:
         raise HTTPException(status_code=401, detail="Invalid refresh token payload")
 
-    token_row = db.query(RefreshToken).filter(RefreshToken.token_jti == sha256_hex(jti)).first()
-    if not token_row or token_row.revoked:
+    # rotate: revoke the presented token only if it is live, in one statement; the new token
+    # is inserted in the same transaction, so a failure below leaves the old one usable
+    now = datetime.utcnow()
+    owner = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_jti == sha256_hex(jti), RefreshToken.revoked == False, RefreshToken.expires_at >= now)  # noqa: E712
+        .values(revoked=True)
+        .returning(RefreshToken.user_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if owner != user_id:
+        token_row = db.query(RefreshToken).filter(RefreshToken.token_jti == sha256_hex(jti)).first()
+        if token_row and not token_row.revoked and token_row.expires_at < now:
+            raise HTTPException(status_code=401, detail="Refresh token expired")
         raise HTTPException(status_code=401, detail="Refresh token revoked")
-    if token_row.expires_at < datetime.utcnow():
-        raise HTTPException(status_code=401, detail="Refresh token expired")
 
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -159,8 +191,6 @@ def refresh(req: RefreshRequest, db: Session = Depends(get_db)):
     if user.is_disabled:
         raise HTTPException(status_code=403, detail="Account disabled")
 
-    # rotate refresh token
-    token_row.revoked = True
     access, ttl = create_access_token(user.id)
     refresh2, exp2, jti2 = create_refresh_token(user.id)
     db.add(RefreshToken(user_id=user.id, token_jti=sha256_hex(jti2), expires_at=exp2, revoked=False))
@@ -183,8 +213,11 @@ def logout(req: LogoutRequest, db: Session = Depends(get_db)):
     jti = payload.get("jti")
     if not jti:
         return {"ok": True}
-    row = db.query(RefreshToken).filter(RefreshToken.token_jti == sha256_hex(jti)).first()
-    if row:
-        row.revoked = True
-        db.commit()
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_jti == sha256_hex(jti))
+        .values(revoked=True)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
     return {"ok": True}
@@ -1,101 +1,163 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import datetime
+from typing import Any, Dict, List, Tuple
+import asyncio
+import base64
+import binascii
+import contextlib
+import hashlib
 import json
+import logging
+import uuid
+import weakref
 
-from ...core.db import get_db
-from ..deps import get_current_user
-from ...models import User, ChatSession, ChatMessage, ScreeningSession
+from ...core.db import get_async_db, AsyncSessionLocal
+from ..deps import get_current_principal_async
+from ...core.principals import Principal
+from ...models import ChatSession, ChatMessage, ScreeningSession
 from ..schemas import ChatMessageIn, ChatMessageResponse, ChatSessionOut, AssistantMessageOut, ChatSessionOut, SessionsPage, SessionDetail
-from ...conversation.orchestrator import handle_turn, build_report, DISCLAIMER
+from ...conversation.orchestrator import handle_turn, plan_turn, DISCLAIMER
+from ...conversation import reports
+from ...conversation.state import ScreeningState
+from ...conversation.session_cache import get_session_cache
+from ...llm import composer
+from ...services import purge
 from ...core.config import settings
 
 router = APIRouter(prefix="/chat", tags=["chat"])
+log = logging.getLogger(__name__)
 
 def _iso(dt: datetime) -> str:
     return dt.replace(microsecond=0).isoformat() + "Z"
 
-@router.post("/message", response_model=ChatMessageResponse)
-async def message(payload: ChatMessageIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+async def _owned_session(db: AsyncSession, session_id: str, user: Principal) -> ChatSession | None:
+    res = await db.execute(select(ChatSession).where(ChatSession.id == session_id, ChatSession.user_id == user.id))
+    return res.scalars().first()
+
+async def _screening_for(db: AsyncSession, session_id: str) -> ScreeningSession | None:
+    res = await db.execute(select(ScreeningSession).where(ScreeningSession.session_id == session_id))
+    return res.scalars().first()
+
+def _new_screening(session_id: str) -> ScreeningSession:
+    # column defaults only apply at INSERT; the turn reads the state before that
+    defaults = {
+        c.key: c.default.arg
+        for c in ScreeningSession.__table__.columns
+        if c.default is not None and c.default.is_scalar
+    }
+    return ScreeningSession(session_id=session_id, **defaults)
+
+async def _open_turn(payload: ChatMessageIn, db: AsyncSession, user_id: str) -> Tuple[str, ChatSession, ScreeningSession, ScreeningState]:
+    """Load (or build, unsaved) the chat session, its screening row and state for this turn.
+
+    A session in the hot-session cache costs no query. Any other existing session costs
+    one joined query that also checks ownership. A new one is only built in memory;
+    ``_save_turn`` inserts it together with the turn.
+    """
     text = payload.message.strip()
     if not text:
         raise HTTPException(status_code=422, detail="message required")
 
-    session: ChatSession | None = None
     if payload.sessionId:
-        session = db.query(ChatSession).filter(ChatSession.id == payload.sessionId, ChatSession.user_id == user.id).first()
-        if not session:
+        hot = get_session_cache().get(payload.sessionId, user_id)
+        if hot is not None:
+            session, screening = hot.rows()
+            return text, session, screening, hot.state.copy()
+        res = await db.execute(
+            select(ChatSession, ScreeningSession)
+            .outerjoin(ScreeningSession, ScreeningSession.session_id == ChatSession.id)
+            .where(ChatSession.id == payload.sessionId, ChatSession.user_id == user_id)
+        )
+        row = res.first()
+        if not row:
             raise HTTPException(status_code=404, detail="Session not found")
-    else:
-        session = ChatSession(user_id=user.id, title=text[:80])
+        session, screening = row
+        if screening is None:
+            screening = _new_screening(session.id)
+        return text, session, screening, ScreeningState.from_row(screening)
+
+    now = datetime.utcnow()
+    session = ChatSession(id=str(uuid.uuid4()), user_id=user_id, title=text[:80], created_at=now, updated_at=now)
+    screening = _new_screening(session.id)
+    return text, session, screening, ScreeningState.from_row(screening)
+
+async def _save_turn(db: AsyncSession, session: ChatSession, screening: ScreeningSession, text: str, new_state: ScreeningState, reply_text: str) -> ChatMessage:
+    """Store the user message, the reply and the new screening state in one flush and commit.
+
+    Every default is client-side (uuid ids, utcnow timestamps), so nothing is read back.
+    With a write-behind hot-session cache, a cached session only gets its messages here;
+    the state change is written by the cache's next flush.
+    """
+    cache = get_session_cache()
+    deferred = cache.deferred(session.id)
+    db.add(ChatMessage(session_id=session.id, role="user", text=text))
+    am = ChatMessage(session_id=session.id, role="assistant", text=reply_text)
+    db.add(am)
+
+    session.updated_at = datetime.utcnow()
+    if not deferred:
         db.add(session)
-        db.commit()
-        db.refresh(session)
-        screening = ScreeningSession(session_id=session.id)
         db.add(screening)
-        db.commit()
+        # only fields the turn changed are written
+        new_state.apply_to(screening)
 
-    # persist user message
-    um = ChatMessage(session_id=session.id, role="user", text=text)
-    db.add(um)
+    await db.commit()
+    cache.store(session, screening, new_state, pending=deferred)
+    if new_state.phase == "REPORT_READY":
+        reports.schedule_precompute(session.id, new_state, session.user_id)
+    return am
 
-    # load screening state
-    screening = db.query(ScreeningSession).filter(ScreeningSession.session_id == session.id).first()
-    if not screening:
-        screening = ScreeningSession(session_id=session.id)
-        db.add(screening)
-        db.commit()
-        db.refresh(screening)
-
-    state = {
-        "phase": screening.phase,
-        "readiness": screening.readiness,
-        "track": screening.track,
-        "presenting_concern": screening.presenting_concern,
-        "subject_type": screening.subject_type,
-        "age_years": screening.age_years,
-        "hypotheses_json": screening.hypotheses_json,
-        "active_disorder_id": screening.active_disorder_id,
-        "progress_summaries": screening.progress_summaries,
-        "closure_prompted": screening.closure_prompted,
-        "closure_ack": screening.closure_ack,
-        "turns": screening.turns,
-        "slots_json": screening.slots_json,
-        "slot_state_json": screening.slot_state_json,
-        "last_intent": screening.last_intent,
-        "last_question_fingerprint": screening.last_question_fingerprint,
-        "domain": None,
-    }
+# Concurrent turns on one session: the screening row carries a version and every UPDATE
+# matches on the version the turn read (StaleDataError otherwise). Two turns that both
+# create the missing screening row collide on its unique session_id (IntegrityError).
+# Either way the losing turn rolls back and runs again on the fresh state.
+_CONFLICTS = (StaleDataError, IntegrityError)
+CONFLICTS = {"conflicts": 0, "retried": 0, "gaveUp": 0}
 
-    new_state, reply_text, meta = await handle_turn(state, text)
+def conflict_stats() -> Dict[str, int]:
+    return dict(CONFLICTS)
 
-    # persist assistant message
-    am = ChatMessage(session_id=session.id, role="assistant", text=reply_text)
-    db.add(am)
+_turn_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
-    # update screening row
-    screening.phase = new_state.get("phase", screening.phase)
-    screening.readiness = new_state.get("readiness", screening.readiness)
-    screening.track = new_state.get("track", screening.track)
-    screening.presenting_concern = new_state.get("presenting_concern")
-    screening.subject_type = new_state.get("subject_type")
-    screening.age_years = new_state.get("age_years")
-    screening.hypotheses_json = new_state.get("hypotheses_json", screening.hypotheses_json)
-    screening.active_disorder_id = new_state.get("active_disorder_id")
-    screening.progress_summaries = int(new_state.get("progress_summaries", screening.progress_summaries))
-    screening.closure_prompted = bool(new_state.get("closure_prompted", screening.closure_prompted))
-    screening.closure_ack = bool(new_state.get("closure_ack", screening.closure_ack))
-    screening.turns = int(new_state.get("turns", screening.turns))
-    screening.slots_json = new_state.get("slots_json", screening.slots_json)
-    screening.slot_state_json = new_state.get("slot_state_json", screening.slot_state_json)
-    screening.last_intent = new_state.get("last_intent", screening.last_intent)
-    screening.last_question_fingerprint = new_state.get("last_question_fingerprint", screening.last_question_fingerprint)
+def _session_lock(session_id: str | None):
+    """Serialize turns of one session inside this process (other workers rely on the version check)."""
+    if not session_id or not settings.TURN_SESSION_LOCK:
+        return contextlib.nullcontext()
+    lock = _turn_locks.get(session_id)
+    if lock is None:
+        lock = _turn_locks[session_id] = asyncio.Lock()
+    return lock
 
-    session.updated_at = datetime.utcnow()
+async def _after_conflict(db: AsyncSession, session_id: str, attempt: int) -> None:
+    await db.rollback()
+    get_session_cache().invalidate(session_id)
+    CONFLICTS["conflicts"] += 1
+    if attempt >= settings.TURN_CONFLICT_RETRIES:
+        CONFLICTS["gaveUp"] += 1
+        raise HTTPException(status_code=409, detail="Session was updated concurrently, please retry")
+    CONFLICTS["retried"] += 1
+    log.info("turn conflict on session %s, retrying (attempt %d)", session_id, attempt + 1)
 
-    db.commit()
-    db.refresh(session)
-    db.refresh(am)
+@router.post("/message", response_model=ChatMessageResponse)
+async def message(payload: ChatMessageIn, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal_async)):
+    user_id = user.id
+    async with _session_lock(payload.sessionId):
+        attempt = 0
+        while True:
+            text, session, screening, state = await _open_turn(payload, db, user_id)
+            new_state, reply_text, meta = await handle_turn(state, text)
+            session_id = session.id  # rows are expired once a conflict rolls back
+            try:
+                am = await _save_turn(db, session, screening, text, new_state, reply_text)
+                break
+            except _CONFLICTS:
+                await _after_conflict(db, session_id, attempt)
+                attempt += 1
 
     # include meta optionally (dev)
     meta_out = meta if settings.ALLOW_DEV_DEBUG_META else None
@@ -105,55 +167,248 @@ async def message(payload: ChatMessageIn, db: Session = Depends(get_db), user: U
         assistantMessage=AssistantMessageOut(id=am.id, text=reply_text, createdAt=_iso(am.created_at), meta=meta_out),
     )
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/message/stream")
+async def message_stream(payload: ChatMessageIn, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal_async)):
+    """Server-sent events variant of ``/chat/message``.
+
+    Events: ``meta`` (session + planning meta, as soon as the turn is planned), ``token``
+    (reply pieces as the LLM produces them), then ``done`` with the stored assistant
+    message, or ``error`` if generation failed. The turn is stored once, after the last
+    token; a failed or abandoned stream stores nothing, like a failed ``/chat/message``.
+    If the session changed meanwhile, the streamed reply is kept and only the state is
+    re-planned on top of the fresh row.
+    """
+    text, session, screening, state = await _open_turn(payload, db, user.id)
+    new_state, plan = await plan_turn(state, text)
+
+    session_out = ChatSessionOut(id=session.id, title=session.title, createdAt=_iso(session.created_at))
+    session_id = session.id
+    user_id = user.id
+    meta_out = plan.meta if settings.ALLOW_DEV_DEBUG_META else None
+    db.expunge_all()
+
+    async def events():
+        yield _sse("meta", {"session": session_out.model_dump(), "meta": meta_out})
+        parts: List[str] = []
+        try:
+            if plan.compose_args is None:
+                parts.append(plan.reply or "")
+                yield _sse("token", {"text": plan.reply or ""})
+            else:
+                async for piece in composer.compose_stream(**plan.compose_args):
+                    parts.append(piece)
+                    yield _sse("token", {"text": piece})
+        except Exception:
+            log.exception("streamed reply failed for session %s", session_id)
+            yield _sse("error", {"detail": "Reply generation failed"})
+            return
+
+        reply_text = "".join(parts).strip()
+        try:
+            am = await _save_streamed(payload.model_copy(update={"sessionId": session_id}), user_id, session, screening, text, new_state, reply_text)
+        except HTTPException as e:
+            yield _sse("error", {"detail": e.detail})
+            return
+        done = AssistantMessageOut(id=am.id, text=reply_text, createdAt=_iso(am.created_at), meta=meta_out)
+        yield _sse("done", {"assistantMessage": done.model_dump()})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _save_streamed(payload: ChatMessageIn, user_id: str, session: ChatSession, screening: ScreeningSession, text: str, new_state: ScreeningState, reply_text: str) -> ChatMessage:
+    # the request-scoped session may be gone once the response streams; the rows
+    # loaded (or built) for this turn were detached from it and are saved here
+    session_id = session.id
+    async with _session_lock(session_id), AsyncSessionLocal() as sdb:
+        attempt = 0
+        while True:
+            try:
+                return await _save_turn(sdb, session, screening, text, new_state, reply_text)
+            except _CONFLICTS:
+                await _after_conflict(sdb, session_id, attempt)
+                attempt += 1
+            _, session, screening, state = await _open_turn(payload, sdb, user_id)
+            new_state, _ = await plan_turn(state, text)
+
+def _encode_cursor(*parts: Any) -> str:
+    raw = json.dumps([p.isoformat() if isinstance(p, datetime) else p for p in parts], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> List[Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# newest first; id breaks ties so keyset pages never skip or repeat a session
+_SESSION_ORDER = (ChatSession.updated_at.desc(), ChatSession.id.desc())
+
 @router.get("/sessions", response_model=SessionsPage)
-def list_sessions(page: int = Query(1, ge=1), limit: int = Query(20, ge=1, le=50), db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    q = db.query(ChatSession).filter(ChatSession.user_id == user.id).order_by(ChatSession.updated_at.desc())
-    total = q.count()
-    items = q.offset((page-1)*limit).limit(limit).all()
+async def list_sessions(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="keyset paging; empty for the first page, then nextCursor"),
+    includeTotal: bool = Query(False, description="cursor mode: also count all sessions"),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal_async),
+):
+    """List the user's sessions, most recently updated first.
+
+    With ``cursor`` the page is read straight off ``ix_chat_sessions_user_updated``
+    after the last (updated_at, id) seen, so it costs the same on page 1 and page 100
+    and the total is only counted on request. Without it, the old page/limit mode
+    (OFFSET plus a count) is kept for existing clients.
+    """
+    owned = ChatSession.user_id == user.id
+    q = select(ChatSession).where(owned).order_by(*_SESSION_ORDER).limit(limit + 1)
+    keyset = cursor is not None
+    if keyset:
+        if cursor:
+            try:
+                updated_at, last_id = _decode_cursor(cursor)
+                after = (datetime.fromisoformat(updated_at), str(last_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            q = q.where(tuple_(ChatSession.updated_at, ChatSession.id) < tuple_(*after))
+    else:
+        q = q.offset((page-1)*limit)
+    rows = (await db.execute(q)).scalars().all()
+    items, more = rows[:limit], len(rows) > limit
+
+    total = None
+    if not keyset or includeTotal:
+        total = (await db.execute(select(func.count()).select_from(ChatSession).where(owned))).scalar_one()
     return SessionsPage(
-        page=page, limit=limit, total=total,
-        items=[ChatSessionOut(id=s.id, title=s.title, createdAt=_iso(s.created_at)) for s in items]
+        page=None if keyset else page, limit=limit, total=total,
+        items=[ChatSessionOut(id=s.id, title=s.title, createdAt=_iso(s.created_at)) for s in items],
+        nextCursor=_encode_cursor(items[-1].updated_at, items[-1].id) if more else None,
     )
 
+_TRANSCRIPT_PAGE = 50  # default page size once before/after is used
+
+def _transcript_etag(session_id: str, updated_at: datetime, limit: int | None, before: str | None, after: str | None) -> str:
+    # every turn bumps updated_at, so it versions the transcript; the paging
+    # parameters tell apart the pages cut from one version
+    key = f"{session_id}:{updated_at.isoformat()}:{limit or ''}:{before or ''}:{after or ''}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag[2:] in tags
+
 @router.get("/sessions/{session_id}", response_model=SessionDetail)
-def session_detail(session_id: str, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    s = db.query(ChatSession).filter(ChatSession.id == session_id, ChatSession.user_id == user.id).first()
+async def session_detail(
+    session_id: str,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=200, description="page size; alone it returns the newest page"),
+    before: str | None = Query(None, description="message id: page of messages older than it"),
+    after: str | None = Query(None, description="message id: page of messages newer than it"),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal_async),
+):
+    """Transcript of one session, oldest message first.
+
+    Without paging parameters the whole transcript is returned, as before. ``limit``
+    alone returns the newest page; ``before`` / ``after`` page from a message id along
+    ``ix_chat_messages_session_created``. ``hasMore`` tells whether the page stopped
+    short in that direction. The ``ETag`` follows the session's ``updated_at`` and the
+    paging parameters, so a client re-validates a page with ``If-None-Match`` and gets
+    a bodyless 304 when nothing changed.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after")
+    s = await _owned_session(db, session_id, user)
     if not s:
         raise HTTPException(status_code=404, detail="Session not found")
-    msgs = db.query(ChatMessage).filter(ChatMessage.session_id == s.id).order_by(ChatMessage.created_at.asc()).all()
+
+    q = select(ChatMessage).where(ChatMessage.session_id == s.id)
+    key = tuple_(ChatMessage.created_at, ChatMessage.id)
+    anchor_id = before or after
+    if anchor_id:
+        anchor = (await db.execute(
+            select(ChatMessage.created_at, ChatMessage.id).where(ChatMessage.id == anchor_id, ChatMessage.session_id == s.id)
+        )).first()
+        if anchor is None:
+            raise HTTPException(status_code=400, detail="Unknown message id")
+        q = q.where(key < tuple_(*anchor)) if before else q.where(key > tuple_(*anchor))
+        limit = limit or _TRANSCRIPT_PAGE
+
+    # a write-behind cache may hold a newer updated_at than the row
+    hot = get_session_cache().peek(s.id)
+    etag = _transcript_etag(s.id, hot.updated_at if hot is not None else s.updated_at, limit, before, after)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    has_more = None
+    if limit is None:
+        msgs = (await db.execute(q.order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()))).scalars().all()
+    else:
+        newest_first = after is None
+        order = (ChatMessage.created_at.desc(), ChatMessage.id.desc()) if newest_first else (ChatMessage.created_at.asc(), ChatMessage.id.asc())
+        msgs = (await db.execute(q.order_by(*order).limit(limit + 1))).scalars().all()
+        has_more = len(msgs) > limit
+        msgs = msgs[:limit]
+        if newest_first:
+            msgs.reverse()
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
     return SessionDetail(
         session=ChatSessionOut(id=s.id, title=s.title, createdAt=_iso(s.created_at)),
-        messages=[{"id": m.id, "role": m.role, "text": m.text, "createdAt": _iso(m.created_at)} for m in msgs]
+        messages=[{"id": m.id, "role": m.role, "text": m.text, "createdAt": _iso(m.created_at)} for m in msgs],
+        hasMore=has_more,
     )
 
 @router.delete("/sessions/{session_id}")
-def delete_session(session_id: str, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    s = db.query(ChatSession).filter(ChatSession.id == session_id, ChatSession.user_id == user.id).first()
-    if not s:
-        return {"ok": True}
-    db.delete(s)
-    db.commit()
+async def delete_session(session_id: str, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal_async)):
+    # messages and the screening row go with it (ondelete=CASCADE)
+    await purge.delete_sessions(db, user.id, [session_id])
+    await db.commit()
+    get_session_cache().invalidate(session_id)
+    reports.get_report_cache().discard(session_id)
     return {"ok": True}
 
 @router.delete("/sessions")
-def delete_all_sessions(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    sessions = db.query(ChatSession).filter(ChatSession.user_id == user.id).all()
-    for s in sessions:
-        db.delete(s)
-    db.commit()
+async def delete_all_sessions(background: BackgroundTasks, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal_async)):
+    """Delete every session of the user; very long histories are purged in the background."""
+    get_session_cache().invalidate_user(user.id)
+    reports.get_report_cache().discard_user(user.id)
+    if purge.should_defer(await purge.count_sessions(db, user.id)):
+        # the purge discards the user's reports again when done, in case one was rendered meanwhile
+        background.add_task(purge.run_in_background, purge.purge_sessions_chunked, user.id, datetime.utcnow())
+        return {"ok": True, "queued": True}
+    await purge.delete_sessions(db, user.id)
+    await db.commit()
     return {"ok": True}
 
 @router.get("/sessions/{session_id}/report")
-def get_report(session_id: str, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    s = db.query(ChatSession).filter(ChatSession.id == session_id, ChatSession.user_id == user.id).first()
-    if not s:
-        raise HTTPException(status_code=404, detail="Session not found")
-    screening = db.query(ScreeningSession).filter(ScreeningSession.session_id == s.id).first()
-    if not screening:
-        raise HTTPException(status_code=404, detail="Screening not found")
-    state = {
-        "active_disorder_id": screening.active_disorder_id,
-        "slots_json": screening.slots_json,
-        "hypotheses_json": screening.hypotheses_json,
-    }
-    return build_report(state)
+async def get_report(session_id: str, if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal_async)):
+    """Screening report, memoized per session and versioned by its inputs (``ETag``)."""
+    hot = get_session_cache().get(session_id, user.id)
+    if hot is not None:
+        # newest state, even when write-behind has not flushed it yet
+        state = hot.state
+    else:
+        s = await _owned_session(db, session_id, user)
+        if not s:
+            raise HTTPException(status_code=404, detail="Session not found")
+        screening = await _screening_for(db, s.id)
+        if not screening:
+            raise HTTPException(status_code=404, detail="Screening not found")
+        state = ScreeningState.from_row(screening)
+    version = reports.report_version(state)
+    headers = {"ETag": reports.etag_for(version), "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    _, body = reports.render(session_id, state, version, user.id)
+    return Response(content=body, media_type="application/json", headers=headers)
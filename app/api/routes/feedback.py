@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from ...core.db import get_db
-from ..deps import get_current_user
-from ...models import User, Feedback
+from ..deps import get_current_principal
+from ...core.principals import Principal
+from ...models import Feedback, ChatSession
 from ..schemas import FeedbackIn
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
 @router.post("")
-def create_feedback(payload: FeedbackIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def create_feedback(payload: FeedbackIn, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
+    # session_id is a real foreign key (enforced on SQLite too), so check it up front
+    if payload.sessionId and not db.query(ChatSession.id).filter(ChatSession.id == payload.sessionId, ChatSession.user_id == user.id).first():
+        raise HTTPException(status_code=404, detail="Session not found")
     fb = Feedback(user_id=user.id, session_id=payload.sessionId, rating=payload.rating, comment=payload.comment)
     db.add(fb)
     db.commit()
@@ -1,7 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from ...core.config import settings
 from ...core.db import get_db
+from ...core.passwords import get_password_hasher
+from ...core.principals import get_principal_cache
+from ...core.startup import startup_stats
+from ...rubric.registry import get_registry
+from ...llm.openai_client import pool_stats
+from ...llm.cache import cache_stats
+from ...conversation.orchestrator import turn_stats, extract_stats
+from ...conversation.session_cache import get_session_cache
+from ...conversation.reports import get_report_cache
+from .chat import conflict_stats
+from ...services.purge import purge_stats, refresh_token_count
+from ...services.cert_cache import cert_stats
 
 router = APIRouter(tags=["misc"])
 
@@ -11,8 +23,30 @@ def health():
 
 @router.get("/version")
 def version():
-    return {"version": settings.API_VERSION}
+    return {"version": settings.API_VERSION, "rubricVersion": get_registry().snapshot().version}
 
 @router.get("/config/app")
 def app_config():
     return {"chatEnabled": True, "screeningEnabled": True}
+
+@router.get("/stats")
+def stats(db: Session = Depends(get_db)):
+    # runtime counters for QA / load testing; hidden like the debug meta
+    if not settings.ALLOW_DEV_DEBUG_META:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {
+        "rubrics": get_registry().stats(),
+        "llmPool": pool_stats(),
+        "llmCache": cache_stats(),
+        "turnPaths": turn_stats(),
+        "extractPaths": extract_stats(),
+        "hotSessions": get_session_cache().stats(),
+        "turnConflicts": conflict_stats(),
+        "purges": purge_stats(),
+        "refreshTokens": {"rows": refresh_token_count(db), "purged": purge_stats()["refreshTokens"]},
+        "reports": get_report_cache().stats(),
+        "principals": get_principal_cache().stats(),
+        "passwordHashing": get_password_hasher().stats(),
+        "startup": startup_stats(),
+        "idTokenCerts": cert_stats(),
+    }
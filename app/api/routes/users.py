@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ...core.db import get_db
-from ..deps import get_current_user
+from ...core.db import get_db, get_async_db
+from ..deps import get_current_user, get_current_principal_async
+from ...core.principals import Principal, get_principal_cache
+from ...conversation.reports import get_report_cache
 from ...models import User
+from ...conversation.session_cache import get_session_cache
+from ...services import purge
 from ..schemas import ProfileOut, ProfilePatch
 from ...utils.dates import iso_to_ddmmyyyy, normalize_ddmmyyyy, ddmmyyyy_to_iso
 from ...services.image_uploads import upload_profile_image_file
@@ -48,3 +53,24 @@ def upload_avatar(file: UploadFile = File(...), db: Session = Depends(get_db), u
     user.profile_image_url = upload_profile_image_file(data, filename=file.filename)
     db.commit()
     return {"profileImageUrl": user.profile_image_url}
+
+@router.delete("/me")
+async def delete_me(background: BackgroundTasks, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal_async)):
+    """Delete the account with its sessions, refresh tokens and feedback (all by FK cascade).
+
+    A long history is purged in the background; the account is disabled and its
+    email released right away, so it cannot be used meanwhile.
+    """
+    user_id = user.id
+    get_session_cache().invalidate_user(user_id)
+    get_report_cache().discard_user(user_id)
+    if purge.should_defer(await purge.count_sessions(db, user_id)):
+        await purge.retire_user(db, user_id)
+        await db.commit()
+        get_principal_cache().invalidate_user(user_id)
+        background.add_task(purge.run_in_background, purge.purge_user, user_id)
+        return {"ok": True, "queued": True}
+    await purge.delete_user(db, user_id)
+    await db.commit()
+    get_principal_cache().invalidate_user(user_id)
+    return {"ok": True}
@@ -73,14 +73,16 @@ class ChatMessageResponse(BaseModel):
     assistantMessage: AssistantMessageOut
 
 class SessionsPage(BaseModel):
-    page: int
+    page: Optional[int] = None  # page/limit mode only
     limit: int
-    total: int
+    total: Optional[int] = None  # always in page/limit mode; with includeTotal in cursor mode
     items: List[ChatSessionOut]
+    nextCursor: Optional[str] = None  # pass as ?cursor= for the next page; None on the last one
 
 class SessionDetail(BaseModel):
     session: ChatSessionOut
     messages: List[Dict[str, Any]]
+    hasMore: Optional[bool] = None  # paged requests: more messages beyond this page
 
 class FeedbackIn(BaseModel):
     sessionId: Optional[str] = None
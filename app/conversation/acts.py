@@ -54,8 +54,65 @@ class ActResult:
     act: str
     signals: dict
 
+# Precedence, highest first. Within a group the first listed pattern wins.
+_PRECEDENCE = (
+    (ACT_CRISIS, CRISIS_PATTERNS),
+    (ACT_GREETING, GREETING_PATTERNS),
+    (ACT_CONFUSION, CONFUSION_PATTERNS),
+    (ACT_RESIST, RESIST_PATTERNS),
+    (ACT_FAQ, FAQ_PATTERNS),  # only for messages of 10 words or fewer
+    (ACT_SYMPTOM, SYMPTOM_PATTERNS),
+    (ACT_DIRECT_ANSWER, ANSWER_LIKE),
+)
+FAQ_MAX_WORDS = 10
+
+def _combine(with_faq: bool):
+    """Fold every pattern into one regex scanned once over the message.
+
+    Pattern ``k`` in precedence order becomes the named group ``p<k>`` inside a single
+    zero-width lookahead, so ``finditer`` reports, at each position, the highest-priority
+    pattern that matches there; the lowest ``k`` over all positions is the act the
+    pattern-by-pattern loop would pick. Every pattern starts with ``^`` or ``\\b`` and a
+    word character, so positions inside a word are skipped with ``(?<!\\w)``.
+    """
+    branches, tags = [], {}
+    for act, patterns in _PRECEDENCE:
+        if act == ACT_FAQ and not with_faq:
+            continue
+        for pat in patterns:
+            if not pat.startswith(("^", r"\b")):
+                raise ValueError(f"act pattern must start with ^ or \\b: {pat}")
+            name = f"p{len(tags)}"
+            tags[name] = (len(tags), act, pat)
+            branches.append(f"(?P<{name}>{pat})")
+    return re.compile(r"(?<!\w)(?=" + "|".join(branches) + ")"), tags
+
+_MATCHER_WITH_FAQ = _combine(with_faq=True)
+_MATCHER_NO_FAQ = _combine(with_faq=False)
+
 def classify_act(user_text: str) -> ActResult:
     t=user_text.strip().lower()
+    n_words = len(t.split())
+
+    rx, tags = _MATCHER_WITH_FAQ if n_words <= FAQ_MAX_WORDS else _MATCHER_NO_FAQ
+    best = None
+    for m in rx.finditer(t):
+        tag = tags[m.lastgroup]
+        if best is None or tag[0] < best[0]:
+            best = tag
+            if tag[0] == 0:
+                break
+    if best is not None:
+        return ActResult(best[1], {"matched": best[2]})
+
+    if n_words <= 4:
+        return ActResult(ACT_SMALL_TALK, {})
+
+    return ActResult(ACT_OFFTOPIC, {})
+
+def classify_act_reference(user_text: str) -> ActResult:
+    """Pattern-by-pattern version of ``classify_act``; kept as the reference for tests and benchmarks."""
+    t=user_text.strip().lower()
 
     for pat in CRISIS_PATTERNS:
         if re.search(pat,t):
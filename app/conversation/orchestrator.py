@@ -1,15 +1,17 @@
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import Any, Dict, Tuple, List
-import json
+import asyncio
+import re
 
 from .acts import classify_act
 from .readiness import update_readiness
 from .planner import plan_next
 from .hypotheses import ema_update, softmax, apply_gating, pick_top
-from ..rubric.loader import load_disorders
-from ..rubric.engine import evaluate_disorder, missing_slots as rubric_missing_slots
-from ..llm.extractor import extract
-from ..llm.composer import compose
+from .state import ScreeningState
+from ..core.config import settings
+from ..rubric.registry import BASE_SLOTS, get_registry
+from ..llm import extractor, composer
 
 DISCLAIMER = "I’m not a clinician and I can’t diagnose. I can help with an educational, structured symptom screening and suggest next steps."
 
@@ -30,7 +32,7 @@ def _domain_scores(domain: str, disorders: Dict[str,Any]) -> Dict[str,float]:
         scores["unspecified"] = 0.6
     return softmax(scores)
 
-def _progress_hint(state: Dict[str,Any], active: str|None, last_eval: Dict[str,Any]|None) -> str|None:
+def _progress_hint(state: ScreeningState, active: str|None, last_eval: Dict[str,Any]|None) -> str|None:
     if not active or not last_eval:
         return None
     cov = int(last_eval.get("coverage",0)*100)
@@ -66,74 +68,226 @@ def _intent_to_question(intent: str, slot_targets: List[str], disorders: Dict[st
         return f"Could you tell me a bit about {hint}?"
     return None
 
-async def handle_turn(state: Dict[str,Any], user_text: str) -> Tuple[Dict[str,Any], str, Dict[str,Any]]:
-    disorders = load_disorders()
+@dataclass
+class TurnPlan:
+    """Everything decided for a turn once extraction results are applied."""
+    compose_args: Dict[str,Any] | None  # None when the reply is fixed (crisis)
+    reply: str | None
+    meta: Dict[str,Any]
+
+_NO_FACTS: Dict[str,Any] = {"facts": {"slots": {}}}
+
+# acts for which the planner stays on the relational track whatever extraction returns
+_RELATIONAL_ACTS = ("GREETING","SMALL_TALK","CONFUSION","RESISTANCE")
+
+TURN_PATHS = {"sequential": 0, "concurrent": 0, "concurrent_replanned": 0, "streamed": 0}
+
+def turn_stats() -> Dict[str,int]:
+    return dict(TURN_PATHS)
+
+EXTRACT_PATHS = {"llm": 0, "signals": 0}
+
+# estimated prompt tokens sent to the extractor (cache hits included; see openai_client for billed usage)
+PROMPT_TOKENS = {"extract": 0}
+
+def extract_stats() -> Dict[str,int]:
+    return dict(EXTRACT_PATHS, promptTokensEstimate=PROMPT_TOKENS["extract"])
+
+def _intent_slot(intent: str | None) -> str | None:
+    """The slot the previous question asked about, if any."""
+    intent = intent or ""
+    if intent == "ask_age_soft":
+        return "age_years"
+    if intent.startswith("clarify_"):
+        return intent[len("clarify_"):].removesuffix("_rephrase")
+    return None
+
+def _slot_catalog(state: ScreeningState, registry) -> List[str]:
+    """Slot names offered to the extractor: base facts, disorders still in play, the current target."""
+    h = state.hypotheses
+    if not h:
+        return list(registry.known_slots_sorted)
+    keep = {did for did, p in h.items() if p >= settings.EXTRACT_CATALOG_MIN_HYPOTHESIS}
+    if state.active_disorder_id:
+        keep.add(state.active_disorder_id)
+    names = set(BASE_SLOTS)
+    for did in keep:
+        rubric = registry.rubrics.get(did)
+        if rubric is not None:
+            names.update(rubric.slot_types)
+    target = _intent_slot(state.last_intent)
+    if target:
+        names.add(target)
+    return sorted(names)
+
+# numbers, ages and time spans: facts the signal pass cannot read; a false hit only costs an LLM call
+_QUANTITY = re.compile(
+    r"\d|\b(?:one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|"
+    r"(?:thir|four|fif|six|seven|eigh|nine)teen|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|"
+    r"half|couple|few|several|dozen|hours?|days?|weeks?|fortnight|months?|years?|yrs?|"
+    r"old|age|aged|ago|since|birthday|teens?)\b",
+    re.IGNORECASE,
+)
+
+def _needs_llm(state: ScreeningState, registry, matched: Dict[str,bool], user_text: str) -> bool:
+    # The signal pass only knows boolean symptom slots. Ask the LLM whenever the
+    # turn may carry anything else: the opening concern, an answer to a non-boolean
+    # question, or an age or duration volunteered alongside a yes/no answer.
+    if not matched or not state.presenting_concern:
+        return True
+    target = _intent_slot(state.last_intent)
+    if target is not None and target not in registry.signals.boolean_slots:
+        return True
+    return _QUANTITY.search(user_text) is not None
+
+async def _extract(state: ScreeningState, registry, user_text: str, known_slots: List[str]) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    matched = registry.signals.match(user_text) if settings.SIGNAL_EXTRACTION_ENABLED else {}
+    if not _needs_llm(state, registry, matched, user_text):
+        EXTRACT_PATHS["signals"] += 1
+        return {"facts": {"slots": matched}}, {"extractPath": "signals", "extractPromptTokens": 0}
+    EXTRACT_PATHS["llm"] += 1
+    tokens = extractor.estimate_tokens(extractor.build_messages(user_text, known_slots))
+    PROMPT_TOKENS["extract"] += tokens
+    extracted = await extractor.extract(user_text, known_slots)
+    if matched:
+        # the LLM reads context (negation, who it's about) better; its values win when it gives one
+        facts = dict(extracted.get("facts", {}) or {})
+        llm_slots = {k: v for k, v in (facts.get("slots", {}) or {}).items() if v is not None}
+        facts["slots"] = {**matched, **llm_slots}
+        extracted = dict(extracted, facts=facts)
+    return extracted, {"extractPath": "llm", "extractPromptTokens": tokens, "extractCatalogSize": len(known_slots)}
+
+def _can_overlap(readiness: str, act: str) -> bool:
+    # Relational turns plan from act/readiness/presenting_concern only, so the plan made
+    # before extraction is almost always the final one. The guess is verified afterwards.
+    if act == "CRISIS":
+        return False
+    return readiness != "READY" or act in _RELATIONAL_ACTS
+
+def _silence_task(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+def _begin(state: ScreeningState, user_text: str):
+    registry = get_registry().snapshot()
 
     act_res = classify_act(user_text)
-    readiness_res = update_readiness(state.get("readiness","WARMING"), act_res, user_text)
-    state["readiness"] = readiness_res.level
-
-    # known slots across disorders for extraction
-    known_slots = set()
-    for d in disorders.values():
-        for s in (d.get("slots") or {}).keys():
-            known_slots.add(s)
-        for s in (d.get("exclusion_slots") or {}).keys():
-            known_slots.add(s)
-    known_slots.update(["age_years","presenting_concern","subject_type","domain"])
-    extracted = await extract(user_text, sorted(known_slots))
+    readiness_res = update_readiness(state.readiness or "WARMING", act_res, user_text)
+    state.readiness = readiness_res.level
+
+    # slot catalog for extraction, scoped to the disorders still in play
+    known_slots = _slot_catalog(state, registry)
+    return registry, act_res, known_slots
+
+async def plan_turn(state: ScreeningState, user_text: str) -> Tuple[ScreeningState, TurnPlan]:
+    """Everything ``handle_turn`` does except composing the reply.
+
+    Used by the streaming endpoint: the caller sends ``plan.meta`` right away and then
+    streams ``composer.compose_stream(**plan.compose_args)`` (or ``plan.reply`` when fixed).
+    """
+    registry, act_res, known_slots = _begin(state, user_text)
+    extracted, extract_info = await _extract(state, registry, user_text, known_slots)
+    turn = _advance(state, registry, act_res, user_text, extracted)
+    TURN_PATHS["streamed"] += 1
+    turn.meta = dict(turn.meta, turnPath="streamed", **extract_info)
+    return state, turn
+
+async def handle_turn(state: ScreeningState, user_text: str) -> Tuple[ScreeningState, str, Dict[str,Any]]:
+    registry, act_res, known_slots = _begin(state, user_text)
+
+    if _can_overlap(state.readiness, act_res.act):
+        # plan as if extraction found nothing and compose while extraction runs
+        guess = _advance(state.copy(), registry, act_res, user_text, _NO_FACTS)
+        compose_task = asyncio.create_task(composer.compose(**guess.compose_args))
+        compose_task.add_done_callback(_silence_task)
+        try:
+            extracted, extract_info = await _extract(state, registry, user_text, known_slots)
+        except BaseException:
+            compose_task.cancel()
+            raise
+        turn = _advance(state, registry, act_res, user_text, extracted)
+        if turn.compose_args == guess.compose_args:
+            path = "concurrent"
+            reply = await compose_task
+        else:
+            # extraction changed what we would say; drop the guess and compose for real
+            path = "concurrent_replanned"
+            compose_task.cancel()
+            reply = await composer.compose(**turn.compose_args)
+    else:
+        path = "sequential"
+        extracted, extract_info = await _extract(state, registry, user_text, known_slots)
+        turn = _advance(state, registry, act_res, user_text, extracted)
+        if turn.compose_args is None:
+            reply = turn.reply
+        else:
+            reply = await composer.compose(**turn.compose_args)
+
+    TURN_PATHS[path] += 1
+    meta = dict(turn.meta, turnPath=path, **extract_info)
+    return state, reply, meta
+
+def _advance(state: ScreeningState, registry, act_res, user_text: str, extracted: Dict[str,Any]) -> TurnPlan:
+    """Apply extraction results to ``state`` and run the deterministic part of the turn."""
+    disorders = registry.disorders
 
     facts = extracted.get("facts", {}) or {}
     slots_update = facts.get("slots", {}) or {}
     # update high-level session facts
-    if facts.get("presenting_concern") and not state.get("presenting_concern"):
-        state["presenting_concern"] = str(facts["presenting_concern"]).strip()[:1000]
+    if facts.get("presenting_concern") and not state.presenting_concern:
+        state.presenting_concern = str(facts["presenting_concern"]).strip()[:1000]
     if facts.get("subject_type"):
-        state["subject_type"] = facts["subject_type"]
+        state.subject_type = facts["subject_type"]
     if facts.get("age_years") is not None:
         try:
-            state["age_years"] = int(facts["age_years"])
+            state.age_years = int(facts["age_years"])
         except Exception:
             pass
     domain = facts.get("domain")
     if domain and domain != "unknown":
-        state["domain"] = domain
+        state.domain = domain
 
     # update slot values and slot states deterministically
-    slots = json.loads(state.get("slots_json","{}") or "{}")
-    slot_states = json.loads(state.get("slot_state_json","{}") or "{}")
+    prev_slots = state.slots
+    slots = dict(prev_slots)
+    slot_states = dict(state.slot_states)
     for k,v in slots_update.items():
         slots[k] = v
         slot_states[k] = "RESOLVED"
-    state["slots_json"] = json.dumps(slots)
-    state["slot_state_json"] = json.dumps(slot_states)
+    state.slots = slots
+    state.slot_states = slot_states
 
     # hypothesis update
-    prev_h = json.loads(state.get("hypotheses_json","{}") or "{}")
+    prev_h = state.hypotheses
     if not prev_h:
         prev_h = _default_hypotheses(disorders)
-    dom = state.get("domain","unknown")
+    dom = state.domain
     new_h = _domain_scores(dom, disorders)
     h = ema_update(prev_h, new_h, alpha=0.35)
-    h = apply_gating(h, disorders, state.get("age_years"))
+    h = apply_gating(h, disorders, state.age_years)
     h = softmax(h)
-    state["hypotheses_json"] = json.dumps(h)
+    # softmax turns a gated 0.0 back into a positive share; gated disorders must stay at 0
+    h = apply_gating(h, disorders, state.age_years)
+    state.hypotheses = h
 
     active = pick_top(h)
-    state["active_disorder_id"] = active
+    state.active_disorder_id = active
 
-    # evaluate rubric silently
+    # evaluate rubrics silently: every loaded disorder in one pass, active one in detail.
+    # Only criteria reading a slot that changed this turn are re-run against last turn's snapshot.
+    screen = registry.matrix.evaluate_incremental(slots, prev_slots, state.eval_snapshot)
+    state.eval_snapshot = screen.snapshot()
     eval_res = None
     missing = []
     if active:
-        eval_res = evaluate_disorder(disorders[active], slots)
-        missing = rubric_missing_slots(disorders[active], slots)
+        eval_res = screen.evaluation(active)
+        missing = screen.missing_slots(active)
 
     # phase transitions are deterministic and NOT hard-coded by disorder
-    state["turns"] = int(state.get("turns",0)) + 1
-    if state.get("presenting_concern") and state["readiness"] == "READY":
-        if state.get("phase") == "INTAKE":
-            state["phase"] = "SCREENING"  # still uses planner for relational/clinical
+    state.turns = int(state.turns or 0) + 1
+    if state.presenting_concern and state.readiness == "READY":
+        if state.phase == "INTAKE":
+            state.phase = "SCREENING"  # still uses planner for relational/clinical
 
     # Report readiness gate
     # 1) require rubric probable/possible AND interaction requirements AND closure ack
@@ -142,28 +296,28 @@ async def handle_turn(state: Dict[str,Any], user_text: str) -> Tuple[Dict[str,An
         req = disorders[active].get("interaction_requirements",{})
         min_turns = int(req.get("min_turns", 6))
         if eval_res["outcome"] in ("PROBABLE_MATCH","POSSIBLE_MATCH"):
-            if state["turns"] >= min_turns and state.get("progress_summaries",0) >= (1 if req.get("require_progress_summary",True) else 0):
-                if (not req.get("require_closure_ack",True)) or state.get("closure_ack"):
+            if state.turns >= min_turns and state.progress_summaries >= (1 if req.get("require_progress_summary",True) else 0):
+                if (not req.get("require_closure_ack",True)) or state.closure_ack:
                     report_ready = True
     if report_ready:
-        state["phase"] = "REPORT_READY"
+        state.phase = "REPORT_READY"
 
     # planner decides next
-    plan = plan_next(state["readiness"], act_res.act, state, missing, state.get("last_question_fingerprint"))
-    state["track"] = plan.track
-    state["last_intent"] = plan.intent
-    state["last_question_fingerprint"] = plan.fingerprint
+    plan = plan_next(state.readiness, act_res.act, state, missing, state.last_question_fingerprint)
+    state.track = plan.track
+    state.last_intent = plan.intent
+    state.last_question_fingerprint = plan.fingerprint
 
     # update progress summary / closure prompts
     if plan.intent == "progress_summary":
-        state["progress_summaries"] = int(state.get("progress_summaries",0)) + 1
-        state["closure_prompted"] = True
+        state.progress_summaries = int(state.progress_summaries or 0) + 1
+        state.closure_prompted = True
     if plan.intent == "closure_checkin":
-        state["closure_prompted"] = True
+        state.closure_prompted = True
     # if user acknowledges closure after closure_checkin
-    if state.get("closure_prompted") and not state.get("closure_ack"):
+    if state.closure_prompted and not state.closure_ack:
         if act_res.act in ("DIRECT_ANSWER",) and user_text.strip().lower() in ("yes","yeah","yep","ok","okay","sure"):
-            state["closure_ack"] = True
+            state.closure_ack = True
 
     # Build question and progress hint
     question = _intent_to_question(plan.intent, plan.slot_targets, disorders, active)
@@ -177,8 +331,10 @@ async def handle_turn(state: Dict[str,Any], user_text: str) -> Tuple[Dict[str,An
     # crisis safety message
     if act_res.act == "CRISIS":
         reply = "I’m really sorry you’re feeling this way. If you might be in immediate danger or thinking about harming yourself, please seek urgent help right now (local emergency services), or reach out to a trusted person or a local crisis hotline. If you tell me your country, I can suggest options.\n\nIf you feel safe to continue, what’s going on right now?"
+        compose_args = None
     else:
-        reply = await compose(
+        reply = None
+        compose_args = dict(
             user_text=user_text,
             intent=plan.intent if act_res.act != "QUESTION_FAQ" else "faq",
             question=question,
@@ -187,24 +343,28 @@ async def handle_turn(state: Dict[str,Any], user_text: str) -> Tuple[Dict[str,An
         )
 
     meta = {
-        "phase": state.get("phase"),
-        "readiness": state.get("readiness"),
-        "track": state.get("track"),
+        "phase": state.phase,
+        "readiness": state.readiness,
+        "track": state.track,
         "activeHypotheses": h,
         "activeDisorderId": active,
         "missingSlots": missing,
         "nextIntent": plan.intent,
         "rubricOutcome": eval_res["outcome"] if eval_res else None,
         "rubricConfidence": eval_res["confidence"] if eval_res else None,
+        "differential": screen.differential(),
+        "rubricRulesEvaluated": screen.rules_evaluated,
     }
 
-    return state, reply, meta
+    return TurnPlan(compose_args=compose_args, reply=reply, meta=meta)
+
 
-def build_report(state: Dict[str,Any]) -> Dict[str,Any]:
-    disorders = load_disorders()
-    active = state.get("active_disorder_id")
-    slots = json.loads(state.get("slots_json","{}") or "{}")
-    h = json.loads(state.get("hypotheses_json","{}") or "{}")
+def build_report(state: ScreeningState) -> Dict[str,Any]:
+    registry = get_registry().snapshot()
+    disorders = registry.disorders
+    active = state.active_disorder_id
+    slots = state.slots
+    h = state.hypotheses
     if not active or active not in disorders:
         return {
             "active_disorder": None,
@@ -214,7 +374,7 @@ def build_report(state: Dict[str,Any]) -> Dict[str,Any]:
             "disclaimer": DISCLAIMER,
             "hypotheses": h,
         }
-    ev = evaluate_disorder(disorders[active], slots)
+    ev = registry.matrix.evaluate_all(slots).evaluation(active)
     return {
         "active_disorder": active,
         "disorder_name": disorders[active]["name"],
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, List
 import hashlib
 
+if TYPE_CHECKING:
+    from .state import ScreeningState
+
 RELATIONAL="RELATIONAL"
 CLINICAL="CLINICAL"
 
@@ -22,7 +25,7 @@ def fingerprint_intent(intent: str, slot_targets: List[str]) -> str:
 def plan_next(
     readiness: str,
     act: str,
-    session_state: Dict[str, Any],
+    session_state: "ScreeningState",
     missing_slots: List[str],
     last_fp: str|None,
 ) -> Plan:
@@ -35,14 +38,14 @@ def plan_next(
         return Plan(RELATIONAL, "crisis_referral", [], protected, fingerprint_intent("crisis_referral", []))
     if readiness != "READY" or act in ("GREETING","SMALL_TALK","CONFUSION","RESISTANCE"):
         # don't ask age here. build rapport and get presenting concern.
-        if not session_state.get("presenting_concern"):
+        if not session_state.presenting_concern:
             return Plan(RELATIONAL, "rapport_open", [], protected, fingerprint_intent("rapport_open", []))
         return Plan(RELATIONAL, "reflect_and_gentle_narrow", [], protected, fingerprint_intent("reflect_and_gentle_narrow", []))
 
     # 2) READY: start clinical narrowing but still empathetic
     # avoid repeated same question intent
     # priority slots: presenting concern -> subject -> age after rapport
-    if session_state.get("presenting_concern") and session_state.get("age_years") is None:
+    if session_state.presenting_concern and session_state.age_years is None:
         # ask age conversationally after rapport. Not first-turn.
         return Plan(RELATIONAL, "ask_age_soft", ["age_years"], protected, fingerprint_intent("ask_age_soft", ["age_years"]))
 
@@ -56,9 +59,9 @@ def plan_next(
 
     if not targets:
         # if rubric sufficient, move to closure gate
-        if session_state.get("closure_prompted") and not session_state.get("closure_ack"):
+        if session_state.closure_prompted and not session_state.closure_ack:
             return Plan(RELATIONAL, "closure_checkin", [], protected, fingerprint_intent("closure_checkin", []))
-        if not session_state.get("closure_prompted"):
+        if not session_state.closure_prompted:
             return Plan(RELATIONAL, "progress_summary", [], protected, fingerprint_intent("progress_summary", []))
         return Plan(RELATIONAL, "offer_report", [], protected, fingerprint_intent("offer_report", []))
 
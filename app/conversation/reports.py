@@ -0,0 +1,134 @@
+"""Memoized screening reports.
+
+A report depends only on the active disorder, the slots, the hypotheses and
+the rubric version. It used to be rebuilt on every GET. ``report_version`` hashes
+exactly those inputs, and the rendered JSON is kept per session in a small LRU
+until the version changes. The same version is the report's ``ETag``, so a
+client that already has it gets a 304 without anything being rendered.
+
+When a turn moves a session to ``REPORT_READY``, ``schedule_precompute`` renders
+the report in a worker thread after the turn, so the first GET is already a hit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from ..core.config import settings
+from ..rubric.registry import get_registry
+from .orchestrator import build_report
+from .state import ScreeningState
+
+log = logging.getLogger(__name__)
+
+_ORJSON = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def report_version(state: ScreeningState, rubric_version: str | None = None) -> str:
+    rubric_version = rubric_version or get_registry().snapshot().version
+    raw = orjson.dumps([rubric_version, state.active_disorder_id, state.slots, state.hypotheses], option=_ORJSON)
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+def etag_for(version: str) -> str:
+    return f'W/"{version}"'
+
+
+class ReportCache:
+    """Latest rendered report per session, as JSON bytes (remembering the owner for ``discard_user``)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[str, bytes, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "precomputed": 0, "evictions": 0}
+
+    def get(self, session_id: str, version: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(session_id)
+            if item is None or item[0] != version:
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(session_id)
+            self._stats["hits"] += 1
+            return item[1]
+
+    def has(self, session_id: str, version: str) -> bool:
+        with self._lock:
+            item = self._data.get(session_id)
+            return item is not None and item[0] == version
+
+    def set(self, session_id: str, version: str, body: bytes, precomputed: bool = False, user_id: str | None = None) -> None:
+        with self._lock:
+            if precomputed:
+                self._stats["precomputed"] += 1
+            self._data[session_id] = (version, body, user_id)
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def discard_user(self, user_id: str) -> None:
+        with self._lock:
+            for sid in [sid for sid, item in self._data.items() if item[2] == user_id]:
+                del self._data[sid]
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self._stats)
+        lookups = out["hits"] + out["misses"]
+        out.update({
+            "entries": len(self._data),
+            "hitRate": round(out["hits"] / lookups, 4) if lookups else 0.0,
+        })
+        return out
+
+
+_cache: ReportCache | None = None
+
+
+def get_report_cache() -> ReportCache:
+    global _cache
+    if _cache is None:
+        _cache = ReportCache(settings.REPORT_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def _render(state: ScreeningState) -> bytes:
+    return orjson.dumps(build_report(state), option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def render(session_id: str, state: ScreeningState, version: str | None = None, user_id: str | None = None) -> Tuple[str, bytes]:
+    """(version, report JSON) for the session, from the cache when the inputs are unchanged."""
+    version = version or report_version(state)
+    cache = get_report_cache()
+    body = cache.get(session_id, version)
+    if body is None:
+        body = _render(state)
+        cache.set(session_id, version, body, user_id=user_id)
+    return version, body
+
+
+def _precompute(session_id: str, state: ScreeningState, user_id: str | None) -> None:
+    try:
+        version = report_version(state)
+        cache = get_report_cache()
+        if not cache.has(session_id, version):
+            cache.set(session_id, version, _render(state), precomputed=True, user_id=user_id)
+    except Exception:
+        log.exception("report precompute failed for session %s", session_id)
+
+
+def schedule_precompute(session_id: str, state: ScreeningState, user_id: str | None = None) -> None:
+    """Render the report in a worker thread; the caller's request does not wait for it."""
+    asyncio.get_running_loop().run_in_executor(None, _precompute, session_id, state.copy(), user_id)
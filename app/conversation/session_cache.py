@@ -0,0 +1,309 @@
+"""In-process cache of recently active screening sessions.
+
+An active chat sends a message every few seconds, and every turn used to start
+by reading its ``ChatSession`` and ``ScreeningSession`` rows. ``HotSessionCache``
+keeps the state of recently used sessions, keyed by session id, in an LRU
+bounded by size and idle time. A turn on a cached session goes straight to the
+orchestrator. A miss reads the rows as before, and the session is cached once
+its turn is saved.
+
+Writes (``HOT_SESSION_WRITE_MODE``):
+
+- ``through`` (default): each turn commits its state change together with its
+  messages, exactly as without the cache.
+- ``behind``: messages are still committed with the turn. The screening state
+  and the session's ``updated_at`` are marked dirty and written by ``flush()``,
+  which runs every ``HOT_SESSION_FLUSH_SECONDS`` from the app lifespan and on
+  shutdown. Dirty sessions evicted from the LRU are written on the next flush.
+  A crash loses at most one interval of state, and session lists may order by
+  a slightly old ``updated_at``.
+
+The cache belongs to one process. In ``through`` mode an entry made stale by
+another worker fails the ``ScreeningSession.version`` check on save; the turn
+drops the entry and re-runs on the fresh row. ``behind`` needs sticky sessions.
+Routes that delete sessions must call ``invalidate`` / ``invalidate_user``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
+
+from ..core.config import settings
+from ..core.db import AsyncSessionLocal
+from ..models import ChatSession, ScreeningSession
+from .state import PERSISTED, ScreeningState
+
+log = logging.getLogger(__name__)
+
+WRITE_MODES = ("through", "behind")
+
+
+@dataclass(slots=True)
+class HotSession:
+    session_id: str
+    user_id: str
+    title: str
+    created_at: datetime
+    updated_at: datetime
+    screening_id: str
+    version: int  # ScreeningSession.version the state was stored at
+    state: ScreeningState  # latest values; ``state._loaded`` is what the database holds
+    touched: bool = False  # updated_at not written yet (write-behind)
+    last_used: float = 0.0
+
+    @property
+    def dirty(self) -> bool:
+        return self.touched or bool(self.state.changed_fields())
+
+    def rows(self) -> Tuple[ChatSession, ScreeningSession]:
+        """Detached rows as stored; attributes set on them later become UPDATEs."""
+        session = ChatSession(
+            id=self.session_id, user_id=self.user_id, title=self.title,
+            created_at=self.created_at, updated_at=self.updated_at,
+        )
+        screening = ScreeningSession(
+            id=self.screening_id, session_id=self.session_id, version=self.version,
+            **dict(zip(PERSISTED, self.state._loaded or self.state._values())),
+        )
+        make_transient_to_detached(session)
+        make_transient_to_detached(screening)
+        return session, screening
+
+
+class HotSessionCache:
+    def __init__(
+        self,
+        enabled: bool,
+        max_entries: int,
+        idle_seconds: float,
+        write_mode: str = "through",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"HOT_SESSION_WRITE_MODE must be one of {WRITE_MODES}, got {write_mode!r}")
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.idle_seconds = idle_seconds
+        self.write_mode = write_mode
+        self.clock = clock
+        self._entries: "OrderedDict[str, HotSession]" = OrderedDict()
+        self._evicted: Dict[str, HotSession] = {}  # dirty entries dropped from the LRU, not yet flushed
+        self._task: asyncio.Task | None = None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "flushed": 0, "flushErrors": 0}
+
+    @property
+    def write_behind(self) -> bool:
+        return self.enabled and self.write_mode == "behind"
+
+    def get(self, session_id: str, user_id: str) -> Optional[HotSession]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(session_id)
+        if entry is None and session_id in self._evicted:
+            # not flushed yet, so the database is behind; take it back
+            entry = self._entries[session_id] = self._evicted.pop(session_id)
+            entry.last_used = self.clock()
+        if entry is not None and self.clock() - entry.last_used > self.idle_seconds:
+            self._drop(session_id)
+            self._stats["expired"] += 1
+            entry = None
+        if entry is None or entry.user_id != user_id:
+            self._stats["misses"] += 1
+            return None
+        entry.last_used = self.clock()
+        self._entries.move_to_end(session_id)
+        self._stats["hits"] += 1
+        return entry
+
+    def peek(self, session_id: str) -> Optional[HotSession]:
+        """Entry for ``session_id`` if cached, without touching LRU order or hit counters."""
+        if not self.enabled:
+            return None
+        return self._entries.get(session_id) or self._evicted.get(session_id)
+
+    def deferred(self, session_id: str) -> bool:
+        """True when this session's state write is left to ``flush()``."""
+        return self.write_behind and session_id in self._entries
+
+    def store(self, session: ChatSession, screening: ScreeningSession, state: ScreeningState, pending: bool = False) -> None:
+        """Remember a session after its turn was saved (``pending``: updated_at not written yet)."""
+        if not self.enabled:
+            return
+        prev = self._entries.pop(session.id, None)
+        prev = self._evicted.pop(session.id, None) or prev  # the new entry carries its pending state
+        version = screening.version
+        if pending and prev is not None:
+            # a flush may have written the previous state while this turn ran; the rows the turn
+            # opened with are behind it, the entry it replaces is not
+            version = prev.version
+            state._loaded = prev.state._loaded
+        self._entries[session.id] = HotSession(
+            session_id=session.id,
+            user_id=session.user_id,
+            title=session.title,
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+            screening_id=screening.id,
+            version=version,
+            state=state,
+            touched=pending,
+            last_used=self.clock(),
+        )
+        while len(self._entries) > self.max_entries:
+            sid, _ = next(iter(self._entries.items()))
+            self._drop(sid)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, session_id: str) -> None:
+        # the rows are gone; a pending write has nothing left to update
+        self._entries.pop(session_id, None)
+        self._evicted.pop(session_id, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        for sid in [sid for sid, e in self._entries.items() if e.user_id == user_id]:
+            del self._entries[sid]
+        for sid in [sid for sid, e in self._evicted.items() if e.user_id == user_id]:
+            del self._evicted[sid]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._evicted.clear()
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id)
+        if self.write_behind and entry.dirty:
+            self._evicted[session_id] = entry
+
+    def _sweep(self) -> None:
+        now = self.clock()
+        for sid in [sid for sid, e in self._entries.items() if now - e.last_used > self.idle_seconds]:
+            self._drop(sid)
+            self._stats["expired"] += 1
+
+    def pending(self) -> int:
+        return len(self._evicted) + sum(1 for e in self._entries.values() if e.dirty)
+
+    async def flush(self) -> int:
+        """Write every dirty session in one transaction; returns how many were written."""
+        self._sweep()
+        # evicted entries stay listed until written, so a turn arriving meanwhile takes them back
+        batch: List[HotSession] = list(self._evicted.values())
+        batch += [e for e in self._entries.values() if e.dirty]
+        if not batch:
+            return 0
+        try:
+            await self._write(batch)
+        except StaleDataError:
+            # a row was deleted or written elsewhere; write the rest one by one and drop the
+            # stale ones (the other writer wins; write-behind assumes one worker per session)
+            written = 0
+            for entry in batch:
+                try:
+                    await self._write([entry])
+                    written += 1
+                except StaleDataError:
+                    log.warning("hot session %s changed in the database; dropping its pending state", entry.session_id)
+                    self.invalidate(entry.session_id)
+                except Exception:
+                    log.exception("hot session flush failed for %s", entry.session_id)
+                    self._stats["flushErrors"] += 1
+            self._stats["flushed"] += written
+            return written
+        except Exception:
+            log.exception("hot session flush failed for %d sessions", len(batch))
+            self._stats["flushErrors"] += 1
+            return 0
+        self._stats["flushed"] += len(batch)
+        return len(batch)
+
+    async def _write(self, batch: List[HotSession]) -> None:
+        written = []
+        async with AsyncSessionLocal() as db:
+            for entry in batch:
+                _, screening = entry.rows()
+                db.add(screening)
+                values = entry.state._values()
+                for name in entry.state.changed_fields():
+                    setattr(screening, name, getattr(entry.state, name))
+                if entry.touched:
+                    session = ChatSession(id=entry.session_id)
+                    make_transient_to_detached(session)
+                    db.add(session)
+                    session.updated_at = entry.updated_at
+                written.append((entry, screening, values))
+            await db.commit()
+        # only now is the database at these values
+        for entry, screening, values in written:
+            entry.state._loaded = values
+            entry.version = screening.version
+            entry.touched = False
+            if self._evicted.get(entry.session_id) is entry:
+                del self._evicted[entry.session_id]
+            live = self._entries.get(entry.session_id) or self._evicted.get(entry.session_id)
+            if live is not None and live is not entry:
+                # a turn stored a newer entry during the commit; it builds on what was just written
+                live.state._loaded = values
+                live.version = screening.version
+
+    async def _flush_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    async def start(self, interval: float) -> None:
+        if self.write_behind and self._task is None:
+            self._task = asyncio.create_task(self._flush_loop(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.write_behind:
+            await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self._stats)
+        lookups = out["hits"] + out["misses"]
+        out.update({
+            "enabled": self.enabled,
+            "writeMode": self.write_mode,
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hitRatio": round(out["hits"] / lookups, 4) if lookups else 0.0,
+            "pendingFlushes": self.pending(),
+        })
+        return out
+
+
+_cache: HotSessionCache | None = None
+
+
+def get_session_cache() -> HotSessionCache:
+    global _cache
+    if _cache is None:
+        _cache = HotSessionCache(
+            enabled=settings.HOT_SESSION_CACHE_ENABLED,
+            max_entries=settings.HOT_SESSION_CACHE_MAX_ENTRIES,
+            idle_seconds=settings.HOT_SESSION_CACHE_IDLE_SECONDS,
+            write_mode=settings.HOT_SESSION_WRITE_MODE,
+        )
+    return _cache
+
+
+def reset_session_cache() -> None:
+    """Forget the cache (rebuilt from settings on next use). Pending writes are dropped."""
+    global _cache
+    _cache = None
@@ -0,0 +1,93 @@
+"""Typed per-session screening state.
+
+``ScreeningState`` is what the orchestrator works on during a turn. It is built
+from a ``ScreeningSession`` row once (``from_row``) and written back once
+(``apply_to``). JSON-valued fields (slots, slot states, hypotheses, the rubric
+evaluation snapshot) are plain dicts here and native JSON columns in the
+database (serialized with orjson by the engine), so nothing is re-parsed
+per turn.
+
+``from_row`` remembers what was loaded; ``apply_to`` writes only the fields that
+differ from it, so an unchanged column is never part of the UPDATE.
+"""
+
+from __future__ import annotations
+
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Dict, Optional, Tuple
+
+# fields stored on ScreeningSession under the same attribute name
+PERSISTED = (
+    "phase", "readiness", "track",
+    "presenting_concern", "subject_type", "age_years",
+    "hypotheses", "active_disorder_id",
+    "progress_summaries", "closure_prompted", "closure_ack", "turns",
+    "slots", "slot_states",
+    "last_intent", "last_question_fingerprint",
+    "eval_snapshot",
+)
+_DICT_FIELDS = ("hypotheses", "slots", "slot_states", "eval_snapshot")
+
+
+@dataclass(slots=True)
+class ScreeningState:
+    phase: str = "INTAKE"
+    readiness: str = "WARMING"
+    track: str = "RELATIONAL"
+    presenting_concern: Optional[str] = None
+    subject_type: Optional[str] = None
+    age_years: Optional[int] = None
+    hypotheses: Dict[str, float] = field(default_factory=dict)
+    active_disorder_id: Optional[str] = None
+    progress_summaries: int = 0
+    closure_prompted: bool = False
+    closure_ack: bool = False
+    turns: int = 0
+    slots: Dict[str, Any] = field(default_factory=dict)
+    slot_states: Dict[str, str] = field(default_factory=dict)
+    last_intent: Optional[str] = None
+    last_question_fingerprint: Optional[str] = None
+    eval_snapshot: Dict[str, Any] = field(default_factory=dict)
+    domain: Optional[str] = None  # this turn only; not persisted
+    _loaded: Optional[Tuple[Any, ...]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_row(cls, row) -> "ScreeningState":
+        values = {}
+        for name in PERSISTED:
+            v = getattr(row, name)
+            if v is None and name in _DICT_FIELDS:
+                v = {}
+            values[name] = v
+        # unsaved rows carry None until INSERT applies column defaults
+        for f in fields(cls):
+            if values.get(f.name, 0) is None and f.default is not MISSING:
+                values[f.name] = f.default
+        state = cls(**values)
+        state._loaded = state._values()
+        return state
+
+    def _values(self) -> Tuple[Any, ...]:
+        # dicts are copied so in-place edits still show up as changes
+        return tuple(dict(v) if isinstance(v, dict) else v for v in (getattr(self, n) for n in PERSISTED))
+
+    def changed_fields(self) -> Tuple[str, ...]:
+        current = self._values()
+        if self._loaded is None:
+            return PERSISTED
+        return tuple(n for n, old, new in zip(PERSISTED, self._loaded, current) if old != new)
+
+    def apply_to(self, row) -> Tuple[str, ...]:
+        """Copy changed fields onto ``row``; returns their names."""
+        changed = self.changed_fields()
+        for name in changed:
+            v = getattr(self, name)
+            setattr(row, name, dict(v) if isinstance(v, dict) else v)
+        self._loaded = self._values()
+        return changed
+
+    def copy(self) -> "ScreeningState":
+        out = ScreeningState(**{f.name: getattr(self, f.name) for f in fields(self)})
+        for name in _DICT_FIELDS:
+            setattr(out, name, dict(getattr(self, name)))
+        return out
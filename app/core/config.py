@@ -6,24 +6,70 @@ class Settings(BaseSettings):
     APP_ENV: str = "dev"
     API_VERSION: str = "v6.2.0"
     DATABASE_URL: str = "sqlite:///./app.db"
+    DB_MIGRATE_ON_STARTUP: bool = True  # alembic upgrade head in the lifespan (app/core/migrations.py)
+    STARTUP_PROFILE: bool = False  # log cold-start marks at the first request (app/core/startup.py)
 
     JWT_ISSUER: str = "mh-screening"
     JWT_AUDIENCE: str = "mh-screening-mobile"
     JWT_ACCESS_TTL_SECONDS: int = 3600
     JWT_REFRESH_TTL_DAYS: int = 14
     JWT_SECRET: str = "change_me_super_secret"
+    # verified access tokens -> (user id, disabled), see app/core/principals.py; 0 entries disables it
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # password hashing (see app/core/passwords.py); stored hashes with other rounds are upgraded at login
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2  # processes; 0 = default thread pool
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # calls waiting for a worker before signup/login answer 503
 
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_BASE_URL: str = "https://api.openai.com/v1"
-    OPENAI_TIMEOUT_SECONDS: int = 25
+    OPENAI_TIMEOUT_SECONDS: int = 25  # read timeout per response
+    # shared connection pool (see app/llm/openai_client.py)
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_WRITE_TIMEOUT_SECONDS: float = 10.0
+    OPENAI_POOL_TIMEOUT_SECONDS: float = 5.0  # max wait for a free connection
+    OPENAI_MAX_CONNECTIONS: int = 50
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_HTTP2: bool = False  # needs the optional 'h2' package
+
+    # LLM response cache (see app/llm/cache.py); per stage so composer variety can be kept
+    LLM_CACHE_EXTRACT_ENABLED: bool = True
+    LLM_CACHE_EXTRACT_TTL_SECONDS: float = 86400.0
+    LLM_CACHE_EXTRACT_MAX_ENTRIES: int = 4096
+    LLM_CACHE_COMPOSE_ENABLED: bool = True
+    LLM_CACHE_COMPOSE_TTL_SECONDS: float = 3600.0
+    LLM_CACHE_COMPOSE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_SQLITE_PATH: str = ""  # e.g. ./llm_cache.db; empty = memory only
+
+    # hot-session cache (see app/conversation/session_cache.py); per process, write-behind needs sticky sessions
+    HOT_SESSION_CACHE_ENABLED: bool = True
+    HOT_SESSION_CACHE_MAX_ENTRIES: int = 2048
+    HOT_SESSION_CACHE_IDLE_SECONDS: float = 900.0
+    HOT_SESSION_WRITE_MODE: str = "through"  # through | behind
+    HOT_SESSION_FLUSH_SECONDS: float = 2.0  # write-behind flush interval
+
+    # a turn whose screening row changed underneath it (version mismatch) re-runs on the fresh state
+    TURN_CONFLICT_RETRIES: int = 2
+    TURN_SESSION_LOCK: bool = True  # also serialize turns of one session within this process
+
+    # bulk deletes (see app/services/purge.py)
+    PURGE_BACKGROUND_THRESHOLD: int = 200  # sessions; above this, deletes run as a background task
+    PURGE_CHUNK_SIZE: int = 100  # sessions per DELETE transaction in background purges
+    REFRESH_TOKEN_COMPACT_SECONDS: float = 3600.0  # delete expired/revoked refresh tokens this often; 0 = never
+    REFRESH_TOKEN_COMPACT_CHUNK: int = 500  # rows per DELETE transaction
 
     # Google / Firebase sign-in (recommended: verify Firebase ID token from client)
     GOOGLE_CLIENT_ID: str = ""  # Web/Android client ID used to verify Google ID tokens
     FIREBASE_PROJECT_ID: str = ""  # optional; enables Firebase ID token verification
-    # If set, should be the *contents* of a Firebase service account JSON.
-    # Use a secrets manager in production.
-    FIREBASE_SERVICE_ACCOUNT_JSON: str = ""
+    # ID token signing certificates (see app/services/cert_cache.py), kept for the response's max-age
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+    FIREBASE_CERTS_URL: str = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+    OAUTH_CERTS_DEFAULT_MAX_AGE_SECONDS: float = 3600.0  # when the response has no max-age
+    OAUTH_CERTS_REFETCH_SECONDS: float = 30.0  # min gap between refetches for an unknown key id
+    OAUTH_CERTS_TIMEOUT_SECONDS: float = 5.0
 
     # Cloudinary image uploads
     CLOUDINARY_CLOUD_NAME: str = ""
@@ -34,6 +80,18 @@ class Settings(BaseSettings):
 
     ALLOW_DEV_DEBUG_META: bool = True
 
+    GZIP_MIN_BYTES: int = 1024  # responses at least this large are gzipped when the client accepts it
+
+    # Rubric registry: YAML is parsed once and re-checked for changes at most this often
+    RUBRIC_HOT_RELOAD: bool = True
+    RUBRIC_RELOAD_CHECK_SECONDS: float = 2.0
+    # fill boolean slots from rubric signal phrases; skip the LLM extractor when that is enough
+    SIGNAL_EXTRACTION_ENABLED: bool = True
+    # extractor slot catalog: only disorders whose hypothesis is at least this (plus the active one)
+    EXTRACT_CATALOG_MIN_HYPOTHESIS: float = 0.05
+    # rendered reports kept (latest per session; see app/conversation/reports.py)
+    REPORT_CACHE_MAX_ENTRIES: int = 1024
+
    # 🔑 THIS IS WHAT YOU WERE MISSING
     model_config = SettingsConfigDict(
         env_file=".env",
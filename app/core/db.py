@@ -1,21 +1,66 @@
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from .config import settings
 
 class Base(DeclarativeBase):
     pass
 
+def _json_dumps(value) -> str:
+    return orjson.dumps(value).decode("utf-8")
+
+# JSON columns (screening state) go through orjson on both engines
+_JSON_ARGS = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
     pool_pre_ping=True,
+    **_JSON_ARGS,
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+def _sqlite_foreign_keys(dbapi_conn, _record) -> None:
+    # SQLite ignores ON DELETE CASCADE unless asked per connection; bulk deletes rely on it
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _sqlite_foreign_keys)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+# Async path for routes on the chat hot path, so DB round-trips don't stall the event loop
+# while other requests wait on the LLM. Same database, async driver:
+# sqlite -> aiosqlite, postgres -> psycopg (v3, async capable).
+def async_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    dialect, _, driver = scheme.partition("+")
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect in ("postgresql", "postgres"):
+        if driver in ("asyncpg", "psycopg"):
+            return url
+        return f"postgresql+psycopg://{rest}"
+    return url
+
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), pool_pre_ping=True, **_JSON_ARGS)
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _sqlite_foreign_keys)
+
+# expire_on_commit=False: attribute access after commit would otherwise need lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
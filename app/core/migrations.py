@@ -0,0 +1,79 @@
+"""Schema management through Alembic, at startup or from the command line.
+
+The app used to call ``Base.metadata.create_all`` on every boot, which never
+adds a column and costs a round of reflection queries each time. Startup now
+runs ``upgrade_database()`` (``DB_MIGRATE_ON_STARTUP``), the same as
+``alembic upgrade head``; an up-to-date database costs one query.
+
+A database with tables but no ``alembic_version`` was made by the old
+``create_all`` startup, like the dev ``app.db`` in the repo. When its tables and
+columns are exactly those of ``0001_baseline`` it is stamped at that revision
+and upgraded. Any other unversioned schema is refused with the ``alembic stamp``
+hint rather than guessed at.
+"""
+
+from __future__ import annotations
+
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, FrozenSet
+
+from sqlalchemy import create_engine, inspect
+
+from .config import settings
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).resolve().parents[2]
+
+BASELINE = "0001_baseline"
+
+
+def _alembic_config(url: str):
+    from alembic.config import Config  # only needed when migrating
+
+    cfg = Config(str(_ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(_ROOT / "alembic"))
+    cfg.attributes["url"] = url
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+def _layout(url: str) -> Dict[str, FrozenSet[str]]:
+    """{table: column names} of the database at ``url``."""
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            insp = inspect(conn)
+            return {t: frozenset(c["name"] for c in insp.get_columns(t)) for t in insp.get_table_names()}
+    finally:
+        engine.dispose()
+
+
+def _baseline_layout() -> Dict[str, FrozenSet[str]]:
+    from alembic import command
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'baseline.db'}"
+        command.upgrade(_alembic_config(url), BASELINE)
+        layout = _layout(url)
+    layout.pop("alembic_version", None)
+    return layout
+
+
+def upgrade_database(url: str | None = None) -> None:
+    from alembic import command
+
+    url = url or settings.DATABASE_URL
+    layout = _layout(url)
+    if layout and "alembic_version" not in layout:
+        if layout != _baseline_layout():
+            raise RuntimeError(
+                "database has tables but no alembic_version (made by create_all); "
+                "run 'alembic stamp <revision it matches>' once, see README 'Database migrations'"
+            )
+        log.info("unversioned database matches %s; stamping it", BASELINE)
+        command.stamp(_alembic_config(url), BASELINE)
+    command.upgrade(_alembic_config(url), "head")
+    log.info("database schema at head")
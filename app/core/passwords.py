@@ -0,0 +1,163 @@
+"""Password hashing off the event loop, in a bounded process pool.
+
+A bcrypt hash or verify is 100+ ms of CPU. Done inline it holds the GIL and a
+threadpool slot, so a burst of logins stalls every other request. ``hash_async``
+and ``verify_async`` run the work in a ``ProcessPoolExecutor`` of
+``PASSWORD_HASH_WORKERS`` processes. At most ``PASSWORD_HASH_MAX_QUEUE`` calls
+wait for a free worker; past that, ``PasswordHasherBusy`` is raised and the route
+answers 503 instead of letting the queue grow.
+
+``verify_async`` also reports when a hash was made with other parameters than the
+current ``PASSWORD_BCRYPT_ROUNDS``. The new hash is computed in the same worker
+call, and login stores it.
+
+``PASSWORD_HASH_WORKERS = 0`` runs the work in the default thread pool instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from .config import settings
+
+log = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many hash/verify calls are already waiting for a worker."""
+
+
+@lru_cache(maxsize=4)
+def crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# worker side: module-level so the pool can pickle them; each returns its CPU time too
+
+def _hash(password: str, rounds: int) -> Tuple[str, float]:
+    t0 = time.perf_counter()
+    out = crypt_context(rounds).hash(password)
+    return out, time.perf_counter() - t0
+
+
+def _verify(password: str, password_hash: str, rounds: int) -> Tuple[Tuple[bool, Optional[str]], float]:
+    t0 = time.perf_counter()
+    out = crypt_context(rounds).verify_and_update(password, password_hash)
+    return out, time.perf_counter() - t0
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, rounds: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            "hashes": 0, "verifies": 0, "rehashed": 0, "rejected": 0, "errors": 0,
+            "maxQueueDepth": 0, "queueWaitTotalMs": 0.0, "queueWaitMaxMs": 0.0, "workTotalMs": 0.0,
+        }
+
+    def _executor(self) -> Executor | None:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn: the parent runs threads (event loop, threadpool), which fork does not survive safely
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _admit(self) -> None:
+        with self._lock:
+            capacity = max(self.workers, 1)
+            if self._in_flight >= capacity + self.max_queue:
+                self._stats["rejected"] += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+            self._stats["maxQueueDepth"] = max(self._stats["maxQueueDepth"], self._in_flight - capacity)
+
+    async def _run(self, kind: str, fn, *args) -> Any:
+        self._admit()
+        t0 = time.perf_counter()
+        try:
+            result, work = await asyncio.get_running_loop().run_in_executor(self._executor(), fn, *args)
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        waited = max(0.0, time.perf_counter() - t0 - work) * 1000.0
+        with self._lock:
+            self._stats[kind] += 1
+            self._stats["workTotalMs"] += work * 1000.0
+            self._stats["queueWaitTotalMs"] += waited
+            self._stats["queueWaitMaxMs"] = max(self._stats["queueWaitMaxMs"], waited)
+        return result
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run("hashes", _hash, password, self.rounds)
+
+    async def verify_async(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """(matches, replacement hash when the stored one uses outdated parameters, else None)."""
+        ok, new_hash = await self._run("verifies", _verify, password, password_hash, self.rounds)
+        if new_hash is not None:
+            with self._lock:
+                self._stats["rehashed"] += 1
+        return ok, new_hash
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            in_flight = self._in_flight
+        done = out["hashes"] + out["verifies"]
+        for key in ("queueWaitTotalMs", "queueWaitMaxMs", "workTotalMs"):
+            out[key] = round(out[key], 3)
+        out.update({
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "inFlight": in_flight,
+            "queueDepth": max(0, in_flight - max(self.workers, 1)),
+            "maxQueue": self.max_queue,
+            "queueWaitAvgMs": round(out["queueWaitTotalMs"] / done, 3) if done else 0.0,
+            "workAvgMs": round(out["workTotalMs"] / done, 3) if done else 0.0,
+        })
+        return out
+
+
+_hasher: PasswordHasher | None = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+            rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+        )
+    return _hasher
+
+
+def shutdown_password_hasher() -> None:
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+    _hasher = None
@@ -0,0 +1,104 @@
+"""Verified access tokens -> lightweight principals, cached per process.
+
+Clients send the same access token for every request, a few seconds apart
+during a chat. Each request used to verify the JWT signature and read the
+``users`` row again. ``PrincipalCache`` maps the SHA-256 of a token that has
+already been verified to a ``Principal`` (user id and disabled flag).
+
+An entry lives for ``PRINCIPAL_CACHE_TTL_SECONDS``, and never past the token's
+own ``exp``. Disabling or deleting a user must call ``invalidate_user``. Other
+workers stop serving the old state within one TTL.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from .config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: str
+    is_disabled: bool = False
+
+
+class PrincipalCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._data: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def get(self, token_hash: str) -> Optional[Principal]:
+        with self._lock:
+            item = self._data.get(token_hash)
+            if item is not None and item[0] <= self.clock():
+                self._remove(token_hash)
+                item = None
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(token_hash)
+            self._stats["hits"] += 1
+            return item[1]
+
+    def set(self, token_hash: str, principal: Principal, token_exp: float | None) -> None:
+        expires = self.clock() + self.ttl_seconds
+        if token_exp is not None:
+            expires = min(expires, float(token_exp))
+        if self.max_entries <= 0 or expires <= self.clock():
+            return
+        with self._lock:
+            self._data[token_hash] = (expires, principal)
+            self._data.move_to_end(token_hash)
+            self._by_user.setdefault(principal.id, set()).add(token_hash)
+            while len(self._data) > self.max_entries:
+                self._remove(next(iter(self._data)))
+                self._stats["evictions"] += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for token_hash in self._by_user.pop(user_id, ()):
+                self._data.pop(token_hash, None)
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._by_user.clear()
+
+    def _remove(self, token_hash: str) -> None:
+        _, principal = self._data.pop(token_hash)
+        hashes = self._by_user.get(principal.id)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._by_user[principal.id]
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self._stats)
+        lookups = out["hits"] + out["misses"]
+        out.update({
+            "entries": len(self._data),
+            "hitRate": round(out["hits"] / lookups, 4) if lookups else 0.0,
+            "ttlSeconds": self.ttl_seconds,
+        })
+        return out
+
+
+_cache: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _cache
+    if _cache is None:
+        _cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    return _cache
@@ -2,10 +2,11 @@ import hashlib
 import secrets
 from datetime import datetime, timedelta, timezone
 from jose import jwt
-from passlib.context import CryptContext
 from .config import settings
+from .passwords import crypt_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# request handlers use app.core.passwords (process pool); these block the caller
+pwd_context = crypt_context(settings.PASSWORD_BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
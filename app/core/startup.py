@@ -0,0 +1,105 @@
+"""Cold-start timings.
+
+``app.main`` imports this module first, so ``mark()`` measures from the start of
+the app's own imports. The marks are ``imported`` (app.main finished importing),
+``ready`` (lifespan startup finished) and ``firstRequest`` (first response sent;
+only recorded with ``STARTUP_PROFILE``, which also logs all marks then). They
+are shown under ``/stats``.
+
+Import time per module needs a fresh interpreter, so it comes from the CLI:
+
+    python -m app.core.startup [top_n]
+
+This runs ``python -X importtime -c "import app.main"`` and prints the slowest
+modules and packages. It then starts the app with its lifespan and times the
+first ``GET /health``.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+_T0 = time.perf_counter()
+
+log = logging.getLogger(__name__)
+
+_marks: Dict[str, float] = {}
+
+
+def mark(name: str) -> None:
+    _marks.setdefault(name, (time.perf_counter() - _T0) * 1000.0)
+
+
+def startup_stats() -> Dict[str, float]:
+    return {f"{k}Ms": round(v, 1) for k, v in _marks.items()}
+
+
+class FirstRequestTimer:
+    """ASGI middleware: marks and logs the first completed HTTP response, then steps aside."""
+
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send):
+        if self.done or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if not self.done:
+                self.done = True
+                mark("firstRequest")
+                log.info("startup profile: %s", startup_stats())
+
+
+def import_times(module: str = "app.main") -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module imported by ``import <module>``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(top: int = 25) -> None:
+    rows = import_times()
+    total = next(cum for name, _, cum in reversed(rows) if name == "app.main")
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    print(f"import app.main: {total / 1000:.1f} ms (fresh interpreter)")
+    print("\nslowest packages (self time):")
+    for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    print("\nslowest modules (cumulative):")
+    for name, _, cum in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"  {cum / 1000:8.1f} ms  {name}")
+
+    from fastapi.testclient import TestClient
+
+    from .config import settings
+
+    settings.STARTUP_PROFILE = True
+    from ..main import app
+    from . import startup  # the module app.main imported; this file runs as __main__
+
+    with TestClient(app) as client:
+        client.get("/health")
+    print(f"\nin this process, ms since app.main started importing: {startup.startup_stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25)
@@ -0,0 +1,230 @@
+"""Response cache for the LLM stages (extractor, composer).
+
+Many turns are near-identical ("hi", "yes", "I feel very low lately"), and the
+extractor runs at temperature 0. Each stage gets its own ``StageCache``:
+
+- an in-memory LRU with a TTL
+- an optional SQLite file shared across workers and restarts (``LLM_CACHE_SQLITE_PATH``)
+- hit / miss / eviction counters for ``/stats``
+
+Keys hash the normalized user text together with everything else that shapes
+the prompt (model, intent, question, known-slot list, ...). Values are stored
+as strings so a hit can never hand out a dict another request mutated. Turn a
+stage off with ``LLM_CACHE_<STAGE>_ENABLED=false``, e.g. to keep composer replies varied.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..core.config import settings
+
+log = logging.getLogger(__name__)
+
+_TRAILING = " \t\r\n.!?,;:…"
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation ("Hi!" == "hi")."""
+    return " ".join(text.casefold().replace("’", "'").split()).strip(_TRAILING)
+
+
+def cache_key(**parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def slots_fingerprint(names) -> str:
+    return hashlib.sha1("\n".join(sorted(names)).encode("utf-8")).hexdigest()[:16]
+
+
+class MemoryTier:
+    """LRU with a per-entry expiry time."""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= self.clock():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires: float) -> None:
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteTier:
+    """Optional second tier; survives restarts and is shared by workers on one host."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " stage TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (stage, key))"
+        )
+
+    def get(self, stage: str, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM llm_cache WHERE stage = ? AND key = ?", (stage, key)
+            ).fetchone()
+        if row is None or row[0] <= self.clock():
+            return None
+        return row[0], row[1]
+
+    def set(self, stage: str, key: str, value: str, expires: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (stage, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (stage, key, value, expires),
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (self.clock(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StageCache:
+    def __init__(
+        self,
+        stage: str,
+        enabled: bool,
+        ttl_seconds: float,
+        max_entries: int,
+        disk: SqliteTier | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.stage = stage
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.memory = MemoryTier(max_entries, clock)
+        self.disk = disk
+        self._stats = {"hits": 0, "diskHits": 0, "misses": 0, "stores": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        value = self.memory.get(key)
+        if value is not None:
+            self._stats["hits"] += 1
+            return value
+        if self.disk is not None:
+            try:
+                found = self.disk.get(self.stage, key)
+            except sqlite3.Error as e:
+                log.warning("llm cache disk read failed: %s", e)
+                found = None
+            if found is not None:
+                expires, value = found
+                self.memory.set(key, value, expires)
+                self._stats["diskHits"] += 1
+                return value
+        self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        expires = self.clock() + self.ttl_seconds
+        self.memory.set(key, value, expires)
+        self._stats["stores"] += 1
+        if self.disk is not None:
+            try:
+                self.disk.set(self.stage, key, value, expires)
+            except sqlite3.Error as e:
+                log.warning("llm cache disk write failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self._stats)
+        lookups = out["hits"] + out["diskHits"] + out["misses"]
+        out.update({
+            "enabled": self.enabled,
+            "entries": len(self.memory),
+            "evictions": self.memory.evictions,
+            "hitRate": round((out["hits"] + out["diskHits"]) / lookups, 4) if lookups else 0.0,
+            "ttlSeconds": self.ttl_seconds,
+            "disk": self.disk is not None,
+        })
+        return out
+
+
+_caches: Dict[str, StageCache] = {}
+_disk: SqliteTier | None = None
+_lock = threading.Lock()
+
+
+def _build(stage: str) -> StageCache:
+    global _disk
+    prefix = f"LLM_CACHE_{stage.upper()}_"
+    if settings.LLM_CACHE_SQLITE_PATH and _disk is None:
+        try:
+            _disk = SqliteTier(settings.LLM_CACHE_SQLITE_PATH)
+        except sqlite3.Error as e:
+            log.warning("llm cache: cannot open %s (%s); memory tier only", settings.LLM_CACHE_SQLITE_PATH, e)
+    return StageCache(
+        stage,
+        enabled=getattr(settings, prefix + "ENABLED"),
+        ttl_seconds=getattr(settings, prefix + "TTL_SECONDS"),
+        max_entries=getattr(settings, prefix + "MAX_ENTRIES"),
+        disk=_disk,
+    )
+
+
+def get_cache(stage: str) -> StageCache:
+    cache = _caches.get(stage)
+    if cache is None:
+        with _lock:
+            cache = _caches.get(stage)
+            if cache is None:
+                cache = _caches[stage] = _build(stage)
+    return cache
+
+
+def reset_caches() -> None:
+    """Drop every stage cache (they are rebuilt from settings on next use)."""
+    global _disk
+    with _lock:
+        _caches.clear()
+        if _disk is not None:
+            _disk.close()
+        _disk = None
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {stage: c.stats() for stage, c in sorted(_caches.items())}
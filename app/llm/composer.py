@@ -1,13 +1,17 @@
-from .openai_client import chat_completion
+from typing import AsyncIterator
+
+from .cache import get_cache, cache_key, normalize_text
+from .openai_client import chat_completion, chat_completion_stream
 from .prompts import SYSTEM, COMPOSER_INSTRUCTIONS
+from ..core.config import settings
 
-async def compose(
+def _messages(
     user_text: str,
     intent: str,
     question: str | None,
     progress_hint: str | None,
     extra_explanation: str | None,
-) -> str:
+) -> list[dict]:
     prompt_parts = [
         f"Intent: {intent}",
         f"User said: {user_text}",
@@ -20,10 +24,64 @@ async def compose(
         prompt_parts.append(f"Ask this question (one question max): {question}")
     else:
         prompt_parts.append("Do not ask a question unless needed.")
-    messages = [
+    return [
         {"role":"system","content":SYSTEM},
         {"role":"system","content":COMPOSER_INSTRUCTIONS},
         {"role":"user","content":"\n".join(prompt_parts)},
     ]
+
+def _key(user_text, intent, question, progress_hint, extra_explanation) -> str:
+    return cache_key(
+        text=normalize_text(user_text),
+        intent=intent,
+        question=question,
+        hint=progress_hint,
+        extra=extra_explanation,
+        model=settings.OPENAI_MODEL,
+    )
+
+async def compose(
+    user_text: str,
+    intent: str,
+    question: str | None,
+    progress_hint: str | None,
+    extra_explanation: str | None,
+) -> str:
+    cache = get_cache("compose")
+    key = _key(user_text, intent, question, progress_hint, extra_explanation)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    messages = _messages(user_text, intent, question, progress_hint, extra_explanation)
     text = await chat_completion(messages, temperature=0.4)
-    return text.strip()
+    text = text.strip()
+    if text:
+        cache.set(key, text)
+    return text
+
+async def compose_stream(
+    user_text: str,
+    intent: str,
+    question: str | None,
+    progress_hint: str | None,
+    extra_explanation: str | None,
+) -> AsyncIterator[str]:
+    """Same prompt and cache as ``compose``; yields the reply piece by piece (leading whitespace dropped)."""
+    cache = get_cache("compose")
+    key = _key(user_text, intent, question, progress_hint, extra_explanation)
+    hit = cache.get(key)
+    if hit is not None:
+        yield hit
+        return
+    messages = _messages(user_text, intent, question, progress_hint, extra_explanation)
+    parts: list[str] = []
+    async for piece in chat_completion_stream(messages, temperature=0.4):
+        if not parts:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+        parts.append(piece)
+        yield piece
+    text = "".join(parts).strip()
+    if text:
+        cache.set(key, text)
@@ -1,20 +1,46 @@
 import json
+from .cache import get_cache, cache_key, normalize_text, slots_fingerprint
 from .openai_client import chat_completion
 from .prompts import SYSTEM, EXTRACTOR_INSTRUCTIONS
+from ..core.config import settings
+
+# Everything that never changes goes first, in one message, so providers can reuse the
+# cached prefix; the per-turn part (slot list + message) is a short suffix.
+PREFIX = SYSTEM + "\n" + EXTRACTOR_INSTRUCTIONS + "- Only use slot names from the list given with the message.\n"
+
+def build_messages(user_text: str, known_slot_names: list[str]) -> list[dict]:
+    return [
+        {"role":"system","content":PREFIX},
+        {"role":"user","content":f"Slots: {', '.join(known_slot_names)}\n\nUser message: {user_text}"},
+    ]
+
+def estimate_tokens(messages: list[dict]) -> int:
+    # ~4 characters per token for English plus a few tokens of framing per message;
+    # close enough to compare prompt sizes without a tokenizer dependency
+    return sum(len(m["content"]) // 4 + 4 for m in messages)
 
 async def extract(user_text: str, known_slot_names: list[str]) -> dict:
+    # temperature 0: the same (normalized) message against the same slot list gives the same facts
+    cache = get_cache("extract")
+    key = cache_key(
+        text=normalize_text(user_text),
+        model=settings.OPENAI_MODEL,
+        slots=slots_fingerprint(known_slot_names),
+    )
+    hit = cache.get(key)
+    if hit is not None:
+        return json.loads(hit)
+
     # Provide known slots so the model maps correctly.
-    messages = [
-        {"role":"system","content":SYSTEM},
-        {"role":"system","content":EXTRACTOR_INSTRUCTIONS},
-        {"role":"user","content":f"Known slots: {known_slot_names}\n\nUser message: {user_text}"},
-    ]
+    messages = build_messages(user_text, known_slot_names)
     raw = await chat_completion(
         messages,
         temperature=0.0,
         response_format={"type":"json_object"}
     )
     try:
-        return json.loads(raw)
+        data = json.loads(raw)
     except Exception:
         return {"facts": {"slots": {}}, "answers": {"answered_intent": False, "refusal": False, "confusion": False}}
+    cache.set(key, json.dumps(data))
+    return data
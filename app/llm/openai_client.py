@@ -1,9 +1,151 @@
+"""Application-scoped HTTP client for the OpenAI-compatible backend.
+
+One ``httpx.AsyncClient`` is created at app startup and shared by every LLM call,
+so turns reuse warm keep-alive connections instead of paying TCP/TLS setup twice
+per message. ``pool_stats()`` reports what this module counts from httpx's
+public trace events: requests in flight, connections opened, and how long
+requests waited for a free connection.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import AsyncIterator
+
 import httpx
+
 from ..core.config import settings
 
-async def chat_completion(messages, temperature: float = 0.2, response_format: dict | None = None):
-    url = f"{settings.OPENAI_BASE_URL.rstrip('/')}/chat/completions"
-    headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+log = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+_stats = {
+    "requests": 0,
+    "errors": 0,
+    "inFlight": 0,
+    "maxInFlight": 0,
+    "connectionsOpened": 0,
+    "poolWaits": 0,
+    "poolWaitTotalMs": 0.0,
+    "poolWaitMaxMs": 0.0,
+    "promptTokens": 0,
+    "cachedPromptTokens": 0,  # served from the provider's prompt-prefix cache
+    "completionTokens": 0,
+}
+
+# first trace events once the pool has handed the request a connection
+_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+def _http2_enabled() -> bool:
+    if not settings.OPENAI_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        log.warning("OPENAI_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+        read=settings.OPENAI_TIMEOUT_SECONDS,
+        write=settings.OPENAI_WRITE_TIMEOUT_SECONDS,
+        pool=settings.OPENAI_POOL_TIMEOUT_SECONDS,
+    )
+    return httpx.AsyncClient(
+        base_url=settings.OPENAI_BASE_URL.rstrip("/"),
+        transport=httpx.AsyncHTTPTransport(limits=limits, http2=_http2_enabled()),
+        timeout=timeout,
+    )
+
+
+async def start_client() -> None:
+    """Create the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    # scripts and tests may call the LLM without running the app lifespan
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+def pool_stats() -> dict:
+    out = dict(_stats)
+    out["poolWaitTotalMs"] = round(out["poolWaitTotalMs"], 3)
+    out["poolWaitMaxMs"] = round(out["poolWaitMaxMs"], 3)
+    out["poolWaitAvgMs"] = round(out["poolWaitTotalMs"] / out["poolWaits"], 3) if out["poolWaits"] else 0.0
+    out.update({
+        "open": _client is not None,
+        "maxConnections": settings.OPENAI_MAX_CONNECTIONS,
+    })
+    return out
+
+
+def _pool_wait_tracer():
+    started = time.perf_counter()
+    done = False
+
+    async def trace(event_name: str, info: dict) -> None:
+        nonlocal done
+        if event_name == "connection.connect_tcp.started":
+            _stats["connectionsOpened"] += 1
+        if not done and event_name in _ACQUIRED_EVENTS:
+            done = True
+            waited = (time.perf_counter() - started) * 1000.0
+            _stats["poolWaits"] += 1
+            _stats["poolWaitTotalMs"] += waited
+            _stats["poolWaitMaxMs"] = max(_stats["poolWaitMaxMs"], waited)
+
+    return trace
+
+
+def _enter() -> None:
+    _stats["requests"] += 1
+    _stats["inFlight"] += 1
+    _stats["maxInFlight"] = max(_stats["maxInFlight"], _stats["inFlight"])
+
+
+def _leave() -> None:
+    _stats["inFlight"] -= 1
+
+
+def _count_usage(usage: dict | None) -> None:
+    if not usage:
+        return
+    _stats["promptTokens"] += int(usage.get("prompt_tokens") or 0)
+    _stats["completionTokens"] += int(usage.get("completion_tokens") or 0)
+    details = usage.get("prompt_tokens_details") or {}
+    _stats["cachedPromptTokens"] += int(details.get("cached_tokens") or 0)
+
+
+def _payload(messages, temperature: float, response_format: dict | None = None) -> dict:
     payload = {
         "model": settings.OPENAI_MODEL,
         "messages": messages,
@@ -11,8 +153,57 @@ async def chat_completion(messages, temperature: float = 0.2, response_format: d
     }
     if response_format:
         payload["response_format"] = response_format
-    async with httpx.AsyncClient(timeout=settings.OPENAI_TIMEOUT_SECONDS) as client:
-        r = await client.post(url, headers=headers, json=payload)
+    return payload
+
+
+async def chat_completion(messages, temperature: float = 0.2, response_format: dict | None = None):
+    headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+    payload = _payload(messages, temperature, response_format)
+    _enter()
+    try:
+        r = await get_client().post(
+            "/chat/completions",
+            headers=headers,
+            json=payload,
+            extensions={"trace": _pool_wait_tracer()},
+        )
         r.raise_for_status()
-        data = r.json()
-        return data["choices"][0]["message"]["content"]
+    except httpx.HTTPError:
+        _stats["errors"] += 1
+        raise
+    finally:
+        _leave()
+    data = r.json()
+    _count_usage(data.get("usage"))
+    return data["choices"][0]["message"]["content"]
+
+
+async def chat_completion_stream(messages, temperature: float = 0.2) -> AsyncIterator[str]:
+    """Yield content deltas as the backend streams them (``"stream": true``)."""
+    headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}", "Accept": "text/event-stream"}
+    payload = dict(_payload(messages, temperature), stream=True)
+    _enter()
+    try:
+        async with get_client().stream(
+            "POST",
+            "/chat/completions",
+            headers=headers,
+            json=payload,
+            extensions={"trace": _pool_wait_tracer()},
+        ) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                piece = (choices[0].get("delta") or {}).get("content")
+                if piece:
+                    yield piece
+    except httpx.HTTPError:
+        _stats["errors"] += 1
+        raise
+    finally:
+        _leave()
@@ -1,14 +1,61 @@
+from .core import startup  # first: starts the cold-start clock
+
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
-from .core.db import engine, Base
+from .core.db import async_engine
+from .core.migrations import upgrade_database
+from .core.passwords import shutdown_password_hasher
+from .llm import openai_client
+from .conversation.session_cache import get_session_cache
+from .services import cert_cache, purge
+from .core.config import settings
 from .api.routes.auth import router as auth_router
 from .api.routes.users import router as users_router
 from .api.routes.chat import router as chat_router
 from .api.routes.misc import router as misc_router
 from .api.routes.feedback import router as feedback_router
 
-app = FastAPI(title="Deterministic MH Screening Platform", version="v6.2.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await asyncio.to_thread(upgrade_database)
+    await openai_client.start_client()
+    await get_session_cache().start(settings.HOT_SESSION_FLUSH_SECONDS)
+    await purge.start_token_compaction(settings.REFRESH_TOKEN_COMPACT_SECONDS)
+    # ID token certificates load in the background; startup does not wait on Google
+    warm_up = asyncio.create_task(cert_cache.warm_up())
+    startup.mark("ready")
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        await cert_cache.close_client()
+        await purge.stop_token_compaction()
+        await get_session_cache().stop()
+        shutdown_password_hasher()
+        await openai_client.close_client()
+        await async_engine.dispose()
+
+app = FastAPI(title="Deterministic MH Screening Platform", version="v6.2.0", lifespan=lifespan)
+
+
+class _GZip(GZipMiddleware):
+    """gzip larger responses (transcripts, session lists) but never an SSE stream,
+    which the compressor would hold back instead of flushing token by token."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_GZip, minimum_size=settings.GZIP_MIN_BYTES)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,13 +66,13 @@ app.add_middleware(
 )
 
 
-
-@app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
-
 app.include_router(misc_router)
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(chat_router)
 app.include_router(feedback_router)
+
+if settings.STARTUP_PROFILE:
+    app.add_middleware(startup.FirstRequestTimer)
+
+startup.mark("imported")
@@ -1,12 +1,16 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, ForeignKey, Text, Integer, UniqueConstraint, Index
+from sqlalchemy import JSON, String, DateTime, Boolean, ForeignKey, Text, Integer, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .core.db import Base
 
 def _uuid() -> str:
     return str(uuid.uuid4())
 
+# native JSON (JSONB on Postgres); values are encoded with orjson by the engine (core/db.py)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class User(Base):
     __tablename__ = "users"
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
@@ -23,8 +27,9 @@ class User(Base):
     is_disabled: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
-    refresh_tokens: Mapped[list["RefreshToken"]] = relationship(back_populates="user", cascade="all, delete-orphan")
-    sessions: Mapped[list["ChatSession"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes: the database cascades (ondelete="CASCADE"); the ORM never loads children to delete them
+    refresh_tokens: Mapped[list["RefreshToken"]] = relationship(back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    sessions: Mapped[list["ChatSession"]] = relationship(back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
@@ -46,8 +51,8 @@ class ChatSession(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     user: Mapped["User"] = relationship(back_populates="sessions")
-    messages: Mapped[list["ChatMessage"]] = relationship(back_populates="session", cascade="all, delete-orphan")
-    screening: Mapped["ScreeningSession"] = relationship(back_populates="session", cascade="all, delete-orphan", uselist=False)
+    messages: Mapped[list["ChatMessage"]] = relationship(back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+    screening: Mapped["ScreeningSession"] = relationship(back_populates="session", cascade="all, delete-orphan", uselist=False, passive_deletes=True)
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
@@ -71,22 +76,28 @@ class ScreeningSession(Base):
     presenting_concern: Mapped[str | None] = mapped_column(Text, nullable=True)
     subject_type: Mapped[str | None] = mapped_column(String(20), nullable=True)  # self/other/unknown
     age_years: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    # hypothesis json
-    hypotheses_json: Mapped[str] = mapped_column(Text, default="{}")
+    # hypotheses (disorder id -> probability)
+    hypotheses: Mapped[dict] = mapped_column("hypotheses_json", JSONType, default=dict)
     active_disorder_id: Mapped[str | None] = mapped_column(String(80), nullable=True)
     # progress markers
     progress_summaries: Mapped[int] = mapped_column(Integer, default=0)
     closure_prompted: Mapped[bool] = mapped_column(Boolean, default=False)
     closure_ack: Mapped[bool] = mapped_column(Boolean, default=False)
     turns: Mapped[int] = mapped_column(Integer, default=0)
-    # slots state json
-    slots_json: Mapped[str] = mapped_column(Text, default="{}")
-    slot_state_json: Mapped[str] = mapped_column(Text, default="{}")  # slot->UNASKED/ASKED/PARTIAL/RESOLVED
+    # slot values and slot states
+    slots: Mapped[dict] = mapped_column("slots_json", JSONType, default=dict)
+    slot_states: Mapped[dict] = mapped_column("slot_state_json", JSONType, default=dict)  # slot->UNASKED/ASKED/PARTIAL/RESOLVED
     last_intent: Mapped[str | None] = mapped_column(String(80), nullable=True)
     last_question_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # rubric evaluation snapshot (per-criterion statuses) for incremental re-evaluation
+    eval_snapshot: Mapped[dict] = mapped_column("eval_snapshot_json", JSONType, default=dict)
+    # optimistic concurrency: UPDATEs match on the version they read and bump it
+    version: Mapped[int] = mapped_column(Integer, default=1)
 
     session: Mapped["ChatSession"] = relationship(back_populates="screening")
 
+    __mapper_args__ = {"version_id_col": version}
+
 class Feedback(Base):
     __tablename__ = "feedback"
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
@@ -97,3 +108,12 @@ class Feedback(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 Index("ix_chat_messages_session_created", ChatMessage.session_id, ChatMessage.created_at)
+# session list: one user's sessions, newest first, keyset-paged on (updated_at, id)
+Index("ix_chat_sessions_user_updated", ChatSession.user_id, ChatSession.updated_at, ChatSession.id)
+# refresh-token compaction: revoked rows are found without scanning the live ones
+# (expired rows use the expires_at index; the active-token lookup is the unique token_jti)
+Index(
+    "ix_refresh_tokens_revoked", RefreshToken.created_at,
+    sqlite_where=RefreshToken.revoked == True,  # noqa: E712
+    postgresql_where=RefreshToken.revoked == True,  # noqa: E712
+)
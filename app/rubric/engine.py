@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Tuple
-from .eval import safe_eval
+from .eval import compile_rule
 import math
 
 STATUS_MET="MET"
@@ -36,14 +36,14 @@ def evaluate_disorder(spec: Dict[str, Any], slots: Dict[str, Any]) -> Dict[str,
         total_required += len(required)
         total_have += sum(1 for s in required if slots.get(s) is not None)
 
-        names = {k: slots.get(k) for k in set(required + list(slots.keys()))}
         status = STATUS_UNKNOWN
         rationale = "Missing required information."
         missing = [s for s in required if slots.get(s) is None]
 
         if not missing:
             try:
-                ok = safe_eval(c["rule"], names)
+                # compiled rules read names with .get(), so the slot dict is the namespace
+                ok = compile_rule(c["rule"])(slots)
             except Exception as e:
                 ok = False
             status = STATUS_MET if ok else STATUS_NOT_MET
@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List
 import ast
+import operator
 
 def count_true(items: List[Any]) -> int:
     return sum(1 for x in items if x is True)
@@ -8,6 +10,7 @@ def count_true(items: List[Any]) -> int:
 ALLOWED_FUNCS = {"count_true": count_true}
 
 class SafeEval(ast.NodeVisitor):
+    """Reference tree-walking evaluator. ``compile_rule`` must stay result-identical to it."""
     def __init__(self, names: Dict[str, Any]):
         self.names = names
 
@@ -59,6 +62,97 @@ class SafeEval(ast.NodeVisitor):
             return ALLOWED_FUNCS[fn](*args)
         raise ValueError(f"Unsupported expression: {type(node).__name__}")
 
-def safe_eval(expr: str, names: Dict[str, Any]) -> bool:
+# --- rule compiler -----------------------------------------------------------
+# Each allow-listed node becomes a closure over its already-compiled children, so a
+# rule is parsed and checked once and evaluation is plain function calls. Semantics
+# mirror SafeEval exactly: and/or/list/call operands are all evaluated (no
+# short-circuit), chained comparisons stop comparing once one fails, unknown names
+# read as None. Anything SafeEval would reject is rejected at compile time.
+
+Evaluator = Callable[[Dict[str, Any]], Any]
+
+_COMPARATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+}
+
+class CompiledRule:
+    __slots__ = ("expr", "names", "_fn")
+
+    def __init__(self, expr: str, names: FrozenSet[str], fn: Evaluator):
+        self.expr = expr
+        self.names = names  # every slot name the rule reads
+        self._fn = fn
+
+    def __call__(self, names: Dict[str, Any]) -> bool:
+        return bool(self._fn(names))
+
+    def __repr__(self) -> str:
+        return f"CompiledRule({self.expr!r})"
+
+def _compile_node(node: ast.AST, refs: set) -> Evaluator:
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body, refs)
+    if isinstance(node, ast.BoolOp) and isinstance(node.op, (ast.And, ast.Or)):
+        parts = tuple(_compile_node(v, refs) for v in node.values)
+        agg = all if isinstance(node.op, ast.And) else any
+        return lambda n: agg([p(n) for p in parts])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _compile_node(node.operand, refs)
+        return lambda n: not operand(n)
+    if isinstance(node, ast.Compare):
+        first = _compile_node(node.left, refs)
+        steps = []
+        for op, comp in zip(node.ops, node.comparators):
+            right = _compile_node(comp, refs)
+            fn = _COMPARATORS.get(type(op))
+            if fn is None:
+                raise ValueError("Unsupported comparator")
+            steps.append((fn, right))
+        if len(steps) == 1:
+            (fn, right), = steps
+            return lambda n: fn(first(n), right(n))
+        steps_t = tuple(steps)
+        def compare(n):
+            left = first(n)
+            ok = True
+            for fn, right in steps_t:
+                r = right(n)
+                ok = ok and fn(left, r)
+                left = r
+            return ok
+        return compare
+    if isinstance(node, ast.Name):
+        key = node.id
+        refs.add(key)
+        return lambda n: n.get(key, None)
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda n: value
+    if isinstance(node, ast.List):
+        elts = tuple(_compile_node(e, refs) for e in node.elts)
+        return lambda n: [e(n) for e in elts]
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name):
+            raise ValueError("Unsupported call")
+        if node.func.id not in ALLOWED_FUNCS:
+            raise ValueError("Function not allowed")
+        func = ALLOWED_FUNCS[node.func.id]
+        args = tuple(_compile_node(a, refs) for a in node.args)
+        return lambda n: func(*[a(n) for a in args])
+    raise ValueError(f"Unsupported expression: {type(node).__name__}")
+
+@lru_cache(maxsize=4096)
+def compile_rule(expr: str) -> CompiledRule:
+    """Parse and compile a rubric rule once; raises ValueError/SyntaxError for disallowed input."""
     tree = ast.parse(expr, mode="eval")
-    return bool(SafeEval(names).visit(tree))
+    refs: set = set()
+    fn = _compile_node(tree, refs)
+    return CompiledRule(expr, frozenset(refs), fn)
+
+def safe_eval(expr: str, names: Dict[str, Any]) -> bool:
+    return compile_rule(expr)(names)
@@ -3,12 +3,18 @@ from typing import Dict, Any
 
 DISORDERS_DIR = os.path.join(os.path.dirname(__file__), "..", "disorders")
 
-def load_disorders() -> Dict[str, Any]:
+def read_disorders(directory: str = DISORDERS_DIR) -> Dict[str, Any]:
+    """Parse every rubric file in ``directory`` (no caching)."""
     out: Dict[str, Any] = {}
-    for fn in os.listdir(DISORDERS_DIR):
+    for fn in sorted(os.listdir(directory)):
         if fn.endswith(".yaml") or fn.endswith(".yml"):
-            path = os.path.join(DISORDERS_DIR, fn)
+            path = os.path.join(directory, fn)
             with open(path, "r", encoding="utf-8") as f:
                 data = yaml.safe_load(f)
             out[data["id"]] = data
     return out
+
+def load_disorders() -> Dict[str, Any]:
+    """Current disorder specs from the process-wide registry (parsed once, hot-reloaded)."""
+    from .registry import get_registry
+    return get_registry().snapshot().disorders
@@ -0,0 +1,276 @@
+"""Evaluate every loaded rubric against a session's slots in one pass.
+
+``evaluate_disorder`` walks one disorder's criteria with dict lookups. For
+differential screening we want all disorders at once. This module lays the
+registry out as arrays:
+
+- ``req``: criterion x slot matrix of required-slot counts (a slot listed twice
+  counts twice, like the per-disorder loop)
+- a row -> disorder index plus core / exclusion flags
+- one compiled rule per row
+
+A slot-presence vector then gives each row's have-count with one
+matrix-vector product. Per-disorder coverage, core_met/core_known, exclusions
+and outcome are reductions over rows. Only rows with every required slot
+present run their rule. The arithmetic is float64 in the same order as
+``engine.evaluate_disorder``, so results are bit-identical.
+
+``evaluate_incremental`` reuses a per-session snapshot of row statuses. A
+slot -> rows dependency index covers both required slots and every name a rule
+reads. With it, a turn re-runs only the rules whose inputs changed and then
+redoes the cheap aggregates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .engine import (
+    STATUS_MET, STATUS_NOT_MET, STATUS_UNKNOWN,
+    OUTCOME_INSUFFICIENT, OUTCOME_POSSIBLE, OUTCOME_PROBABLE, OUTCOME_EXCLUDED,
+)
+from .eval import CompiledRule
+
+if TYPE_CHECKING:
+    from .registry import CompiledRubric
+
+UNKNOWN, NOT_MET, MET = 0, 1, 2
+STATUS_NAMES = (STATUS_UNKNOWN, STATUS_NOT_MET, STATUS_MET)
+OUTCOME_NAMES = (OUTCOME_EXCLUDED, OUTCOME_INSUFFICIENT, OUTCOME_PROBABLE, OUTCOME_POSSIBLE, OUTCOME_INSUFFICIENT)
+
+
+@dataclass
+class MatrixResult:
+    """Arrays for one evaluation; ``summary``/``evaluation`` turn a row back into engine-shaped dicts."""
+    matrix: "RubricMatrix"
+    slots: Dict[str, Any]
+    present: np.ndarray
+    status: np.ndarray  # per criterion row
+    coverage: np.ndarray  # per disorder
+    core_met: np.ndarray
+    core_known: np.ndarray
+    excluded: np.ndarray
+    outcome: np.ndarray  # index into OUTCOME_NAMES
+    confidence: np.ndarray
+    rules_evaluated: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact, JSON-friendly state for ``evaluate_incremental`` on the next turn."""
+        return {
+            "v": self.matrix.version,
+            "d": slots_digest(self.slots),
+            "s": (self.status + 48).astype(np.uint8).tobytes().decode("ascii"),
+        }
+
+    def summary(self, did: str) -> Dict[str, Any]:
+        i = self.matrix.disorder_index[did]
+        return {
+            "outcome": OUTCOME_NAMES[self.outcome[i]],
+            "confidence": float(self.confidence[i]),
+            "coverage": float(self.coverage[i]),
+            "core_met": int(self.core_met[i]),
+            "core_known": int(self.core_known[i]),
+        }
+
+    def missing_slots(self, did: str) -> List[str]:
+        idx = self.matrix.slot_index
+        return [s for s in self.matrix.required_slots[did] if not self.present[idx[s]]]
+
+    def criteria_table(self, did: str) -> Dict[str, Dict[str, Any]]:
+        m = self.matrix
+        out: Dict[str, Dict[str, Any]] = {}
+        lo, hi = m.row_span[did]
+        for r in range(lo, hi):
+            c = m.row_specs[r]
+            required = c.get("slots_required", [])
+            out[c["id"]] = {
+                "label": c.get("label", ""),
+                "status": STATUS_NAMES[self.status[r]],
+                "evidence": {s: self.slots.get(s) for s in required},
+                "missing": [s for s in required if self.slots.get(s) is None],
+            }
+        return out
+
+    def evaluation(self, did: str) -> Dict[str, Any]:
+        """Same dict ``engine.evaluate_disorder`` returns for this disorder."""
+        out = self.summary(did)
+        out["criteria_table"] = self.criteria_table(did)
+        return out
+
+    def differential(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            did: {"outcome": OUTCOME_NAMES[self.outcome[i]], "coverage": round(float(self.coverage[i]), 3)}
+            for i, did in enumerate(self.matrix.disorder_ids)
+        }
+
+
+def slots_digest(slots: Dict[str, Any]) -> str:
+    # json keeps True and 1 apart, which matters to count_true
+    raw = json.dumps(slots, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _changed(prev: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    out = []
+    for k in set(prev) | set(new):
+        a, b = prev.get(k), new.get(k)
+        if type(a) is not type(b) or a != b:
+            out.append(k)
+    return out
+
+
+class RubricMatrix:
+    def __init__(self, rubrics: Dict[str, "CompiledRubric"], version: str = ""):
+        self.version = version
+        self.disorder_ids: Tuple[str, ...] = tuple(rubrics)
+        self.disorder_index = {did: i for i, did in enumerate(self.disorder_ids)}
+        self.required_slots = {did: r.required_slots for did, r in rubrics.items()}
+
+        slot_names: List[str] = []
+        self.slot_index: Dict[str, int] = {}
+        rows_disorder: List[int] = []
+        rows_core: List[bool] = []
+        rows_excludes: List[bool] = []
+        row_specs: List[Dict[str, Any]] = []
+        row_rules: List[CompiledRule] = []
+        req_cells: List[Tuple[int, int]] = []
+        self.row_span: Dict[str, Tuple[int, int]] = {}
+
+        min_core, min_cov = [], []
+        for d, (did, rubric) in enumerate(rubrics.items()):
+            lo = len(row_specs)
+            for is_core, group in ((True, rubric.core), (False, rubric.exclusions)):
+                for c in group:
+                    r = len(row_specs)
+                    for s in c.get("slots_required", []):
+                        if s not in self.slot_index:
+                            self.slot_index[s] = len(slot_names)
+                            slot_names.append(s)
+                        req_cells.append((r, self.slot_index[s]))
+                    rows_disorder.append(d)
+                    rows_core.append(is_core)
+                    rows_excludes.append(not is_core and c.get("effect") == OUTCOME_EXCLUDED)
+                    row_specs.append(c)
+                    row_rules.append(rubric.rules[c["id"]])
+            self.row_span[did] = (lo, len(row_specs))
+            thr = rubric.spec.get("thresholds", {}) or {}
+            min_core.append(int(thr.get("probable_min_core_met", max(1, len(rubric.core) // 2))))
+            min_cov.append(float(thr.get("probable_min_coverage", 0.7)))
+
+        self.slot_names = tuple(slot_names)
+        self.row_specs = tuple(row_specs)
+        self.row_rules = tuple(row_rules)
+        n_rows, n_slots = len(row_specs), len(slot_names)
+        self.req = np.zeros((n_rows, n_slots), dtype=np.int32)
+        for r, s in req_cells:
+            self.req[r, s] += 1
+        self.req_len = self.req.sum(axis=1)
+        self.row_disorder = np.asarray(rows_disorder, dtype=np.intp)
+        self.row_core = np.asarray(rows_core, dtype=bool)
+        self.row_excludes = np.asarray(rows_excludes, dtype=bool)
+        n = len(self.disorder_ids)
+        self.total_required = np.bincount(self.row_disorder, weights=self.req_len, minlength=n)
+        self.min_core = np.asarray(min_core, dtype=np.int64)
+        self.min_cov = np.asarray(min_cov, dtype=np.float64)
+
+        # dependency index: slot -> rows whose completeness or rule reads it
+        deps: Dict[str, set] = {}
+        for r, s in req_cells:
+            deps.setdefault(slot_names[s], set()).add(r)
+        for r, rule in enumerate(row_rules):
+            for name in rule.names:
+                deps.setdefault(name, set()).add(r)
+        self.slot_rows = {k: np.asarray(sorted(v), dtype=np.intp) for k, v in deps.items()}
+
+    def rows_for(self, slot_names: Iterable[str]) -> np.ndarray:
+        parts = [self.slot_rows[s] for s in slot_names if s in self.slot_rows]
+        if not parts:
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate(parts))
+
+    def presence(self, slots: Dict[str, Any]) -> np.ndarray:
+        present = np.zeros(len(self.slot_names), dtype=np.int32)
+        idx = self.slot_index
+        for k, v in slots.items():
+            if v is not None and k in idx:
+                present[idx[k]] = 1
+        return present
+
+    def evaluate_all(self, slots: Dict[str, Any]) -> MatrixResult:
+        present = self.presence(slots)
+        have = self.req @ present
+        complete = have == self.req_len
+        status = np.zeros(len(self.row_specs), dtype=np.int8)
+        rows = np.flatnonzero(complete)
+        self._run_rules(rows, slots, status)
+        return self._aggregate(slots, present, have, status, len(rows))
+
+    def evaluate_incremental(
+        self,
+        slots: Dict[str, Any],
+        prev_slots: Dict[str, Any],
+        snapshot: Optional[Dict[str, Any]],
+    ) -> MatrixResult:
+        """Like ``evaluate_all`` but only re-checks rows that read a slot changed since ``prev_slots``.
+
+        ``snapshot`` must come from ``MatrixResult.snapshot()`` for ``prev_slots``. A snapshot
+        from another registry version or other slots is ignored and a full pass runs.
+        """
+        encoded = (snapshot or {}).get("s")
+        if (
+            not encoded
+            or snapshot.get("v") != self.version
+            or len(encoded) != len(self.row_specs)
+            or snapshot.get("d") != slots_digest(prev_slots)
+        ):
+            return self.evaluate_all(slots)
+        present = self.presence(slots)
+        have = self.req @ present
+        status = (np.frombuffer(encoded.encode("ascii"), dtype=np.uint8) - 48).astype(np.int8)
+        rows = self.rows_for(_changed(prev_slots, slots))
+        if len(rows):
+            complete = have[rows] == self.req_len[rows]
+            status[rows[~complete]] = UNKNOWN
+            rows = rows[complete]
+            self._run_rules(rows, slots, status)
+        return self._aggregate(slots, present, have, status, len(rows))
+
+    def _run_rules(self, rows: np.ndarray, slots: Dict[str, Any], status: np.ndarray) -> None:
+        for r in rows:
+            try:
+                ok = self.row_rules[r](slots)
+            except Exception:
+                ok = False
+            status[r] = MET if ok else NOT_MET
+
+    def _aggregate(self, slots, present, have, status, rules_evaluated) -> MatrixResult:
+        n = len(self.disorder_ids)
+        d = self.row_disorder
+        total_have = np.bincount(d, weights=have, minlength=n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = np.where(self.total_required > 0, total_have / self.total_required, 0.0)
+        core_known = np.bincount(d, weights=self.row_core & (status != UNKNOWN), minlength=n).astype(np.int64)
+        core_met = np.bincount(d, weights=self.row_core & (status == MET), minlength=n).astype(np.int64)
+        excluded = np.bincount(d, weights=self.row_excludes & (status == MET), minlength=n) > 0
+
+        insufficient = (core_known == 0) | (coverage < 0.34)
+        probable = (core_met >= self.min_core) & (coverage >= self.min_cov)
+        possible = (core_met >= 1) & (coverage >= 0.5)
+        # same precedence as evaluate_disorder: excluded, insufficient, probable, possible, else insufficient
+        outcome = np.where(excluded, 0, np.where(insufficient, 1, np.where(probable, 2, np.where(possible, 3, 4))))
+        confidence = np.where(excluded, 0.05, np.where(
+            insufficient, 0.1 + 0.2 * coverage, np.where(
+                probable, np.minimum(0.95, 0.35 + 0.6 * coverage), np.where(
+                    possible, np.minimum(0.8, 0.25 + 0.5 * coverage),
+                    np.minimum(0.6, 0.15 + 0.4 * coverage)))))
+        return MatrixResult(
+            matrix=self, slots=slots, present=present, status=status,
+            coverage=coverage, core_met=core_met, core_known=core_known,
+            excluded=excluded, outcome=outcome, confidence=confidence,
+            rules_evaluated=int(rules_evaluated),
+        )
@@ -0,0 +1,300 @@
+"""Process-wide registry of disorder rubrics.
+
+The YAML rubrics are parsed and validated once, and slot-level data that every
+turn needs is derived up front:
+
+- the known-slot set handed to the extractor
+- slot -> criteria maps per disorder
+- gating (age) ranges
+- compiled criterion rules (see ``eval.compile_rule``)
+- the criterion matrix used to evaluate every disorder at once (``matrix.py``)
+- the signal-phrase matcher that fills boolean slots without the LLM (``signals.py``)
+
+The registry watches the rubric directory. When a file's mtime changes, its
+content hash is compared with the previous load. A changed hash builds a
+complete new snapshot, and the registry swaps to it in one step. Readers
+always see a consistent snapshot and are never blocked by a reload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+from ..core.config import settings
+from .eval import CompiledRule, compile_rule
+from .loader import DISORDERS_DIR
+from .matrix import RubricMatrix
+from .signals import SignalMatcher
+
+# facts the extractor may return regardless of which disorders are loaded
+BASE_SLOTS = ("age_years", "presenting_concern", "subject_type", "domain")
+
+
+class RubricError(ValueError):
+    """Raised when a rubric file is malformed."""
+
+
+@dataclass(frozen=True)
+class CompiledRubric:
+    id: str
+    name: str
+    spec: Dict[str, Any]
+    core: Tuple[Dict[str, Any], ...]
+    exclusions: Tuple[Dict[str, Any], ...]
+    slot_types: Dict[str, str]  # slots + exclusion_slots
+    required_slots: Tuple[str, ...]  # unique, in criteria order (matches missing_slots)
+    slot_to_criteria: Dict[str, Tuple[str, ...]]
+    rules: Dict[str, CompiledRule]  # criterion id -> compiled rule
+    age_min: Optional[int]
+    age_max: Optional[int]
+
+    def age_allowed(self, age_years: int | None) -> bool:
+        if age_years is None:
+            return True
+        if self.age_min is not None and age_years < self.age_min:
+            return False
+        if self.age_max is not None and age_years > self.age_max:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    version: str
+    generation: int
+    loaded_at: float
+    load_ms: float
+    disorders: Dict[str, Dict[str, Any]]  # raw specs, same shape load_disorders() always returned
+    rubrics: Dict[str, CompiledRubric]
+    known_slots: FrozenSet[str]
+    known_slots_sorted: Tuple[str, ...]
+    files: Dict[str, Tuple[float, str]]  # filename -> (mtime, sha256)
+    matrix: RubricMatrix  # all criteria laid out for one-pass evaluation
+    signals: SignalMatcher  # boolean slot phrases from every rubric, one regex
+
+
+def _validate(spec: Any, fn: str) -> None:
+    if not isinstance(spec, dict):
+        raise RubricError(f"{fn}: rubric must be a mapping")
+    for key in ("id", "name"):
+        if not isinstance(spec.get(key), str) or not spec[key].strip():
+            raise RubricError(f"{fn}: missing '{key}'")
+    criteria = spec.get("criteria")
+    if not isinstance(criteria, dict):
+        raise RubricError(f"{fn}: missing 'criteria'")
+    seen = set()
+    for group in ("core", "exclusions"):
+        items = criteria.get(group) or []
+        if not isinstance(items, list):
+            raise RubricError(f"{fn}: criteria.{group} must be a list")
+        for c in items:
+            if not isinstance(c, dict) or not isinstance(c.get("id"), str):
+                raise RubricError(f"{fn}: criterion in {group} has no id")
+            if c["id"] in seen:
+                raise RubricError(f"{fn}: duplicate criterion id {c['id']}")
+            seen.add(c["id"])
+            if not isinstance(c.get("rule"), str):
+                raise RubricError(f"{fn}: criterion {c['id']} has no rule")
+            req = c.get("slots_required", [])
+            if not isinstance(req, list) or not all(isinstance(s, str) for s in req):
+                raise RubricError(f"{fn}: criterion {c['id']} slots_required must be a list of names")
+            try:
+                compile_rule(c["rule"])
+            except (ValueError, SyntaxError) as e:
+                raise RubricError(f"{fn}: criterion {c['id']} rule rejected: {e}")
+    gating = spec.get("gating") or {}
+    for key in ("age_min", "age_max"):
+        if gating.get(key) is not None:
+            try:
+                int(gating[key])
+            except (TypeError, ValueError):
+                raise RubricError(f"{fn}: gating.{key} must be an integer")
+
+
+def compile_rubric(spec: Dict[str, Any]) -> CompiledRubric:
+    criteria = spec.get("criteria", {})
+    core = tuple(criteria.get("core", []) or [])
+    exclusions = tuple(criteria.get("exclusions", []) or [])
+
+    slot_types: Dict[str, str] = {}
+    for section in ("slots", "exclusion_slots"):
+        for name, slot_spec in (spec.get(section) or {}).items():
+            slot_types[name] = (slot_spec or {}).get("type", "string")
+
+    required: List[str] = []
+    slot_to_criteria: Dict[str, List[str]] = {}
+    for c in core + exclusions:
+        for s in c.get("slots_required", []):
+            if s not in required:
+                required.append(s)
+            crit = slot_to_criteria.setdefault(s, [])
+            if c["id"] not in crit:
+                crit.append(c["id"])
+
+    gating = spec.get("gating") or {}
+    age_min = gating.get("age_min")
+    age_max = gating.get("age_max")
+    return CompiledRubric(
+        id=spec["id"],
+        name=spec["name"],
+        spec=spec,
+        core=core,
+        exclusions=exclusions,
+        slot_types=slot_types,
+        required_slots=tuple(required),
+        slot_to_criteria={k: tuple(v) for k, v in slot_to_criteria.items()},
+        rules={c["id"]: compile_rule(c["rule"]) for c in core + exclusions},
+        age_min=int(age_min) if age_min is not None else None,
+        age_max=int(age_max) if age_max is not None else None,
+    )
+
+
+def _rubric_files(directory: str) -> List[str]:
+    return sorted(fn for fn in os.listdir(directory) if fn.endswith(".yaml") or fn.endswith(".yml"))
+
+
+class RubricRegistry:
+    def __init__(self, directory: str = DISORDERS_DIR, check_interval: float | None = None, hot_reload: bool | None = None):
+        self.directory = directory
+        self.check_interval = settings.RUBRIC_RELOAD_CHECK_SECONDS if check_interval is None else check_interval
+        self.hot_reload = settings.RUBRIC_HOT_RELOAD if hot_reload is None else hot_reload
+        self._lock = threading.Lock()
+        self._current: RegistrySnapshot | None = None
+        self._last_check = 0.0
+        self._reloads = 0
+        self._last_error: str | None = None
+
+    def snapshot(self) -> RegistrySnapshot:
+        snap = self._current
+        if snap is None:
+            return self.reload()
+        if self.hot_reload and time.monotonic() - self._last_check >= self.check_interval:
+            self._maybe_reload()
+        return self._current  # type: ignore[return-value]
+
+    def reload(self, force: bool = False) -> RegistrySnapshot:
+        """Rebuild the snapshot if any rubric content changed (always when ``force``)."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            current = self._current
+            try:
+                raw = self._read_files()
+            except OSError as e:
+                if current is None:
+                    raise
+                self._last_error = str(e)
+                return current
+            if current is not None and not force and self._fingerprint(raw) == current.version:
+                # mtime moved but the content did not; remember the new mtimes
+                self._current = _with_files(current, raw)
+                return self._current
+            try:
+                snap = self._build(raw, generation=(current.generation + 1) if current else 1)
+            except (RubricError, yaml.YAMLError) as e:
+                # keep serving the last good version; a first load has nothing to fall back to
+                if current is None:
+                    raise
+                self._last_error = str(e)
+                return current
+            self._current = snap
+            self._reloads += 1
+            self._last_error = None
+            return snap
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._current
+        return {
+            "version": snap.version if snap else None,
+            "generation": snap.generation if snap else 0,
+            "disorders": len(snap.rubrics) if snap else 0,
+            "knownSlots": len(snap.known_slots) if snap else 0,
+            "signalPhrases": len(snap.signals.phrase_slots) if snap else 0,
+            "loadMs": round(snap.load_ms, 3) if snap else None,
+            "loadedAt": snap.loaded_at if snap else None,
+            "reloads": self._reloads,
+            "lastError": self._last_error,
+        }
+
+    def _maybe_reload(self) -> None:
+        snap = self._current
+        self._last_check = time.monotonic()
+        try:
+            names = _rubric_files(self.directory)
+            mtimes = {fn: os.path.getmtime(os.path.join(self.directory, fn)) for fn in names}
+        except OSError as e:
+            self._last_error = str(e)
+            return
+        if snap is not None and mtimes == {fn: m for fn, (m, _) in snap.files.items()}:
+            return
+        self.reload()
+
+    def _read_files(self) -> Dict[str, Tuple[float, bytes]]:
+        out: Dict[str, Tuple[float, bytes]] = {}
+        for fn in _rubric_files(self.directory):
+            path = os.path.join(self.directory, fn)
+            mtime = os.path.getmtime(path)
+            with open(path, "rb") as f:
+                out[fn] = (mtime, f.read())
+        return out
+
+    @staticmethod
+    def _fingerprint(raw: Dict[str, Tuple[float, bytes]]) -> str:
+        h = hashlib.sha256()
+        for fn in sorted(raw):
+            h.update(fn.encode("utf-8"))
+            h.update(hashlib.sha256(raw[fn][1]).digest())
+        return h.hexdigest()[:16]
+
+    def _build(self, raw: Dict[str, Tuple[float, bytes]], generation: int) -> RegistrySnapshot:
+        t0 = time.perf_counter()
+        disorders: Dict[str, Dict[str, Any]] = {}
+        rubrics: Dict[str, CompiledRubric] = {}
+        known = set(BASE_SLOTS)
+        for fn in sorted(raw):
+            spec = yaml.safe_load(raw[fn][1].decode("utf-8"))
+            _validate(spec, fn)
+            if spec["id"] in disorders:
+                raise RubricError(f"{fn}: duplicate disorder id {spec['id']}")
+            rubric = compile_rubric(spec)
+            disorders[spec["id"]] = spec
+            rubrics[spec["id"]] = rubric
+            known.update(rubric.slot_types.keys())
+        version = self._fingerprint(raw)
+        return RegistrySnapshot(
+            version=version,
+            generation=generation,
+            loaded_at=time.time(),
+            load_ms=(time.perf_counter() - t0) * 1000.0,
+            disorders=disorders,
+            rubrics=rubrics,
+            known_slots=frozenset(known),
+            known_slots_sorted=tuple(sorted(known)),
+            files={fn: (mtime, hashlib.sha256(data).hexdigest()) for fn, (mtime, data) in raw.items()},
+            matrix=RubricMatrix(rubrics, version),
+            signals=SignalMatcher(rubrics),
+        )
+
+
+def _with_files(snap: RegistrySnapshot, raw: Dict[str, Tuple[float, bytes]]) -> RegistrySnapshot:
+    files = {fn: (mtime, hashlib.sha256(data).hexdigest()) for fn, (mtime, data) in raw.items()}
+    return RegistrySnapshot(**{**snap.__dict__, "files": files})
+
+
+_registry: RubricRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> RubricRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RubricRegistry()
+    return _registry
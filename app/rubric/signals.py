@@ -0,0 +1,90 @@
+"""Deterministic slot extraction from the rubric ``signals`` phrases.
+
+Every boolean slot in the YAML lists the phrases that suggest it, e.g.
+``fatigue: ["tired", "no energy", "fatigue"]``. ``SignalMatcher`` folds the
+phrases of every loaded rubric into one compiled regex (longest phrase first,
+word-bounded). A single scan of the message then yields every mentioned
+slot. A match is dropped when a negation word ("not", "never", "don't", ...)
+comes shortly before it in the same clause, so "I'm not tired" fills nothing.
+
+Only slots that are boolean in every rubric declaring them, and that are
+listed under ``slots`` rather than ``exclusion_slots``, are filled. Numbers,
+free text and rule-outs stay with the LLM extractor.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Dict, FrozenSet, Tuple
+
+if TYPE_CHECKING:
+    from .registry import CompiledRubric
+
+_NEGATORS = frozenset({
+    "no", "not", "never", "nor", "without", "hardly", "barely",
+    "dont", "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "weren't",
+    "haven't", "hasn't", "hadn't", "won't", "wouldn't", "can't", "cannot", "couldn't",
+})
+_NEGATION_WINDOW = 3  # words before the phrase
+_CLAUSE_BREAK = re.compile(r"[.;:!?\n]|,|\bbut\b|\bthough\b|\balthough\b")
+_WORD = re.compile(r"[a-z']+")
+
+
+def _normalize(text: str) -> str:
+    return text.lower().replace("’", "'").replace("‘", "'")
+
+
+class SignalMatcher:
+    def __init__(self, rubrics: Dict[str, "CompiledRubric"]):
+        types: Dict[str, set] = {}
+        exclusion: set = set()
+        phrases: Dict[str, set] = {}
+        for rubric in rubrics.values():
+            for section in ("slots", "exclusion_slots"):
+                for name, slot_spec in (rubric.spec.get(section) or {}).items():
+                    slot_spec = slot_spec or {}
+                    types.setdefault(name, set()).add(slot_spec.get("type", "string"))
+                    if section == "exclusion_slots":
+                        exclusion.add(name)
+                        continue
+                    for p in slot_spec.get("signals") or []:
+                        p = " ".join(_normalize(str(p)).split())
+                        if p:
+                            phrases.setdefault(p, set()).add(name)
+
+        self.boolean_slots: FrozenSet[str] = frozenset(
+            s for s, t in types.items() if t == {"boolean"} and s not in exclusion
+        )
+        self.phrase_slots: Dict[str, Tuple[str, ...]] = {}
+        for p, names in phrases.items():
+            usable = tuple(sorted(n for n in names if n in self.boolean_slots))
+            if usable:
+                self.phrase_slots[p] = usable
+
+        self.pattern = None
+        if self.phrase_slots:
+            # longest first so "sleeping too much" wins over a shorter overlapping phrase
+            ordered = sorted(self.phrase_slots, key=lambda p: (-len(p), p))
+            alt = "|".join(re.escape(p).replace(r"\ ", r"\s+") for p in ordered)
+            self.pattern = re.compile(rf"(?<![a-z0-9])(?:{alt})(?![a-z0-9])")
+
+    def _negated(self, text: str, start: int) -> bool:
+        before = text[max(0, start - 60):start]
+        breaks = list(_CLAUSE_BREAK.finditer(before))
+        if breaks:
+            before = before[breaks[-1].end():]
+        words = _WORD.findall(before)[-_NEGATION_WINDOW:]
+        return any(w in _NEGATORS or w.endswith("n't") for w in words)
+
+    def match(self, text: str) -> Dict[str, bool]:
+        """Boolean slots mentioned (and not negated) in ``text``."""
+        if self.pattern is None or not text:
+            return {}
+        norm = _normalize(text)
+        out: Dict[str, bool] = {}
+        for m in self.pattern.finditer(norm):
+            if self._negated(norm, m.start()):
+                continue
+            for slot in self.phrase_slots[" ".join(m.group(0).split())]:
+                out[slot] = True
+        return out
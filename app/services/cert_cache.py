@@ -0,0 +1,152 @@
+"""Signing certificates for Google and Firebase ID tokens, cached per process.
+
+Verifying an ID token needs Google's current signing certificates. ``CertCache``
+keeps each provider's ``{kid: PEM certificate}`` map for as long as the
+response's ``Cache-Control: max-age`` allows. It fetches through one pooled
+``httpx.AsyncClient``, so a sign-in never waits on a blocking download.
+
+Requests that find the certificates stale wait for a single fetch. A token
+signed with an unknown ``kid`` (Google rotated its keys) forces one early
+refetch, at most every ``OAUTH_CERTS_REFETCH_SECONDS``. ``warm_up()``
+fetches the certificates of every configured provider in the background at
+startup, so the first sign-in does not pay for it either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from ..core.config import settings
+
+log = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+# pooled connections and locks belong to one event loop (scripts and tests may run several)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _http() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(timeout=settings.OAUTH_CERTS_TIMEOUT_SECONDS)
+    return client
+
+
+async def close_client() -> None:
+    """Close this event loop's client (called from the app lifespan)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def max_age(cache_control: str | None) -> float | None:
+    m = _MAX_AGE.search(cache_control or "")
+    return float(m.group(1)) if m else None
+
+
+class CertCache:
+    def __init__(self, url: str, clock: Callable[[], float] = time.monotonic):
+        self.url = url
+        self.clock = clock
+        self._certs: Dict[str, str] = {}
+        self._expires = 0.0
+        self._fetched = float("-inf")
+        self._stats = {"hits": 0, "fetches": 0, "fetchErrors": 0, "rotations": 0}
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    @property
+    def fresh(self) -> bool:
+        return bool(self._certs) and self.clock() < self._expires
+
+    async def refresh(self) -> Dict[str, str]:
+        self._fetched = self.clock()
+        try:
+            r = await _http().get(self.url)
+            r.raise_for_status()
+            certs = r.json()
+        except (httpx.HTTPError, ValueError):
+            self._stats["fetchErrors"] += 1
+            raise
+        ttl = max_age(r.headers.get("cache-control"))
+        self._certs = dict(certs)
+        self._expires = self.clock() + (ttl if ttl is not None else settings.OAUTH_CERTS_DEFAULT_MAX_AGE_SECONDS)
+        self._stats["fetches"] += 1
+        return self._certs
+
+    async def ensure_fresh(self) -> None:
+        if self.fresh:
+            self._stats["hits"] += 1
+            return
+        async with self._lock():
+            if not self.fresh:  # else another request refreshed while this one waited
+                await self.refresh()
+
+    async def get(self, kid: str | None) -> Optional[str]:
+        """PEM certificate for ``kid``, fetching the set when it is stale or lacks the key."""
+        await self.ensure_fresh()
+        cert = self._certs.get(kid or "")
+        if cert is None:
+            async with self._lock():
+                cert = self._certs.get(kid or "")
+                if cert is None and self.clock() - self._fetched >= settings.OAUTH_CERTS_REFETCH_SECONDS:
+                    self._stats["rotations"] += 1
+                    await self.refresh()
+                    cert = self._certs.get(kid or "")
+        return cert
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self._stats)
+        out.update({
+            "keys": len(self._certs),
+            "fresh": self.fresh,
+            "expiresInSeconds": round(max(0.0, self._expires - self.clock()), 1) if self._certs else 0.0,
+        })
+        return out
+
+
+_caches: Dict[str, CertCache] = {}
+
+
+def cert_cache(url: str) -> CertCache:
+    cache = _caches.get(url)
+    if cache is None:
+        cache = _caches[url] = CertCache(url)
+    return cache
+
+
+def configured_urls() -> List[str]:
+    urls = []
+    if settings.GOOGLE_CLIENT_ID:
+        urls.append(settings.GOOGLE_CERTS_URL)
+    if settings.FIREBASE_PROJECT_ID:
+        urls.append(settings.FIREBASE_CERTS_URL)
+    return urls
+
+
+async def warm_up() -> None:
+    """Fetch the certificates of every configured provider; failures only log (sign-in retries)."""
+    for url in configured_urls():
+        try:
+            await cert_cache(url).ensure_fresh()
+        except Exception:
+            log.warning("could not prefetch ID token certificates from %s", url, exc_info=True)
+
+
+def cert_stats() -> Dict[str, Any]:
+    return {url: cache.stats() for url, cache in _caches.items()}
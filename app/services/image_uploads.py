@@ -15,11 +15,10 @@ import base64
 import uuid
 from typing import Optional
 
-import cloudinary
-import cloudinary.uploader
-
 from ..core.config import settings
 
+# cloudinary is imported on first upload, not with the app (see _init_cloudinary)
+
 
 def _cloudinary_enabled() -> bool:
     return all([
@@ -29,23 +28,28 @@ def _cloudinary_enabled() -> bool:
     ])
 
 
-def _init_cloudinary() -> None:
+def _init_cloudinary():
+    """Configure and return ``cloudinary.uploader``."""
     if not _cloudinary_enabled():
         raise RuntimeError(
             "Cloudinary is not configured. Set CLOUDINARY_CLOUD_NAME, "
             "CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET."
         )
+    import cloudinary
+    import cloudinary.uploader
+
     cloudinary.config(
         cloud_name=settings.CLOUDINARY_CLOUD_NAME,
         api_key=settings.CLOUDINARY_API_KEY,
         api_secret=settings.CLOUDINARY_API_SECRET,
         secure=True,
     )
+    return cloudinary.uploader
 
 
 def upload_profile_image_base64(b64: str) -> str:
     """Upload a base64 image string to Cloudinary and return the secure URL."""
-    _init_cloudinary()
+    uploader = _init_cloudinary()
 
     # Accept raw base64 or data-url
     if b64.strip().lower().startswith("data:") and "," in b64:
@@ -55,7 +59,7 @@ def upload_profile_image_base64(b64: str) -> str:
     data_url = f"data:image/png;base64,{b64}"
 
     public_id = f"{settings.CLOUDINARY_FOLDER}/avatars/{uuid.uuid4()}"
-    res = cloudinary.uploader.upload(
+    res = uploader.upload(
         data_url,
         public_id=public_id,
         overwrite=True,
@@ -66,9 +70,9 @@ def upload_profile_image_base64(b64: str) -> str:
 
 def upload_profile_image_file(file_bytes: bytes, filename: Optional[str] = None) -> str:
     """Upload multipart image bytes to Cloudinary and return the secure URL."""
-    _init_cloudinary()
+    uploader = _init_cloudinary()
     public_id = f"{settings.CLOUDINARY_FOLDER}/avatars/{uuid.uuid4()}"
-    res = cloudinary.uploader.upload(
+    res = uploader.upload(
         file_bytes,
         public_id=public_id,
         overwrite=True,
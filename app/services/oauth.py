@@ -12,18 +12,24 @@ Two supported flows:
 Why issue our own JWT?
 - Keeps backend stateless and independent of the frontend auth provider.
 - Enables uniform authorization, refresh tokens, and per-user data ownership.
+
+Both kinds of ID token are RS256 JWTs signed with Google-published certificates.
+They are checked here with python-jose against the certificates cached by
+services/cert_cache.py.
 """
 
 from __future__ import annotations
 
-import json
+import time
 from dataclasses import dataclass
 from typing import Optional
 
-from google.auth.transport import requests as grequests
-from google.oauth2 import id_token
+from jose import jwt
 
 from ..core.config import settings
+from .cert_cache import cert_cache
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
 
 
 @dataclass
@@ -35,12 +41,30 @@ class ExternalIdentity:
     picture: Optional[str] = None
 
 
-def verify_google_id_token(token: str) -> ExternalIdentity:
+async def _verify(token: str, certs_url: str, audience: str, issuer) -> dict:
+    kid = jwt.get_unverified_header(token).get("kid")
+    cert = await cert_cache(certs_url).get(kid)
+    if cert is None:
+        raise ValueError(f"unknown signing key {kid!r}")
+    claims = jwt.decode(
+        token, cert, algorithms=["RS256"], audience=audience, issuer=issuer,
+        options={"verify_at_hash": False},
+    )
+    # the subject and auth_time rules firebase-admin applied on top of the signature
+    sub = claims.get("sub")
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+        raise ValueError("token subject must be a non-empty string of at most 128 characters")
+    auth_time = claims.get("auth_time")
+    if auth_time is not None and (not isinstance(auth_time, (int, float)) or auth_time > time.time()):
+        raise ValueError("token auth_time is in the future")
+    return claims
+
+
+async def verify_google_id_token(token: str) -> ExternalIdentity:
     if not settings.GOOGLE_CLIENT_ID:
         raise RuntimeError("GOOGLE_CLIENT_ID is not configured")
 
-    req = grequests.Request()
-    payload = id_token.verify_oauth2_token(token, req, audience=settings.GOOGLE_CLIENT_ID)
+    payload = await _verify(token, settings.GOOGLE_CERTS_URL, settings.GOOGLE_CLIENT_ID, GOOGLE_ISSUERS)
 
     sub = payload.get("sub")
     email = payload.get("email")
@@ -55,25 +79,17 @@ def verify_google_id_token(token: str) -> ExternalIdentity:
     )
 
 
-def verify_firebase_id_token(token: str) -> ExternalIdentity:
-    """Verify Firebase ID token via firebase-admin if configured.
+async def verify_firebase_id_token(token: str) -> ExternalIdentity:
+    """Verify a Firebase ID token (audience = project id, issuer = securetoken.google.com/<project>).
 
-    This requires FIREBASE_PROJECT_ID and FIREBASE_SERVICE_ACCOUNT_JSON.
+    Only FIREBASE_PROJECT_ID is needed; verification does not use the service account.
     """
-    if not settings.FIREBASE_PROJECT_ID or not settings.FIREBASE_SERVICE_ACCOUNT_JSON:
+    if not settings.FIREBASE_PROJECT_ID:
         raise RuntimeError("Firebase verification is not configured")
 
-    import firebase_admin
-    from firebase_admin import auth, credentials
-
-    # init once
-    if not firebase_admin._apps:
-        cred_dict = json.loads(settings.FIREBASE_SERVICE_ACCOUNT_JSON)
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred, {"projectId": settings.FIREBASE_PROJECT_ID})
-
-    decoded = auth.verify_id_token(token)
-    sub = decoded.get("uid")
+    project = settings.FIREBASE_PROJECT_ID
+    decoded = await _verify(token, settings.FIREBASE_CERTS_URL, project, f"https://securetoken.google.com/{project}")
+    sub = decoded.get("sub")
     email = (decoded.get("email") or "").lower()
     if not sub or not email:
         raise ValueError("Invalid Firebase token payload")
@@ -0,0 +1,167 @@
+"""Set-based deletion of chat history and whole accounts.
+
+Rows are removed with plain DELETE statements. The ``ondelete="CASCADE"``
+foreign keys take messages, screening rows, refresh tokens and feedback with
+them, so nothing is loaded into the ORM. SQLite only enforces them with
+``PRAGMA foreign_keys=ON``, which core/db.py sets on every connection.
+
+Small purges run inside the request. Above ``PURGE_BACKGROUND_THRESHOLD``
+sessions the routes answer immediately and the work runs as a background task,
+in chunks of ``PURGE_CHUNK_SIZE`` sessions with one short transaction each, so
+a long history never holds locks for long. Chunked purges only take sessions
+created before they started, so a user who keeps chatting loses nothing new.
+
+Every login and refresh adds a ``refresh_tokens`` row. ``compact_refresh_tokens``
+deletes the expired and revoked ones in chunks. The app lifespan runs it every
+``REFRESH_TOKEN_COMPACT_SECONDS``. Neither kind can be used again, so deleting
+them changes no response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Sequence
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.db import AsyncSessionLocal
+from ..conversation.reports import get_report_cache
+from ..core.principals import get_principal_cache
+from ..models import ChatSession, RefreshToken, User
+
+log = logging.getLogger(__name__)
+
+_stats = {"sessions": 0, "accounts": 0, "background": 0, "errors": 0, "refreshTokens": 0, "compactions": 0}
+_compactor: asyncio.Task | None = None
+
+
+def purge_stats() -> Dict[str, int]:
+    return dict(_stats)
+
+
+def should_defer(session_count: int) -> bool:
+    return session_count > settings.PURGE_BACKGROUND_THRESHOLD
+
+
+async def count_sessions(db: AsyncSession, user_id: str) -> int:
+    return (await db.execute(select(func.count()).select_from(ChatSession).where(ChatSession.user_id == user_id))).scalar_one()
+
+
+async def delete_sessions(db: AsyncSession, user_id: str, session_ids: Sequence[str] | None = None) -> int:
+    """One DELETE for the user's sessions (all, or ``session_ids``); the caller commits."""
+    q = delete(ChatSession).where(ChatSession.user_id == user_id)
+    if session_ids is not None:
+        q = q.where(ChatSession.id.in_(session_ids))
+    n = (await db.execute(q)).rowcount or 0
+    _stats["sessions"] += n
+    return n
+
+
+async def delete_user(db: AsyncSession, user_id: str) -> None:
+    """Delete the account row; every owned row goes by cascade.
+
+    The caller commits, then drops the user's cached principals.
+    """
+    await db.execute(delete(User).where(User.id == user_id))
+    _stats["accounts"] += 1
+
+
+async def retire_user(db: AsyncSession, user_id: str) -> None:
+    """Make an account unusable at once while its data is purged in the background.
+
+    Sign-in is refused (disabled, refresh tokens gone) and the email is released
+    for a new sign-up. The caller commits, then drops the user's cached principals.
+    """
+    await db.execute(update(User).where(User.id == user_id).values(is_disabled=True, email=f"deleted+{user_id}@invalid"))
+    await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+
+
+async def purge_sessions_chunked(user_id: str, before: datetime | None = None, chunk_size: int | None = None) -> int:
+    chunk_size = chunk_size or settings.PURGE_CHUNK_SIZE
+    before = before or datetime.utcnow()
+    total = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            ids = (await db.execute(
+                select(ChatSession.id)
+                .where(ChatSession.user_id == user_id, ChatSession.created_at <= before)
+                .limit(chunk_size)
+            )).scalars().all()
+            if not ids:
+                get_report_cache().discard_user(user_id)
+                return total
+            total += await delete_sessions(db, user_id, ids)
+            await db.commit()
+
+
+async def purge_user(user_id: str) -> None:
+    await purge_sessions_chunked(user_id)
+    async with AsyncSessionLocal() as db:
+        await delete_user(db, user_id)
+        await db.commit()
+    get_principal_cache().invalidate_user(user_id)
+
+
+async def run_in_background(job: Callable[..., Awaitable[object]], *args) -> None:
+    """BackgroundTasks entry point: a failed purge is logged, never raised into the server."""
+    _stats["background"] += 1
+    try:
+        await job(*args)
+    except Exception:
+        _stats["errors"] += 1
+        log.exception("background purge %s%r failed", job.__name__, args)
+
+
+async def compact_refresh_tokens(chunk_size: int | None = None, now: datetime | None = None) -> int:
+    """Delete expired, then revoked, refresh tokens, ``chunk_size`` rows per transaction."""
+    chunk_size = chunk_size or settings.REFRESH_TOKEN_COMPACT_CHUNK
+    now = now or datetime.utcnow()
+    total = 0
+    async with AsyncSessionLocal() as db:
+        # two passes rather than one OR, so each uses its own index
+        for dead in (RefreshToken.expires_at <= now, RefreshToken.revoked == True):  # noqa: E712
+            while True:
+                ids = (await db.execute(select(RefreshToken.id).where(dead).limit(chunk_size))).scalars().all()
+                if not ids:
+                    break
+                total += (await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))).rowcount or 0
+                await db.commit()
+    _stats["refreshTokens"] += total
+    _stats["compactions"] += 1
+    return total
+
+
+def refresh_token_count(db) -> int:
+    """Current size of the refresh token table (sync session, for /stats)."""
+    return db.execute(select(func.count()).select_from(RefreshToken)).scalar_one()
+
+
+async def _compact_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await compact_refresh_tokens()
+        except Exception:
+            _stats["errors"] += 1
+            log.exception("refresh token compaction failed")
+
+
+async def start_token_compaction(interval: float) -> None:
+    global _compactor
+    if interval > 0 and _compactor is None:
+        _compactor = asyncio.create_task(_compact_loop(interval))
+
+
+async def stop_token_compaction() -> None:
+    global _compactor
+    if _compactor is not None:
+        _compactor.cancel()
+        try:
+            await _compactor
+        except asyncio.CancelledError:
+            pass
+        _compactor = None
@@ -0,0 +1,71 @@
+"""Labelled chat turns for the act classifier (equivalence tests and ``bench_acts``).
+
+Each entry is ``(message, expected_act)``. The labels are what
+``classify_act_reference`` returns, including its known quirks (e.g. a greeting
+that mentions a symptom is still a GREETING), so the corpus pins precedence.
+"""
+
+CORPUS = [
+    # crisis outranks everything
+    ("I want to end my life", "CRISIS"),
+    ("hi, I keep thinking about suicide", "CRISIS"),
+    ("sometimes I self harm when I'm angry", "CRISIS"),
+    ("I'm scared I might hurt someone", "CRISIS"),
+    ("what is self-harm exactly?", "CRISIS"),
+    ("I feel like I want to kill myself", "CRISIS"),
+    # greetings (anchored at the start)
+    ("hi", "GREETING"),
+    ("Hello there", "GREETING"),
+    ("hey, I feel low", "GREETING"),
+    ("  salam", "GREETING"),
+    ("yo what is this app", "GREETING"),
+    ("assalam o alaikum, I don't understand", "GREETING"),
+    ("oh hi", "SMALL_TALK"),
+    ("this is high priority for me and I need help", "OFF_TOPIC"),
+    # confusion
+    ("I don't understand", "CONFUSION"),
+    ("sorry, i dont understand the question", "CONFUSION"),
+    ("I'm confused about what you mean", "OFF_TOPIC"),  # r"confus\b" needs the word to end there
+    ("what? I feel sad", "SYMPTOM_DISCLOSURE"),  # "\b" after "?" needs a word char next
+    ("huh?", "SMALL_TALK"),
+    # resistance
+    ("why do you ask that", "RESISTANCE"),
+    ("please stop asking me that", "RESISTANCE"),
+    ("that's none of your business", "RESISTANCE"),
+    ("don't ask me about my family", "RESISTANCE"),
+    # faq, only for short messages
+    ("what is depression", "QUESTION_FAQ"),
+    ("can you explain pmdd", "QUESTION_FAQ"),
+    ("why are you asking about sleep", "QUESTION_FAQ"),
+    ("what is the meaning of anhedonia", "QUESTION_FAQ"),
+    ("ok but what is the difference between being sad and being depressed", "OFF_TOPIC"),
+    ("could you please explain to me in simple words what this whole screening thing is about", "OFF_TOPIC"),
+    ("what is wrong with me, I feel tired all the time and nothing helps anymore", "SYMPTOM_DISCLOSURE"),
+    ("what is this", "QUESTION_FAQ"),
+    # symptom disclosure
+    ("I've been feeling low for weeks", "SYMPTOM_DISCLOSURE"),
+    ("always tired", "SYMPTOM_DISCLOSURE"),
+    ("I feel sad and I have no energy", "SYMPTOM_DISCLOSURE"),
+    ("my son gets angry over nothing", "SYMPTOM_DISCLOSURE"),
+    ("everything irritates me lately", "SMALL_TALK"),  # r"irritat\b" only matches a bare stem
+    ("I feel hopeless about the future", "SYMPTOM_DISCLOSURE"),
+    ("feeling stressed at work and at home", "SYMPTOM_DISCLOSURE"),
+    ("no, but I'm tired", "SYMPTOM_DISCLOSURE"),
+    # direct answers
+    ("22", "DIRECT_ANSWER"),
+    ("  14 ", "DIRECT_ANSWER"),
+    ("yes", "DIRECT_ANSWER"),
+    ("no", "DIRECT_ANSWER"),
+    ("yes, most days for about a month now honestly", "DIRECT_ANSWER"),
+    ("no not really, it's been okay otherwise I guess", "DIRECT_ANSWER"),
+    # small talk (<= 4 words) and off-topic
+    ("ok", "SMALL_TALK"),
+    ("thanks a lot", "SMALL_TALK"),
+    ("about three weeks", "SMALL_TALK"),
+    ("sure why not", "SMALL_TALK"),
+    ("", "SMALL_TALK"),
+    ("my exam results came out last week and they were fine", "OFF_TOPIC"),
+    ("I have been sleeping a lot more than usual these days", "OFF_TOPIC"),
+    ("she has trouble focusing at school since the move", "OFF_TOPIC"),
+    ("it started after my father passed away last year", "OFF_TOPIC"),
+]
@@ -0,0 +1,39 @@
+"""Act classification: pattern-by-pattern loop vs one combined lookahead regex.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_acts
+"""
+
+import time
+
+from app.conversation.acts import classify_act, classify_act_reference
+
+from .act_corpus import CORPUS
+
+
+def _time(fn, texts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    return (time.perf_counter() - t0) / (repeat * len(texts))
+
+
+def main(repeat: int = 2000) -> None:
+    texts = [t for t, _ in CORPUS]
+    for text, label in CORPUS:
+        ref, new = classify_act_reference(text), classify_act(text)
+        assert ref.act == label, (text, ref.act, label)
+        assert (new.act, new.signals) == (ref.act, ref.signals), text
+
+    before = _time(classify_act_reference, texts, repeat)
+    after = _time(classify_act, texts, repeat)
+    print(f"messages: {len(texts)}  classifications per variant: {len(texts) * repeat}")
+    print(f"pattern loop   : {before * 1e6:8.2f} us/message  ({1 / before:10.0f} msg/s)")
+    print(f"combined regex : {after * 1e6:8.2f} us/message  ({1 / after:10.0f} msg/s)")
+    print(f"speedup        : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
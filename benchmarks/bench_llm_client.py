@@ -0,0 +1,70 @@
+"""LLM round-trip cost: a new AsyncClient per call (old behaviour) vs the shared pool.
+
+Runs against the local fake server, so the difference is connection setup only.
+
+    python -m benchmarks.bench_llm_client
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.llm import openai_client
+from benchmarks.fake_openai import FakeOpenAI
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def _per_call_client(n: int, concurrency: int) -> float:
+    url = f"{settings.OPENAI_BASE_URL}/chat/completions"
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            async with httpx.AsyncClient(timeout=settings.OPENAI_TIMEOUT_SECONDS) as client:
+                r = await client.post(
+                    url,
+                    headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+                    json={"model": settings.OPENAI_MODEL, "messages": MESSAGES},
+                )
+                r.raise_for_status()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return time.perf_counter() - t0
+
+
+async def _pooled(n: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await openai_client.chat_completion(MESSAGES)
+
+    await openai_client.start_client()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    elapsed = time.perf_counter() - t0
+    return elapsed
+
+
+async def main(n: int = 400, concurrency: int = 16) -> None:
+    with FakeOpenAI() as server:
+        settings.OPENAI_BASE_URL = server.base_url
+        settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "sk-fake"
+        before = await _per_call_client(n, concurrency)
+        sockets_before = len(server.clients)
+        server.clients.clear()
+        after = await _pooled(n, concurrency)
+        stats = openai_client.pool_stats()
+        await openai_client.close_client()
+        print(f"{n} calls, concurrency {concurrency}")
+        print(f"client per call : {before / n * 1e3:6.2f} ms/call  ({sockets_before} TCP connections)")
+        print(f"shared pool     : {after / n * 1e3:6.2f} ms/call  ({len(server.clients)} TCP connections)")
+        print(f"pool wait avg/max: {stats['poolWaitAvgMs']} / {stats['poolWaitMaxMs']} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""All-disorder evaluation: per-disorder engine loop vs the criterion matrix.
+
+The registry is replicated to simulate larger rubric sets.
+
+    python -m benchmarks.bench_matrix
+"""
+
+import time
+
+from app.rubric.engine import evaluate_disorder
+from app.rubric.matrix import RubricMatrix
+from app.rubric.registry import RubricRegistry, compile_rubric
+
+
+def _replicate(snap, copies):
+    rubrics = {}
+    for k in range(copies):
+        for did, r in snap.rubrics.items():
+            spec = dict(r.spec, id=f"{did}_{k}")
+            rubrics[spec["id"]] = compile_rubric(spec)
+    return rubrics
+
+
+def main(repeat: int = 300) -> None:
+    snap = RubricRegistry(hot_reload=False).snapshot()
+    slots = {s: True for s in sorted(snap.known_slots)[:20]}
+    for copies in (1, 10, 50):
+        rubrics = _replicate(snap, copies)
+        matrix = RubricMatrix(rubrics)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for r in rubrics.values():
+                evaluate_disorder(r.spec, slots)
+        loop = (time.perf_counter() - t0) / repeat
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            matrix.evaluate_all(slots)
+        vec = (time.perf_counter() - t0) / repeat
+        print(f"{len(rubrics):4d} rubrics: loop {loop * 1e6:9.1f} us   matrix {vec * 1e6:8.1f} us   ({loop / vec:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
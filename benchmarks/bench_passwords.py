@@ -0,0 +1,57 @@
+"""Password verification throughput, and what a login burst does to the event loop.
+
+Inline: ``verify_password`` in the default thread pool (how the sync login route ran).
+Pool: ``PasswordHasher.verify_async`` with 1..N worker processes. For each, prints
+logins/s, logins/s per worker, and the worst delay seen by a 10 ms ticker on the loop.
+
+    python -m benchmarks.bench_passwords [rounds]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from app.core.passwords import PasswordHasher, crypt_context
+
+
+async def _ticker(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - t0 - 0.01)
+
+
+async def _burst(verify, n: int) -> tuple[float, float]:
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(verify() for _ in range(n)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await ticker
+    return elapsed, max(lags, default=0.0)
+
+
+async def main(rounds: int = 12, n: int = 32) -> None:
+    stored = crypt_context(rounds).hash("P@ssw0rd!")
+    loop = asyncio.get_running_loop()
+    print(f"bcrypt rounds {rounds}, {n} logins per run, {os.cpu_count()} CPUs")
+
+    elapsed, lag = await _burst(lambda: loop.run_in_executor(None, crypt_context(rounds).verify, "P@ssw0rd!", stored), n)
+    print(f"inline (threads)   : {n / elapsed:7.1f} logins/s                      loop lag max {lag * 1e3:7.1f} ms")
+
+    for workers in sorted({1, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1}):
+        hasher = PasswordHasher(workers=workers, max_queue=n, rounds=rounds)
+        await hasher.verify_async("P@ssw0rd!", stored)  # start the worker processes
+        elapsed, lag = await _burst(lambda: hasher.verify_async("P@ssw0rd!", stored), n)
+        stats = hasher.stats()
+        hasher.shutdown()
+        print(
+            f"pool, {workers:2d} worker(s) : {n / elapsed:7.1f} logins/s, {n / elapsed / workers:6.1f} per worker"
+            f"   loop lag max {lag * 1e3:7.1f} ms   queue wait avg {stats['queueWaitAvgMs']} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 12))
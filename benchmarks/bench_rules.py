@@ -0,0 +1,59 @@
+"""Per-rule evaluation cost: AST walk per call (old ``safe_eval``) vs compiled rules.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_rules
+"""
+
+import ast
+import random
+import time
+
+from app.rubric.eval import SafeEval, compile_rule
+from app.rubric.loader import read_disorders
+
+
+def _rules():
+    rules = []
+    for spec in read_disorders().values():
+        for group in ("core", "exclusions"):
+            for c in spec.get("criteria", {}).get(group, []) or []:
+                rules.append((c["rule"], c.get("slots_required", [])))
+    return rules
+
+
+def _slots(required, rng):
+    return {s: rng.choice([True, False, 1, 3, 12, 24]) for s in required}
+
+
+def _time(fn, cases, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for expr, names in cases:
+            fn(expr, names)
+    return (time.perf_counter() - t0) / (repeat * len(cases))
+
+
+def main(repeat: int = 2000) -> None:
+    rng = random.Random(7)
+    cases = [(expr, _slots(req, rng)) for expr, req in _rules()]
+
+    def walk(expr, names):
+        return bool(SafeEval(names).visit(ast.parse(expr, mode="eval")))
+
+    def compiled(expr, names):
+        return compile_rule(expr)(names)
+
+    for expr, names in cases:
+        assert walk(expr, names) == compiled(expr, names), expr
+
+    before = _time(walk, cases, repeat)
+    after = _time(compiled, cases, repeat)
+    print(f"rules: {len(cases)}  evaluations per variant: {len(cases) * repeat}")
+    print(f"parse + AST walk : {before * 1e6:8.2f} us/rule")
+    print(f"compiled (cached): {after * 1e6:8.2f} us/rule")
+    print(f"speedup          : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
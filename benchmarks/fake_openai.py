@@ -0,0 +1,91 @@
+"""Local stand-in for an OpenAI-compatible ``/chat/completions`` endpoint.
+
+Serves canned replies over real HTTP (uvicorn in a background thread), so the
+pooled client can be measured without network variance or API cost. Tracks the
+distinct client sockets it saw, which shows whether connections were reused.
+Requests with ``"stream": true`` get the reply back word by word as SSE chunks.
+
+    with FakeOpenAI(latency=0.05) as server:
+        settings.OPENAI_BASE_URL = server.base_url
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import uvicorn
+
+
+class FakeOpenAI:
+    def __init__(self, latency: float = 0.0, reply: str = "ACK."):
+        self.latency = latency
+        self.reply = reply
+        self.requests = 0
+        self.clients: set = set()
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+        self.port: int | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _app(self, scope, receive, send):
+        body = b""
+        while True:
+            msg = await receive()
+            body += msg.get("body", b"")
+            if not msg.get("more_body"):
+                break
+        self.requests += 1
+        self.clients.add(tuple(scope.get("client") or ()))
+        payload = json.loads(body or b"{}")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = self.reply
+        if (payload.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({"facts": {"slots": {}}, "answers": {"answered_intent": False, "refusal": False, "confusion": False}})
+        if payload.get("stream"):
+            await self._stream(send, content)
+            return
+        out = json.dumps({
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": out})
+
+    async def _stream(self, send, content: str) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            piece = word if i == 0 else " " + word
+            chunk = {"choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            await send({"type": "http.response.body", "body": f"data: {json.dumps(chunk)}\n\n".encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b"data: [DONE]\n\n"})
+
+    def start(self) -> "FakeOpenAI":
+        config = uvicorn.Config(self._app, host="127.0.0.1", port=0, log_level="warning", lifespan="off", interface="asgi3")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake OpenAI server did not start")
+            time.sleep(0.01)
+        self.port = self._server.servers[0].sockets[0].getsockname()[1]
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeOpenAI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,34 @@
+import random
+
+from app.conversation.acts import classify_act, classify_act_reference
+from benchmarks.act_corpus import CORPUS
+
+# words and fragments the patterns look for, plus filler, to build random messages
+_VOCAB = [
+    "hi", "hello", "yo", "salam", "oh", "i", "i'm", "don't", "dont", "understand", "confused", "confus",
+    "huh?", "what?", "what", "is", "why", "are", "do", "you", "ask", "stop", "asking", "none", "of",
+    "your", "business", "meaning", "explain", "feel", "feeling", "low", "sad", "down", "tired",
+    "no", "energy", "hopeless", "irritat", "irritated", "angry", "yes", "nah", "22", "7", "suicide",
+    "kill", "myself", "him", "self-harm", "selfharm", "hurt", "someone", "end", "my", "life",
+    "the", "and", "lately", ",", ".", "?", "!", "   ",
+]
+
+
+def test_corpus_labels_match_reference():
+    for text, label in CORPUS:
+        assert classify_act_reference(text).act == label, text
+
+
+def test_combined_matcher_equals_reference_on_corpus():
+    for text, _ in CORPUS:
+        new, ref = classify_act(text), classify_act_reference(text)
+        assert (new.act, new.signals) == (ref.act, ref.signals), text
+
+
+def test_combined_matcher_equals_reference_fuzzed():
+    rng = random.Random(1234)
+    for _ in range(5000):
+        words = rng.choices(_VOCAB, k=rng.randint(0, 14))
+        text = rng.choice([" ", ""]).join(words) if rng.random() < 0.1 else " ".join(words)
+        new, ref = classify_act(text), classify_act_reference(text)
+        assert (new.act, new.signals) == (ref.act, ref.signals), text
@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.conversation.session_cache import get_session_cache
+from app.core.db import async_engine
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+@contextmanager
+def _count_db():
+    seen = {"statements": [], "commits": 0}
+
+    def on_execute(conn, cursor, statement, params, context, executemany):
+        seen["statements"].append(statement.split(None, 1)[0].upper())
+
+    def on_commit(conn):
+        seen["commits"] += 1
+
+    sync = async_engine.sync_engine
+    event.listen(sync, "before_cursor_execute", on_execute)
+    event.listen(sync, "commit", on_commit)
+    try:
+        yield seen
+    finally:
+        event.remove(sync, "before_cursor_execute", on_execute)
+        event.remove(sync, "commit", on_commit)
+
+
+def _start(client, auth, text="hi"):
+    r = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": text})
+    assert r.status_code == 200, r.text
+    return r.json()["session"]["id"]
+
+
+def test_session_routes_on_async_db(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    first = _start(client, auth)
+    second = _start(client, auth, "hello")
+    r = client.post("/chat/message", headers=auth, json={"sessionId": first, "message": "I feel low"})
+    assert r.status_code == 200
+
+    page = client.get("/chat/sessions?page=1&limit=1", headers=auth).json()
+    assert page["total"] == 2 and [s["id"] for s in page["items"]] == [first]  # most recently updated first
+
+    detail = client.get(f"/chat/sessions/{first}", headers=auth).json()
+    assert [m["role"] for m in detail["messages"]] == ["user", "assistant", "user", "assistant"]
+    assert client.get(f"/chat/sessions/{first}/report", headers=auth).status_code == 200
+
+    assert client.delete(f"/chat/sessions/{first}", headers=auth).json() == {"ok": True}
+    assert client.get(f"/chat/sessions/{first}", headers=auth).status_code == 404
+    assert client.get("/chat/sessions", headers=auth).json()["total"] == 1
+
+    assert client.delete("/chat/sessions", headers=auth).json() == {"ok": True}
+    assert client.get(f"/chat/sessions/{second}", headers=auth).status_code == 404
+    assert client.get("/chat/sessions", headers=auth).json()["total"] == 0
+
+
+def test_other_users_session_is_not_found(client, monkeypatch):
+    patch_llm(monkeypatch, {}, None)
+    owner, _ = signup_and_login(client)
+    other, _ = signup_and_login(client)
+    sid = _start(client, {"Authorization": f"Bearer {owner}"})
+    auth = {"Authorization": f"Bearer {other}"}
+    assert client.get(f"/chat/sessions/{sid}", headers=auth).status_code == 404
+    r = client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "hi"})
+    assert r.status_code == 404
+
+
+def test_turn_persists_in_one_transaction(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+
+    with _count_db() as new_turn:
+        sid = _start(client, auth)
+    # principal lookup (id, is_disabled), then session + screening + both messages (one executemany)
+    assert new_turn["statements"] == ["SELECT", "INSERT", "INSERT", "INSERT"]
+    assert new_turn["commits"] == 1
+
+    with _count_db() as hot_turn:
+        r = client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "I feel low"})
+    assert r.status_code == 200
+    # the caller and the session both come from in-process caches; only the writes remain
+    assert sorted(hot_turn["statements"]) == ["INSERT", "UPDATE", "UPDATE"]
+    assert hot_turn["commits"] == 1
+
+    get_session_cache().clear()
+    with _count_db() as cold_turn:
+        r = client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "for weeks now"})
+    assert r.status_code == 200
+    # joined session + screening load, then the writes
+    assert cold_turn["statements"][:1] == ["SELECT"]
+    assert sorted(cold_turn["statements"][1:]) == ["INSERT", "UPDATE", "UPDATE"]
+    assert cold_turn["commits"] == 1
+
+
+def test_session_list_keyset_pages(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    ids = [_start(client, auth, f"hello {i}") for i in range(5)]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get(f"/chat/sessions?limit=2&cursor={cursor}", headers=auth).json()
+        assert page["page"] is None and page["total"] is None
+        seen += [s["id"] for s in page["items"]]
+        cursor = page["nextCursor"]
+    assert seen == ids[::-1]
+
+    legacy = client.get("/chat/sessions?page=2&limit=2", headers=auth).json()
+    assert legacy["page"] == 2 and legacy["total"] == 5
+    assert [s["id"] for s in legacy["items"]] == seen[2:4]
+
+    first = client.get("/chat/sessions?limit=2&cursor=&includeTotal=true", headers=auth).json()
+    assert first["total"] == 5
+    assert client.get("/chat/sessions?cursor=not-a-cursor", headers=auth).status_code == 400
+
+
+def test_session_list_uses_composite_index():
+    from sqlalchemy import text
+    from app.core.db import engine
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM chat_sessions WHERE user_id = 'u' "
+            "AND (updated_at, id) < ('2026-01-01', 'x') ORDER BY updated_at DESC, id DESC LIMIT 21"
+        )).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_chat_sessions_user_updated" in detail and "TEMP B-TREE" not in detail
+
+
+def test_transcript_pages_and_revalidates(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    sid = _start(client, auth, "hi")
+    for i in range(3):
+        client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": f"message {i} " + "x" * 600})
+
+    full = client.get(f"/chat/sessions/{sid}", headers=auth)
+    ids = [m["id"] for m in full.json()["messages"]]
+    assert len(ids) == 8 and full.json()["hasMore"] is None
+    assert full.headers["content-encoding"] == "gzip"
+
+    newest = client.get(f"/chat/sessions/{sid}?limit=3", headers=auth).json()
+    assert [m["id"] for m in newest["messages"]] == ids[-3:] and newest["hasMore"] is True
+    older = client.get(f"/chat/sessions/{sid}?limit=3&before={ids[-3]}", headers=auth).json()
+    assert [m["id"] for m in older["messages"]] == ids[-6:-3]
+    newer = client.get(f"/chat/sessions/{sid}?after={ids[4]}", headers=auth).json()
+    assert [m["id"] for m in newer["messages"]] == ids[5:] and newer["hasMore"] is False
+    assert client.get(f"/chat/sessions/{sid}?before=nope", headers=auth).status_code == 400
+
+    etag = full.headers["etag"]
+    again = client.get(f"/chat/sessions/{sid}", headers=dict(auth, **{"If-None-Match": etag}))
+    assert again.status_code == 304 and again.content == b""
+    page_a = client.get(f"/chat/sessions/{sid}?limit=3", headers=auth).headers["etag"]
+    page_b = client.get(f"/chat/sessions/{sid}?limit=3&before={ids[-3]}", headers=dict(auth, **{"If-None-Match": page_a}))
+    assert page_b.status_code == 200 and len({etag, page_a, page_b.headers["etag"]}) == 3
+    unknown = client.get(f"/chat/sessions/{sid}?before=nope", headers=dict(auth, **{"If-None-Match": "*"}))
+    assert unknown.status_code == 400
+    client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "one more"})
+    changed = client.get(f"/chat/sessions/{sid}", headers=dict(auth, **{"If-None-Match": etag}))
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
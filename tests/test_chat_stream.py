@@ -0,0 +1,57 @@
+import json
+
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+def _events(body: str):
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def patch_stream(monkeypatch, pieces):
+    async def fake_compose_stream(user_text, intent, question, progress_hint, extra_explanation):
+        for p in pieces:
+            yield p
+    monkeypatch.setattr("app.llm.composer.compose_stream", fake_compose_stream)
+
+
+def test_stream_sends_meta_tokens_then_done(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    patch_llm(monkeypatch, {}, None)
+    patch_stream(monkeypatch, ["Hi", " there.", " What's up?"])
+    auth = {"Authorization": f"Bearer {token}"}
+    r = client.post("/chat/message/stream", headers=auth, json={"sessionId": None, "message": "hi"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in r.headers  # gzip would hold tokens back
+    events = _events(r.text)
+    names = [e for e, _ in events]
+    assert names == ["meta", "token", "token", "token", "done"]
+    meta = events[0][1]
+    assert meta["meta"]["turnPath"] == "streamed"
+    done = events[-1][1]["assistantMessage"]
+    assert done["text"] == "Hi there. What's up?"
+
+    detail = client.get(f"/chat/sessions/{meta['session']['id']}", headers=auth).json()
+    assert [m["role"] for m in detail["messages"]] == ["user", "assistant"]
+    assert detail["messages"][1]["id"] == done["id"]
+
+
+def test_stream_failure_stores_nothing(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    patch_llm(monkeypatch, {}, None)
+
+    async def broken(**kw):
+        yield "partial"
+        raise RuntimeError("upstream closed")
+    monkeypatch.setattr("app.llm.composer.compose_stream", broken)
+    auth = {"Authorization": f"Bearer {token}"}
+    r = client.post("/chat/message/stream", headers=auth, json={"sessionId": None, "message": "hi"})
+    events = _events(r.text)
+    assert events[-1][0] == "error"
+    sid = events[0][1]["session"]["id"]
+    # a new session is only inserted together with its first completed turn
+    assert client.get(f"/chat/sessions/{sid}", headers=auth).status_code == 404
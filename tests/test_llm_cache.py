@@ -0,0 +1,109 @@
+import asyncio
+
+from app.core.config import settings
+from app.llm import cache as llm_cache, composer, extractor
+from app.llm.cache import SqliteTier, StageCache, normalize_text
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_text():
+    assert normalize_text("  Hi!! ") == normalize_text("hi") == "hi"
+    assert normalize_text("I feel   very LOW lately.") == "i feel very low lately"
+
+
+def test_memory_tier_lru_and_ttl():
+    clock = Clock()
+    c = StageCache("t", enabled=True, ttl_seconds=10, max_entries=2, clock=clock)
+    c.set("a", "1")
+    c.set("b", "2")
+    assert c.get("a") == "1"  # a is now most recent
+    c.set("c", "3")  # evicts b
+    assert c.get("b") is None
+    assert c.memory.evictions == 1
+    clock.now += 11
+    assert c.get("a") is None and c.get("c") is None
+    st = c.stats()
+    assert st["hits"] == 1 and st["misses"] == 3
+
+
+def test_disabled_stage_never_stores():
+    c = StageCache("t", enabled=False, ttl_seconds=10, max_entries=2)
+    c.set("a", "1")
+    assert c.get("a") is None
+    assert c.stats()["stores"] == 0
+
+
+def test_sqlite_tier_survives_new_memory(tmp_path):
+    clock = Clock()
+    disk = SqliteTier(str(tmp_path / "cache.db"), clock=clock)
+    StageCache("extract", True, 60, 10, disk=disk, clock=clock).set("k", "v")
+    fresh = StageCache("extract", True, 60, 10, disk=disk, clock=clock)
+    assert fresh.get("k") == "v"
+    assert fresh.stats()["diskHits"] == 1
+    assert fresh.get("k") == "v" and fresh.stats()["hits"] == 1  # promoted to memory
+    assert StageCache("compose", True, 60, 10, disk=disk, clock=clock).get("k") is None
+    clock.now += 61
+    assert StageCache("extract", True, 60, 10, disk=disk, clock=clock).get("k") is None
+    assert disk.purge_expired() == 1
+    disk.close()
+
+
+def test_extract_and_compose_hit_cache(monkeypatch):
+    llm_cache.reset_caches()
+    calls = []
+
+    async def fake_completion(messages, temperature=0.2, response_format=None):
+        calls.append(temperature)
+        return '{"facts": {"slots": {"fatigue": true}}}' if response_format else " Hello. "
+
+    monkeypatch.setattr(extractor, "chat_completion", fake_completion)
+    monkeypatch.setattr(composer, "chat_completion", fake_completion)
+
+    async def run():
+        a = await extractor.extract("I'm tired", ["fatigue"])
+        a["facts"]["slots"]["fatigue"] = False  # callers may mutate; the cache must not care
+        b = await extractor.extract("i'm TIRED.", ["fatigue"])
+        c = await extractor.extract("i'm tired", ["fatigue", "sleep"])  # other slot list -> miss
+        r1 = await composer.compose("hi", "rapport_open", "Q?", None, None)
+        r2 = await composer.compose("Hi!", "rapport_open", "Q?", None, None)
+        return b, c, r1, r2
+
+    try:
+        b, c, r1, r2 = asyncio.run(run())
+        assert b == {"facts": {"slots": {"fatigue": True}}}
+        assert c == b
+        assert r1 == r2 == "Hello."
+        assert len(calls) == 3
+        stats = llm_cache.cache_stats()
+        assert stats["extract"]["hits"] == 1 and stats["compose"]["hits"] == 1
+    finally:
+        llm_cache.reset_caches()
+
+
+def test_compose_cache_can_be_disabled(monkeypatch):
+    llm_cache.reset_caches()
+    monkeypatch.setattr(settings, "LLM_CACHE_COMPOSE_ENABLED", False)
+    calls = []
+
+    async def fake_completion(messages, temperature=0.2, response_format=None):
+        calls.append(1)
+        return "Hello."
+
+    monkeypatch.setattr(composer, "chat_completion", fake_completion)
+
+    async def run():
+        for _ in range(3):
+            await composer.compose("hi", "rapport_open", None, None, None)
+
+    try:
+        asyncio.run(run())
+        assert len(calls) == 3
+    finally:
+        llm_cache.reset_caches()
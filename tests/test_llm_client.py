@@ -0,0 +1,43 @@
+import asyncio
+
+from app.core.config import settings
+from app.llm import openai_client
+from benchmarks.fake_openai import FakeOpenAI
+
+def test_shared_client_reuses_connections(monkeypatch):
+    with FakeOpenAI() as server:
+        monkeypatch.setattr(settings, "OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+
+        opened = openai_client.pool_stats()["connectionsOpened"]
+
+        async def run():
+            await openai_client.start_client()
+            try:
+                replies = [await openai_client.chat_completion([{"role": "user", "content": "hi"}]) for _ in range(5)]
+                return replies, openai_client.pool_stats()
+            finally:
+                await openai_client.close_client()
+
+        replies, stats = asyncio.run(run())
+    assert replies == ["ACK."] * 5
+    assert server.requests == 5
+    assert len(server.clients) == 1  # one keep-alive connection served every call
+    assert stats["connectionsOpened"] - opened == 1 and stats["inFlight"] == 0
+    assert stats["poolWaits"] >= 5
+    assert openai_client.pool_stats()["open"] is False
+
+def test_chat_completion_stream_yields_deltas(monkeypatch):
+    with FakeOpenAI(reply="one two three") as server:
+        monkeypatch.setattr(settings, "OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+
+        async def run():
+            await openai_client.start_client()
+            try:
+                return [p async for p in openai_client.chat_completion_stream([{"role": "user", "content": "hi"}])]
+            finally:
+                await openai_client.close_client()
+
+        pieces = asyncio.run(run())
+    assert pieces == ["one", " two", " three"]
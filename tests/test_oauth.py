@@ -0,0 +1,165 @@
+import asyncio
+import datetime as dt
+import json
+import threading
+import time
+
+import pytest
+import uvicorn
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from jose import jwt
+
+from app.core.config import settings
+from app.services import cert_cache, oauth
+from app.services.cert_cache import CertCache
+
+
+class KeyServer:
+    """Local stand-in for Google's certificate endpoint (x509 PEM per key id)."""
+
+    def __init__(self, max_age: int = 300):
+        self.max_age = max_age
+        self.keys = {}
+        self.hits = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/certs"
+
+    def add_key(self, kid: str):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+        now = dt.datetime.now(dt.timezone.utc)
+        cert = (
+            x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - dt.timedelta(days=1)).not_valid_after(now + dt.timedelta(days=1))
+            .sign(key, hashes.SHA256())
+        )
+        self.keys[kid] = cert.public_bytes(serialization.Encoding.PEM).decode()
+        return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+
+    async def _app(self, scope, receive, send):
+        self.hits += 1
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"application/json"),
+            (b"cache-control", f"public, max-age={self.max_age}, must-revalidate".encode()),
+        ]})
+        await send({"type": "http.response.body", "body": json.dumps(self.keys).encode()})
+
+    def __enter__(self):
+        self._server = uvicorn.Server(uvicorn.Config(self._app, host="127.0.0.1", port=0, log_level="warning", lifespan="off", interface="asgi3"))
+        threading.Thread(target=self._server.run, daemon=True).start()
+        while not self._server.started:
+            time.sleep(0.01)
+        self.port = self._server.servers[0].sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+
+
+def _id_token(private_pem, kid, **claims):
+    now = int(time.time())
+    body = {"iat": now, "exp": now + 600, "sub": "g-123", "email": "Person@Example.com", **claims}
+    return jwt.encode(body, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture()
+def keys(monkeypatch):
+    with KeyServer() as server:
+        monkeypatch.setattr(settings, "GOOGLE_CERTS_URL", server.url)
+        monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", "client-1")
+        monkeypatch.setattr(cert_cache, "_caches", {})
+        yield server
+
+
+def test_certs_are_cached_for_max_age(keys):
+    keys.add_key("k1")
+    clock = [0.0]
+    cache = CertCache(keys.url, clock=lambda: clock[0])
+
+    async def run():
+        assert await cache.get("k1") == keys.keys["k1"]
+        assert await cache.get("k1") is not None
+        assert keys.hits == 1
+        clock[0] += keys.max_age + 1
+        await cache.get("k1")
+        assert keys.hits == 2
+        await cert_cache.close_client()
+
+    asyncio.run(run())
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_requests_share_one_fetch(keys):
+    keys.add_key("k1")
+    clock = [0.0]
+    cache = CertCache(keys.url, clock=lambda: clock[0])
+
+    async def run():
+        for _ in range(2):  # cold, then expired
+            certs = await asyncio.gather(*(cache.get("k1") for _ in range(10)))
+            assert all(c == keys.keys["k1"] for c in certs)
+            clock[0] += keys.max_age + 1
+        await cert_cache.close_client()
+
+    asyncio.run(run())
+    assert keys.hits == 2
+
+
+def test_unknown_key_id_refetches_once(keys, monkeypatch):
+    keys.add_key("k1")
+    monkeypatch.setattr(settings, "OAUTH_CERTS_REFETCH_SECONDS", 0.0)
+
+    async def run():
+        cache = cert_cache.cert_cache(keys.url)
+        await cache.get("k1")
+        rotated = keys.add_key("k2")  # Google rotated keys before our max-age ran out
+        token = _id_token(rotated, "k2", aud="client-1", iss="https://accounts.google.com")
+        ident = await oauth.verify_google_id_token(token)
+        assert ident.email == "person@example.com" and ident.subject == "g-123"
+        assert keys.hits == 2 and cache.stats()["rotations"] == 1
+        await cert_cache.close_client()
+
+    asyncio.run(run())
+
+
+def test_google_sign_in_verifies_against_cached_certs(client, keys):
+    private = keys.add_key("k1")
+    good = _id_token(private, "k1", aud="client-1", iss="accounts.google.com", sub="g-route", email="route@example.com")
+    r = client.post("/auth/oauth/google", json={"idToken": good})
+    assert r.status_code == 200, r.text
+    assert r.json()["user"]["email"] == "route@example.com"
+    assert client.post("/auth/oauth/google", json={"idToken": good}).status_code == 200
+    assert keys.hits == 1
+
+    wrong_audience = _id_token(private, "k1", aud="someone-else", iss="accounts.google.com")
+    assert client.post("/auth/oauth/google", json={"idToken": wrong_audience}).status_code == 401
+
+
+def test_firebase_token_checks_project_issuer(keys, monkeypatch):
+    monkeypatch.setattr(settings, "FIREBASE_CERTS_URL", keys.url)
+    monkeypatch.setattr(settings, "FIREBASE_PROJECT_ID", "proj-1")
+    private = keys.add_key("k1")
+    good = _id_token(private, "k1", aud="proj-1", iss="https://securetoken.google.com/proj-1")
+    forged = _id_token(private, "k1", aud="proj-1", iss="https://securetoken.google.com/other")
+    claims = {"aud": "proj-1", "iss": "https://securetoken.google.com/proj-1"}
+    long_sub = _id_token(private, "k1", sub="x" * 129, **claims)
+    future_auth = _id_token(private, "k1", auth_time=int(time.time()) + 600, **claims)
+    past_auth = _id_token(private, "k1", auth_time=int(time.time()) - 600, **claims)
+
+    async def run():
+        ident = await oauth.verify_firebase_id_token(good)
+        assert ident.provider == "firebase" and ident.subject == "g-123"
+        assert (await oauth.verify_firebase_id_token(past_auth)).subject == "g-123"
+        for bad in (forged, long_sub, future_auth):
+            with pytest.raises(Exception):
+                await oauth.verify_firebase_id_token(bad)
+        await cert_cache.close_client()
+
+    asyncio.run(run())
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from app.conversation import orchestrator
+from app.conversation.state import ScreeningState
+
+NO_FACTS = {"facts": {"slots": {}}, "answers": {"answered_intent": False, "refusal": False, "confusion": False}}
+
+def _patch_llm(monkeypatch, extracted, delay=0.0):
+    calls = []
+
+    async def fake_extract(user_text, known_slots):
+        await asyncio.sleep(delay)
+        return extracted
+
+    async def fake_compose(user_text, intent, question, progress_hint, extra_explanation):
+        calls.append(intent)
+        await asyncio.sleep(delay)
+        return f"{intent}|{question}"
+
+    monkeypatch.setattr("app.llm.extractor.extract", fake_extract)
+    monkeypatch.setattr("app.llm.composer.compose", fake_compose)
+    return calls
+
+def _state(**kw):
+    return ScreeningState(**kw)
+
+def test_greeting_overlaps_extract_and_compose(monkeypatch):
+    calls = _patch_llm(monkeypatch, NO_FACTS, delay=0.2)
+    t0 = time.perf_counter()
+    state, reply, meta = asyncio.run(orchestrator.handle_turn(_state(), "hi"))
+    elapsed = time.perf_counter() - t0
+    assert meta["turnPath"] == "concurrent"
+    assert reply.startswith("rapport_open|")
+    assert calls == ["rapport_open"]
+    assert elapsed < 0.35  # two 0.2s round-trips ran side by side
+
+def test_overlap_replans_when_extraction_changes_the_plan(monkeypatch):
+    extracted = {"facts": {"presenting_concern": "low mood", "slots": {}}}
+    calls = _patch_llm(monkeypatch, extracted)
+    state, reply, meta = asyncio.run(orchestrator.handle_turn(_state(), "hi, I have been low"))
+    assert meta["turnPath"] == "concurrent_replanned"
+    assert reply.startswith("reflect_and_gentle_narrow|")
+    assert state.presenting_concern == "low mood"
+
+def test_clinical_turn_stays_sequential(monkeypatch):
+    _patch_llm(monkeypatch, NO_FACTS)
+    state = _state(readiness="READY", presenting_concern="low mood", age_years=30, phase="SCREENING")
+    _, reply, meta = asyncio.run(orchestrator.handle_turn(state, "yes"))
+    assert meta["turnPath"] == "sequential"
+    assert meta["nextIntent"].startswith("clarify_")
+
+def test_slot_catalog_follows_hypotheses_and_target():
+    from app.rubric.registry import get_registry
+    registry = get_registry().snapshot()
+    assert orchestrator._slot_catalog(ScreeningState(), registry) == list(registry.known_slots_sorted)
+
+    h = {did: 0.0 for did in registry.rubrics}
+    h["mdd"] = 1.0
+    state = ScreeningState(hypotheses=h, last_intent="clarify_outburst_freq_per_week")
+    catalog = orchestrator._slot_catalog(state, registry)
+    assert set(registry.rubrics["mdd"].slot_types) <= set(catalog)
+    assert {"age_years", "presenting_concern"} <= set(catalog)
+    assert "outburst_freq_per_week" in catalog  # planner target kept even if its disorder dropped
+    assert "cyclical_timing" not in catalog  # pmdd is out of play
+
+
+def test_extractor_prompt_prefix_is_stable():
+    from app.llm.extractor import build_messages
+    a = build_messages("hi", ["age_years"])
+    b = build_messages("I feel low", ["age_years", "fatigue"])
+    assert a[0] == b[0]
+    assert "fatigue" in b[-1]["content"] and "fatigue" not in b[0]["content"]
@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+
+from app.core import passwords
+from app.core.db import SessionLocal
+from app.core.passwords import PasswordHasher, PasswordHasherBusy
+from app.models import User
+
+
+def test_hasher_round_trip_and_cap():
+    hasher = PasswordHasher(workers=0, max_queue=0, rounds=4)
+
+    async def run():
+        h = await hasher.hash_async("secret")
+        assert await hasher.verify_async("secret", h) == (True, None)
+        assert (await hasher.verify_async("wrong", h))[0] is False
+        # one call may run, none may wait
+        return await asyncio.gather(hasher.hash_async("a"), hasher.hash_async("b"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 1
+    stats = hasher.stats()
+    assert stats["rejected"] == 1 and stats["inFlight"] == 0 and stats["hashes"] == 2
+
+
+def test_process_pool_hashes_off_process():
+    hasher = PasswordHasher(workers=1, max_queue=4, rounds=4)
+    try:
+        h = asyncio.run(hasher.hash_async("secret"))
+        assert h.startswith("$2b$04$")
+        assert asyncio.run(hasher.verify_async("secret", h)) == (True, None)
+    finally:
+        hasher.shutdown()
+
+
+def _signup(client):
+    email = f"p-{uuid.uuid4().hex[:8]}@example.com"
+    r = client.post("/auth/signup", json={
+        "name": "Test User", "email": email, "password": "P@ssw0rd!",
+        "gender": "Male", "dateOfBirth": "01/01/2000", "profileImage": None,
+    })
+    assert r.status_code == 200, r.text
+    return email
+
+
+def _stored_hash(email):
+    with SessionLocal() as db:
+        return db.query(User).filter(User.email == email).one().password_hash
+
+
+def test_login_upgrades_outdated_hash(client, monkeypatch):
+    monkeypatch.setattr(passwords, "_hasher", PasswordHasher(workers=0, max_queue=8, rounds=4))
+    email = _signup(client)
+    assert _stored_hash(email).startswith("$2b$04$")
+
+    monkeypatch.setattr(passwords, "_hasher", PasswordHasher(workers=0, max_queue=8, rounds=5))
+    assert client.post("/auth/login", json={"email": email, "password": "P@ssw0rd!"}).status_code == 200
+    assert _stored_hash(email).startswith("$2b$05$")
+    assert passwords.get_password_hasher().stats()["rehashed"] == 1
+    assert client.post("/auth/login", json={"email": email, "password": "nope"}).status_code == 401
+
+
+def test_login_answers_503_when_hashing_is_saturated(client, monkeypatch):
+    hasher = PasswordHasher(workers=0, max_queue=0, rounds=4)
+    monkeypatch.setattr(passwords, "_hasher", hasher)
+    email = _signup(client)
+    hasher._in_flight = 1  # the only slot is taken
+    r = client.post("/auth/login", json={"email": email, "password": "P@ssw0rd!"})
+    assert r.status_code == 503 and r.headers["retry-after"] == "1"
+    assert hasher.stats()["rejected"] == 1
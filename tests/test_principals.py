@@ -0,0 +1,60 @@
+from app.api import deps
+from app.core.principals import Principal, PrincipalCache, get_principal_cache
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_at_ttl_or_token_exp_whichever_is_first():
+    clock = Clock()
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.set("a", Principal("u1"), token_exp=2000)
+    cache.set("b", Principal("u1"), token_exp=1010)
+    clock.now += 30
+    assert cache.get("a") == Principal("u1")
+    assert cache.get("b") is None  # token expired before the TTL
+    clock.now += 31
+    assert cache.get("a") is None
+    cache.set("c", Principal("u1"), token_exp=clock.now - 1)
+    assert cache.stats()["entries"] == 0  # already expired, never stored
+
+
+def test_lru_bound_and_user_invalidation():
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", Principal("u1"), None)
+    cache.set("b", Principal("u2"), None)
+    cache.get("a")
+    cache.set("c", Principal("u1"), None)
+    assert cache.get("b") is None and cache.stats()["evictions"] == 1
+    cache.invalidate_user("u1")
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_repeat_requests_skip_token_decode(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    decoded = []
+    real = deps.decode_token
+    monkeypatch.setattr(deps, "decode_token", lambda t: decoded.append(t) or real(t))
+    for _ in range(3):
+        assert client.get("/chat/sessions", headers=auth).status_code == 200
+    assert len(decoded) == 1
+    # the profile route still loads the full user
+    assert client.get("/users/me", headers=auth).status_code == 200
+
+
+def test_deleted_account_token_is_rejected_at_once(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    assert client.get("/chat/sessions", headers=auth).status_code == 200
+    assert client.delete("/users/me", headers=auth).json() == {"ok": True}
+    assert client.get("/chat/sessions", headers=auth).status_code == 401
+    assert get_principal_cache().stats()["invalidations"] >= 1
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models import ChatMessage, ChatSession, Feedback, RefreshToken, ScreeningSession, User
+from app.services import purge
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+def _counts(user_id):
+    with SessionLocal() as db:
+        sessions = select(ChatSession.id).where(ChatSession.user_id == user_id)
+        return {
+            "sessions": db.scalar(select(func.count()).select_from(ChatSession).where(ChatSession.user_id == user_id)),
+            "messages": db.scalar(select(func.count()).select_from(ChatMessage).where(ChatMessage.session_id.in_(sessions))),
+            "screenings": db.scalar(select(func.count()).select_from(ScreeningSession).where(ScreeningSession.session_id.in_(sessions))),
+            "tokens": db.scalar(select(func.count()).select_from(RefreshToken).where(RefreshToken.user_id == user_id)),
+            "feedback": db.scalar(select(func.count()).select_from(Feedback).where(Feedback.user_id == user_id)),
+            "user": db.scalar(select(func.count()).select_from(User).where(User.id == user_id)),
+        }
+
+
+def _user_with_history(client, monkeypatch, sessions=3):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    ids = [client.post("/chat/message", headers=auth, json={"sessionId": None, "message": f"hi {i}"}).json()["session"]["id"] for i in range(sessions)]
+    assert client.post("/feedback", headers=auth, json={"sessionId": ids[0], "rating": 4}).status_code == 200
+    user_id = client.get("/users/me", headers=auth).json()["id"]
+    return auth, user_id, ids
+
+
+def test_delete_all_sessions_cascades_in_the_database(client, monkeypatch):
+    auth, user_id, _ = _user_with_history(client, monkeypatch)
+    before = _counts(user_id)
+    assert before["sessions"] == 3 and before["messages"] == 6 and before["screenings"] == 3
+    assert client.delete("/chat/sessions", headers=auth).json() == {"ok": True}
+    after = _counts(user_id)
+    assert after["sessions"] == after["messages"] == after["screenings"] == 0
+    assert after["feedback"] == 1  # kept, its session link set to NULL
+
+
+def test_large_purge_runs_chunked_in_background(client, monkeypatch):
+    monkeypatch.setattr(settings, "PURGE_BACKGROUND_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "PURGE_CHUNK_SIZE", 2)
+    auth, user_id, _ = _user_with_history(client, monkeypatch, sessions=5)
+    r = client.delete("/chat/sessions", headers=auth)
+    assert r.json() == {"ok": True, "queued": True}
+    # TestClient runs background tasks before returning
+    assert _counts(user_id)["sessions"] == 0 and _counts(user_id)["messages"] == 0
+
+
+def test_delete_account_removes_everything(client, monkeypatch):
+    auth, user_id, _ = _user_with_history(client, monkeypatch)
+    assert client.delete("/users/me", headers=auth).json() == {"ok": True}
+    assert all(v == 0 for v in _counts(user_id).values())
+    assert client.get("/users/me", headers=auth).status_code == 401
+
+
+def test_deferred_account_delete_retires_user_first(client, monkeypatch):
+    monkeypatch.setattr(settings, "PURGE_BACKGROUND_THRESHOLD", 1)
+    auth, user_id, _ = _user_with_history(client, monkeypatch)
+    retired = []
+    real = purge.purge_user
+
+    async def watch(uid):
+        with SessionLocal() as db:
+            u = db.get(User, uid)
+            retired.append((u.is_disabled, u.email))
+        await real(uid)
+
+    monkeypatch.setattr(purge, "purge_user", watch)
+    assert client.delete("/users/me", headers=auth).json() == {"ok": True, "queued": True}
+    assert retired == [(True, f"deleted+{user_id}@invalid")]
+    assert all(v == 0 for v in _counts(user_id).values())
+
+
+def test_feedback_for_unknown_session_is_rejected(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    r = client.post("/feedback", headers={"Authorization": f"Bearer {token}"}, json={"sessionId": "missing", "rating": 3})
+    assert r.status_code == 404
+
+
+def test_refresh_rotates_once(client):
+    _, refresh = signup_and_login(client)
+    r = client.post("/auth/refresh", json={"refreshToken": refresh})
+    assert r.status_code == 200
+    assert client.post("/auth/refresh", json={"refreshToken": refresh}).json()["detail"] == "Refresh token revoked"
+    rotated = r.json()["token"]["refreshToken"]
+    assert client.post("/auth/logout", json={"refreshToken": rotated}).json() == {"ok": True}
+    assert client.post("/auth/refresh", json={"refreshToken": rotated}).status_code == 401
+
+
+def test_compaction_deletes_only_dead_tokens(client):
+    _, refresh = signup_and_login(client)
+    user_id = client.post("/auth/refresh", json={"refreshToken": refresh}).json()["user"]["id"]  # one revoked, one live
+    with SessionLocal() as db:
+        db.add(RefreshToken(user_id=user_id, token_jti=f"expired-{user_id}", expires_at=datetime.utcnow() - timedelta(days=1)))
+        db.commit()
+    assert _counts(user_id)["tokens"] == 3
+
+    purged = asyncio.run(purge.compact_refresh_tokens(chunk_size=1))
+    assert purged >= 2
+    assert _counts(user_id)["tokens"] == 1
+    stats = client.get("/stats").json()
+    assert stats["refreshTokens"]["purged"] >= 2 and stats["refreshTokens"]["rows"] >= 1
+
+
+def test_compaction_query_uses_the_revoked_index():
+    with SessionLocal() as db:
+        plan = db.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT id FROM refresh_tokens WHERE revoked = 1 LIMIT 10"
+        ).fetchall()
+    assert "ix_refresh_tokens_revoked" in " ".join(str(row[-1]) for row in plan)
@@ -1,4 +1,5 @@
 import json
+import uuid
 from app.core.db import SessionLocal
 from app.models import User
 from app.core.security import hash_password
@@ -6,7 +7,7 @@ from app.core.security import hash_password
 def signup_and_login(client):
     r = client.post("/auth/signup", json={
         "name":"Test User",
-        "email":"t@example.com",
+        "email":f"t-{uuid.uuid4().hex[:8]}@example.com",
         "password":"P@ssw0rd!",
         "gender":"Male",
         "dateOfBirth":"01/01/2000",
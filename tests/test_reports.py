@@ -0,0 +1,80 @@
+import time
+
+from app.api.routes import chat
+from app.conversation import reports
+from app.conversation.state import ScreeningState
+from app.core.config import settings
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+def test_version_follows_inputs():
+    state = ScreeningState(active_disorder_id="mdd", slots={"fatigue": True}, hypotheses={"mdd": 0.6})
+    v = reports.report_version(state, "rubrics-1")
+    assert reports.report_version(state.copy(), "rubrics-1") == v
+    assert reports.report_version(state, "rubrics-2") != v
+    state.turns += 5  # not a report input
+    assert reports.report_version(state, "rubrics-1") == v
+    state.slots["sleep_disturbance"] = True
+    assert reports.report_version(state, "rubrics-1") != v
+
+
+def test_report_is_memoized_and_revalidated(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    sid = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": "hi"}).json()["session"]["id"]
+
+    before = reports.get_report_cache().stats()
+    first = client.get(f"/chat/sessions/{sid}/report", headers=auth)
+    second = client.get(f"/chat/sessions/{sid}/report", headers=auth)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() and first.json()["outcome"] == "INSUFFICIENT"
+    after = reports.get_report_cache().stats()
+    assert after["misses"] == before["misses"] + 1 and after["hits"] == before["hits"] + 1
+
+    etag = first.headers["etag"]
+    r = client.get(f"/chat/sessions/{sid}/report", headers=dict(auth, **{"If-None-Match": etag}))
+    assert r.status_code == 304 and r.content == b""
+
+
+def test_report_ready_turn_precomputes(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    real = chat.handle_turn
+
+    async def ready_turn(state, text):
+        state, reply, meta = await real(state, text)
+        state.phase = "REPORT_READY"
+        state.active_disorder_id = "mdd"
+        state.slots["depressed_mood"] = True
+        return state, reply, meta
+
+    monkeypatch.setattr(chat, "handle_turn", ready_turn)
+    cache = reports.get_report_cache()
+    precomputed = cache.stats()["precomputed"]
+    sid = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": "hi"}).json()["session"]["id"]
+    deadline = time.time() + 2
+    while cache.stats()["precomputed"] == precomputed and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()["precomputed"] == precomputed + 1
+
+    hits = cache.stats()["hits"]
+    r = client.get(f"/chat/sessions/{sid}/report", headers=auth)
+    assert r.json()["active_disorder"] == "mdd"
+    assert cache.stats()["hits"] == hits + 1
+
+
+def test_deleting_all_sessions_drops_their_reports(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    cache = reports.get_report_cache()
+    sids = [client.post("/chat/message", headers=auth, json={"sessionId": None, "message": f"hi {i}"}).json()["session"]["id"] for i in range(2)]
+    for sid in sids:
+        assert client.get(f"/chat/sessions/{sid}/report", headers=auth).status_code == 200
+    entries = cache.stats()["entries"]
+
+    monkeypatch.setattr(settings, "PURGE_BACKGROUND_THRESHOLD", 1)  # the background path
+    assert client.delete("/chat/sessions", headers=auth).json() == {"ok": True, "queued": True}
+    assert cache.stats()["entries"] == entries - 2
@@ -0,0 +1,62 @@
+import random
+
+from app.rubric.engine import evaluate_disorder, missing_slots
+from app.rubric.matrix import RubricMatrix
+from app.rubric.registry import RubricRegistry, compile_rubric
+
+def test_matrix_matches_per_disorder_engine():
+    snap = RubricRegistry(hot_reload=False).snapshot()
+    rng = random.Random(3)
+    values = [True, False, None, 0, 1, 2, 3, 5, 12, 24, "x"]
+    names = sorted(snap.known_slots)
+    for _ in range(500):
+        slots = {s: rng.choice(values) for s in names if rng.random() < 0.6}
+        res = snap.matrix.evaluate_all(slots)
+        for did, spec in snap.disorders.items():
+            assert res.evaluation(did) == evaluate_disorder(spec, slots)
+            assert res.missing_slots(did) == missing_slots(spec, slots)
+
+def test_matrix_exclusion_and_differential():
+    spec = {
+        "id": "toy", "name": "Toy",
+        "criteria": {
+            "core": [{"id": "A", "slots_required": ["a"], "rule": "a == True"}],
+            "exclusions": [{"id": "X", "slots_required": ["x"], "rule": "x == True", "effect": "EXCLUDED"}],
+        },
+    }
+    matrix = RubricMatrix({"toy": compile_rubric(spec)})
+    res = matrix.evaluate_all({"a": True, "x": True})
+    assert res.differential() == {"toy": {"outcome": "EXCLUDED", "coverage": 1.0}}
+    assert res.evaluation("toy") == evaluate_disorder(spec, {"a": True, "x": True})
+    assert matrix.evaluate_all({"a": True, "x": False}).summary("toy")["outcome"] == "PROBABLE_MATCH"
+
+def test_incremental_matches_full_evaluation_across_turns():
+    snap = RubricRegistry(hot_reload=False).snapshot()
+    m = snap.matrix
+    rng = random.Random(11)
+    values = [True, False, None, 1, 2, 3, 12, "x"]
+    names = sorted(snap.known_slots)
+    for _ in range(50):
+        slots, prev = {}, None
+        for _turn in range(8):
+            new = dict(slots)
+            for s in rng.sample(names, 2):
+                new[s] = rng.choice(values)
+            res = m.evaluate_incremental(new, slots, prev)
+            full = m.evaluate_all(new)
+            for did in m.disorder_ids:
+                assert res.evaluation(did) == full.evaluation(did)
+                assert res.missing_slots(did) == full.missing_slots(did)
+            if prev is not None:
+                assert res.rules_evaluated <= len(m.rows_for(set(new) | set(slots)))
+            slots, prev = new, res.snapshot()
+
+def test_incremental_falls_back_on_stale_snapshot():
+    m = RubricRegistry(hot_reload=False).snapshot().matrix
+    first = m.evaluate_all({"depressed_mood": True})
+    # snapshot was taken for different slots than the ones passed as prev_slots
+    res = m.evaluate_incremental({"depressed_mood": True, "fatigue": True}, {}, first.snapshot())
+    assert res.evaluation("mdd") == m.evaluate_all({"depressed_mood": True, "fatigue": True}).evaluation("mdd")
+    stale = dict(first.snapshot(), v="other-version")
+    assert m.evaluate_incremental({"depressed_mood": True}, {"depressed_mood": True}, stale).rules_evaluated == \
+        m.evaluate_all({"depressed_mood": True}).rules_evaluated
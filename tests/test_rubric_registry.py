@@ -0,0 +1,52 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from app.rubric.loader import DISORDERS_DIR, read_disorders
+from app.rubric.registry import RubricRegistry, RubricError
+
+def _copy_rubrics(tmp_path):
+    for fn in os.listdir(DISORDERS_DIR):
+        shutil.copy(os.path.join(DISORDERS_DIR, fn), tmp_path / fn)
+    return tmp_path
+
+def _touch(path):
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 5))
+
+def test_registry_matches_plain_loader():
+    snap = RubricRegistry(hot_reload=False).snapshot()
+    assert snap.disorders == read_disorders()
+    assert "depressed_mood" in snap.known_slots and "age_years" in snap.known_slots
+    assert snap.rubrics["dmdd"].age_max == 18
+    assert snap.rubrics["mdd"].slot_to_criteria["depressed_mood"] == ("A1", "S_count")
+
+def test_registry_hot_reload_swaps_on_content_change(tmp_path):
+    d = _copy_rubrics(tmp_path)
+    reg = RubricRegistry(directory=str(d), check_interval=0)
+    v1 = reg.snapshot()
+    # mtime change without content change keeps the version
+    _touch(d / "mdd.yaml")
+    assert reg.snapshot().version == v1.version
+    # content change produces a new snapshot
+    text = (d / "mdd.yaml").read_text().replace("Major Depressive Disorder", "MDD (edited)")
+    (d / "mdd.yaml").write_text(text)
+    _touch(d / "mdd.yaml")
+    v2 = reg.snapshot()
+    assert v2.version != v1.version and v2.generation == v1.generation + 1
+    assert v2.disorders["mdd"]["name"] == "MDD (edited)"
+    # the old snapshot is untouched
+    assert v1.disorders["mdd"]["name"] == "Major Depressive Disorder"
+
+def test_registry_keeps_last_good_version_on_bad_edit(tmp_path):
+    d = _copy_rubrics(tmp_path)
+    reg = RubricRegistry(directory=str(d), check_interval=0)
+    v1 = reg.snapshot()
+    (d / "mdd.yaml").write_text("id: mdd\nname: broken\n")
+    _touch(d / "mdd.yaml")
+    assert reg.snapshot().version == v1.version
+    assert reg.stats()["lastError"]
+    with pytest.raises(RubricError):
+        RubricRegistry(directory=str(d)).snapshot()
@@ -0,0 +1,53 @@
+import ast
+import itertools
+
+import pytest
+
+from app.rubric.eval import SafeEval, compile_rule, safe_eval
+from app.rubric.loader import read_disorders
+
+def _walk(expr, names):
+    return bool(SafeEval(names).visit(ast.parse(expr, mode="eval")))
+
+def _outcome(fn, expr, names):
+    try:
+        return fn(expr, names)
+    except Exception as e:
+        return type(e).__name__
+
+def test_compiled_rules_match_reference_on_rubric_rules():
+    values = [True, False, None, 0, 2, 3, 12, "x"]
+    for spec in read_disorders().values():
+        for c in spec["criteria"].get("core", []) + (spec["criteria"].get("exclusions") or []):
+            req = c["slots_required"]
+            for i, v in enumerate(itertools.islice(itertools.cycle(values), 40)):
+                names = {s: values[(i + j) % len(values)] for j, s in enumerate(req)}
+                names[req[0]] = v
+                assert _outcome(_walk, c["rule"], names) == _outcome(safe_eval, c["rule"], names), c["rule"]
+
+@pytest.mark.parametrize("expr,names", [
+    ("1 < a <= 3", {"a": 3}),
+    ("1 > a > None", {"a": 5}),  # chain stops comparing once false
+    ("a == true", {"a": True}),  # unknown names read as None
+    ("not (a or b)", {"a": False, "b": None}),
+    ("count_true([a, b, c]) >= 2", {"a": True, "b": 1, "c": True}),
+])
+def test_compiled_rule_semantics(expr, names):
+    assert safe_eval(expr, names) == _walk(expr, names)
+
+@pytest.mark.parametrize("expr", [
+    "__import__('os')",
+    "a.b == 1",
+    "len([a]) > 0",
+    "a in [1, 2]",
+    "-a < 0",
+    "a + 1 > 2",
+])
+def test_compiler_rejects_what_the_walker_rejects(expr):
+    with pytest.raises(ValueError):
+        _walk(expr, {"a": 1})
+    with pytest.raises(ValueError):
+        compile_rule(expr)
+
+def test_compiled_rule_reports_referenced_names():
+    assert compile_rule("count_true([a, b]) >= 1 and c == true").names == {"a", "b", "c", "true"}
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from sqlalchemy import event
+
+from app.conversation.state import PERSISTED, ScreeningState
+from app.core.db import async_engine
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+def _row(**kw):
+    values = {name: None for name in PERSISTED}
+    values.update(kw)
+    return SimpleNamespace(**values)
+
+
+def test_from_row_fills_defaults_and_tracks_changes():
+    row = _row(phase="SCREENING", slots={"fatigue": True})
+    state = ScreeningState.from_row(row)
+    assert state.readiness == "WARMING" and state.hypotheses == {}
+    assert state.changed_fields() == ()
+
+    state.slots["sad"] = True  # in-place edits count
+    state.turns += 1
+    assert state.apply_to(row) == ("turns", "slots")
+    assert row.slots == {"fatigue": True, "sad": True} and row.slots is not state.slots
+    assert state.changed_fields() == ()
+
+
+def test_copy_does_not_share_dicts():
+    state = ScreeningState(slots={"a": 1})
+    other = state.copy()
+    other.slots["b"] = 2
+    assert state.slots == {"a": 1}
+
+
+def test_turn_updates_only_changed_columns(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    r = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": "hi"})
+    sid = r.json()["session"]["id"]
+
+    updates = []
+
+    def on_execute(conn, cursor, statement, params, context, executemany):
+        if statement.startswith("UPDATE screening_sessions"):
+            updates.append(statement)
+
+    sync = async_engine.sync_engine
+    event.listen(sync, "before_cursor_execute", on_execute)
+    try:
+        r = client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "hello again"})
+    finally:
+        event.remove(sync, "before_cursor_execute", on_execute)
+    assert r.status_code == 200
+    assert len(updates) == 1
+    assert "turns=" in updates[0]
+    assert "hypotheses_json" not in updates[0]  # untouched JSON columns are not rewritten
+
+    report = client.get(f"/chat/sessions/{sid}/report", headers=auth)
+    assert report.status_code == 200
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.conversation import session_cache
+from app.conversation.session_cache import HotSessionCache, get_session_cache
+from app.conversation.state import ScreeningState
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models import ChatSession, ScreeningSession
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+def _session(sid, user="u1"):
+    now = datetime.utcnow()
+    return SimpleNamespace(id=sid, user_id=user, title="t", created_at=now, updated_at=now)
+
+
+def _screening(sid):
+    return SimpleNamespace(id=f"s-{sid}", version=1)
+
+
+def test_lru_and_idle_eviction():
+    now = [0.0]
+    cache = HotSessionCache(enabled=True, max_entries=2, idle_seconds=10, clock=lambda: now[0])
+    for sid in ("a", "b"):
+        cache.store(_session(sid), _screening(sid), ScreeningState())
+    assert cache.get("a", "u1") is not None  # "b" is now least recently used
+    cache.store(_session("c"), _screening("c"), ScreeningState())
+    assert cache.get("b", "u1") is None
+    assert cache.get("a", "other-user") is None  # never served to another owner
+
+    now[0] = 11.0
+    assert cache.get("a", "u1") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expired"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 3 and stats["hitRatio"] == 0.25
+
+
+def test_deletes_invalidate(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    ids = [client.post("/chat/message", headers=auth, json={"sessionId": None, "message": m}).json()["session"]["id"] for m in ("hi", "hello")]
+    user_id = client.get("/users/me", headers=auth).json()["id"]
+    cache = get_session_cache()
+    assert all(cache.get(sid, user_id) is not None for sid in ids)
+
+    client.delete(f"/chat/sessions/{ids[0]}", headers=auth)
+    assert cache.get(ids[0], user_id) is None and cache.get(ids[1], user_id) is not None
+    client.delete("/chat/sessions", headers=auth)
+    assert cache.get(ids[1], user_id) is None
+    r = client.post("/chat/message", headers=auth, json={"sessionId": ids[1], "message": "still there?"})
+    assert r.status_code == 404
+
+
+def test_write_behind_defers_state_until_flush(client, monkeypatch):
+    monkeypatch.setattr(settings, "HOT_SESSION_WRITE_MODE", "behind")
+    session_cache.reset_session_cache()
+    try:
+        token, _ = signup_and_login(client)
+        auth = {"Authorization": f"Bearer {token}"}
+        patch_llm(monkeypatch, {}, None)
+        sid = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": "hi"}).json()["session"]["id"]
+        for text in ("hello", "how are you"):
+            assert client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": text}).status_code == 200
+
+        def stored_turns():
+            with SessionLocal() as db:
+                return db.execute(select(ScreeningSession.turns).where(ScreeningSession.session_id == sid)).scalar_one()
+
+        cache = get_session_cache()
+        assert stored_turns() == 1  # first turn inserted the row; later ones wait for the flush
+        assert cache.stats()["pendingFlushes"] == 1
+        assert client.get(f"/chat/sessions/{sid}/report", headers=auth).status_code == 200
+
+        assert asyncio.run(cache.flush()) == 1
+        assert stored_turns() == 3
+        assert cache.stats()["pendingFlushes"] == 0
+        with SessionLocal() as db:
+            assert len(db.get(ChatSession, sid).messages) == 6  # messages were never deferred
+    finally:
+        session_cache.reset_session_cache()
+
+
+def test_flush_during_a_turn_keeps_its_state(client, monkeypatch):
+    monkeypatch.setattr(settings, "HOT_SESSION_WRITE_MODE", "behind")
+    session_cache.reset_session_cache()
+    try:
+        token, _ = signup_and_login(client)
+        auth = {"Authorization": f"Bearer {token}"}
+        patch_llm(monkeypatch, {}, None)
+        sid = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": "hi"}).json()["session"]["id"]
+        assert client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "hello"}).status_code == 200
+
+        flushed = []
+
+        async def compose_and_flush(user_text, intent, question, progress_hint, extra_explanation):
+            # the periodic flush writes turn 2 while turn 3 waits on the LLM
+            flushed.append(await get_session_cache().flush())
+            return "ACK."
+
+        monkeypatch.setattr("app.llm.composer.compose", compose_and_flush)
+        assert client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "a third turn, flushed mid-way"}).status_code == 200
+        assert flushed == [1]
+
+        cache = get_session_cache()
+        assert asyncio.run(cache.flush()) == 1
+        assert cache.peek(sid) is not None  # not dropped as stale
+        with SessionLocal() as db:
+            row = db.execute(select(ScreeningSession).where(ScreeningSession.session_id == sid)).scalar_one()
+            assert (row.turns, row.version) == (3, 3)
+    finally:
+        session_cache.reset_session_cache()
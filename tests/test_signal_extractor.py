@@ -0,0 +1,100 @@
+import asyncio
+
+from app.conversation import orchestrator
+from app.conversation.state import ScreeningState
+from app.rubric.registry import RubricRegistry, get_registry
+from app.rubric.signals import SignalMatcher
+
+
+def _matcher():
+    return get_registry().snapshot().signals
+
+
+def test_matches_boolean_signals_in_one_scan():
+    got = _matcher().match("I’m so tired all the time and I can’t sleep")
+    assert got["fatigue"] is True
+    assert got["sleep_disturbance"] is True
+
+
+def test_negated_phrase_is_ignored():
+    got = _matcher().match("I'm not tired, but I feel sad")
+    assert "fatigue" not in got
+    assert got["depressed_mood"] is True
+
+
+def test_longest_phrase_wins():
+    got = _matcher().match("I have really low self-esteem")
+    assert got.get("low_self_esteem") is True
+    assert "depressed_mood" not in got
+
+
+def test_only_boolean_non_exclusion_slots(tmp_path):
+    (tmp_path / "toy.yaml").write_text(
+        "id: toy\nname: Toy\n"
+        "slots:\n"
+        "  weeks_low:\n    type: number\n    signals: ['weeks']\n"
+        "  tired:\n    type: boolean\n    signals: ['tired']\n"
+        "exclusion_slots:\n"
+        "  on_meds:\n    type: boolean\n    signals: ['medication']\n"
+        "criteria:\n  core:\n    - id: A\n      slots_required: ['tired']\n      rule: 'tired == True'\n",
+        encoding="utf-8",
+    )
+    snap = RubricRegistry(directory=str(tmp_path), hot_reload=False).snapshot()
+    m = SignalMatcher(snap.rubrics)
+    assert m.match("tired for weeks since the medication") == {"tired": True}
+
+
+def _patch_llm(monkeypatch, extracted):
+    calls = []
+
+    async def fake_extract(user_text, known_slots):
+        calls.append(user_text)
+        return extracted
+
+    async def fake_compose(**kw):
+        return "ok"
+
+    monkeypatch.setattr("app.llm.extractor.extract", fake_extract)
+    monkeypatch.setattr("app.llm.composer.compose", fake_compose)
+    return calls
+
+
+def _screening_state(**kw):
+    return ScreeningState(**dict({
+        "phase": "SCREENING", "readiness": "READY", "turns": 3,
+        "presenting_concern": "low mood", "age_years": 30,
+        "last_intent": "clarify_fatigue",
+    }, **kw))
+
+
+def test_symptom_disclosure_skips_llm(monkeypatch):
+    calls = _patch_llm(monkeypatch, {"facts": {"slots": {}}})
+    state, _, meta = asyncio.run(orchestrator.handle_turn(_screening_state(), "yes I feel tired and worthless"))
+    assert calls == []
+    assert meta["extractPath"] == "signals"
+    slots = state.slots
+    assert slots["fatigue"] is True and slots["worthlessness_guilt"] is True
+
+
+def test_numeric_target_still_uses_llm_and_llm_wins(monkeypatch):
+    extracted = {"facts": {"slots": {"duration_weeks": 6, "fatigue": False}}}
+    calls = _patch_llm(monkeypatch, extracted)
+    state = _screening_state(last_intent="clarify_duration_weeks")
+    state, _, meta = asyncio.run(orchestrator.handle_turn(state, "about six weeks, always tired and sad"))
+    assert len(calls) == 1
+    assert meta["extractPath"] == "llm"
+    slots = state.slots
+    assert slots["duration_weeks"] == 6
+    assert slots["fatigue"] is False  # LLM value overrides the signal match
+    assert slots["depressed_mood"] is True  # signal match kept where the LLM was silent
+
+
+def test_age_or_duration_alongside_a_boolean_answer_uses_llm(monkeypatch):
+    extracted = {"facts": {"slots": {"fatigue": True, "duration_weeks": 3, "age_years": 16}}}
+    calls = _patch_llm(monkeypatch, extracted)
+    state, _, meta = asyncio.run(orchestrator.handle_turn(
+        _screening_state(age_years=None), "yes, tired for about three weeks since I turned 16",
+    ))
+    assert len(calls) == 1
+    assert meta["extractPath"] == "llm"
+    assert state.slots["duration_weeks"] == 3
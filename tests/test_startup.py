@@ -0,0 +1,68 @@
+import subprocess
+import sys
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.core.db import Base
+from app.core.migrations import upgrade_database
+from app.core.startup import import_times
+
+# cold import of app.main in a fresh interpreter; about 2 s on one slow core today
+IMPORT_BUDGET_MS = 4000
+LAZY = ("cloudinary", "alembic")
+
+
+def test_import_stays_within_budget():
+    rows = import_times("app.main")
+    total_us = next(cum for name, _, cum in reversed(rows) if name == "app.main")
+    assert total_us / 1000 < IMPORT_BUDGET_MS, sorted(rows, key=lambda r: -r[2])[:15]
+
+
+def test_providers_are_not_imported_with_the_app():
+    out = subprocess.run(
+        [sys.executable, "-c", f"import sys, app.main; print([m for m in {LAZY!r} if m in sys.modules])"],
+        capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    upgrade_database(url)
+    upgrade_database(url)  # already at head: no-op
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    engine.dispose()
+    # SQLite keeps the JSON state columns as TEXT (see migration 0003)
+    assert [d for d in diff if not (isinstance(d, list) and d[0][0] == "modify_type")] == []
+
+
+def test_unversioned_database_is_refused(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    with pytest.raises(RuntimeError, match="alembic stamp"):
+        upgrade_database(url)
+
+
+def test_unversioned_baseline_database_is_stamped_and_upgraded(tmp_path):
+    from alembic import command
+
+    from app.core.migrations import BASELINE, _alembic_config
+
+    url = f"sqlite:///{tmp_path / 'predates.db'}"
+    command.upgrade(_alembic_config(url), BASELINE)
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE alembic_version")  # as create_all left it
+    engine.dispose()
+    upgrade_database(url)
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        assert MigrationContext.configure(conn).get_current_revision() == "0006_refresh_tokens_revoked"
+    engine.dispose()
@@ -0,0 +1,84 @@
+from sqlalchemy import select, update
+
+from app.api.routes import chat
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models import ScreeningSession
+from tests.test_regressions import signup_and_login, patch_llm
+
+
+def _bump(sid, turns=10):
+    # another worker saving a turn for the same session
+    with SessionLocal() as db:
+        db.execute(
+            update(ScreeningSession)
+            .where(ScreeningSession.session_id == sid)
+            .values(turns=ScreeningSession.turns + turns, version=ScreeningSession.version + 1)
+        )
+        db.commit()
+
+
+def _row(sid):
+    with SessionLocal() as db:
+        return db.execute(select(ScreeningSession.turns, ScreeningSession.version).where(ScreeningSession.session_id == sid)).one()
+
+
+def _start(client, monkeypatch):
+    token, _ = signup_and_login(client)
+    auth = {"Authorization": f"Bearer {token}"}
+    patch_llm(monkeypatch, {}, None)
+    sid = client.post("/chat/message", headers=auth, json={"sessionId": None, "message": "hi"}).json()["session"]["id"]
+    return auth, sid
+
+
+def test_conflicting_turn_reruns_on_fresh_state(client, monkeypatch):
+    auth, sid = _start(client, monkeypatch)
+    real = chat.handle_turn
+    seen = []
+
+    async def racing_turn(state, text):
+        seen.append(state.turns)
+        if len(seen) == 1:
+            _bump(sid)
+        return await real(state, text)
+
+    monkeypatch.setattr(chat, "handle_turn", racing_turn)
+    before = chat.conflict_stats()
+    r = client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "hello"})
+    assert r.status_code == 200
+    assert seen == [1, 11]  # second run saw the other writer's turns
+    turns, version = _row(sid)
+    assert turns == 12 and version == 3
+    after = chat.conflict_stats()
+    assert after["conflicts"] == before["conflicts"] + 1 and after["retried"] == before["retried"] + 1
+
+
+def test_gives_up_with_409_after_retries(client, monkeypatch):
+    auth, sid = _start(client, monkeypatch)
+    real = chat.handle_turn
+
+    async def always_racing(state, text):
+        _bump(sid, turns=1)
+        return await real(state, text)
+
+    monkeypatch.setattr(chat, "handle_turn", always_racing)
+    r = client.post("/chat/message", headers=auth, json={"sessionId": sid, "message": "hello"})
+    assert r.status_code == 409
+    turns, version = _row(sid)
+    assert version == 2 + settings.TURN_CONFLICT_RETRIES  # only the other writer's updates landed
+    assert turns == 2 + settings.TURN_CONFLICT_RETRIES
+
+
+def test_stream_keeps_reply_and_replans_state(client, monkeypatch):
+    auth, sid = _start(client, monkeypatch)
+
+    async def racing_stream(**kw):
+        yield "Sure."
+        _bump(sid)
+
+    monkeypatch.setattr("app.llm.composer.compose_stream", racing_stream)
+    r = client.post("/chat/message/stream", headers=auth, json={"sessionId": sid, "message": "hello"})
+    assert r.status_code == 200
+    assert '"text": "Sure."' in r.text.split("event: done")[1]
+    turns, version = _row(sid)
+    assert turns == 12 and version == 3